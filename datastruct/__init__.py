@@ -8,8 +8,7 @@
     :license: BSD, see LICENSE for more details.
 """
 
-from . import validators
-from .ds import DEFAULT_TO_KEY, INVALID, DataStruct, KeyDefinedValue
+from .ds import DEFAULT_TO_KEY, INVALID, DataStruct, KeyDefinedValue, LazyDict
 from .exceptions import (
     MissingValueError,
     UnexpectedKeyError,
@@ -18,30 +17,48 @@ from .exceptions import (
     WrongValueError,
 )
 
-try:
-    from importlib.metadata import version
-except ImportError:
-    # Backport for Python < 3.8
-    from importlib_metadata import version
 
-try:  # pragma: no cover
-    __version__ = version("datastruct")
-except Exception:  # pragma: no cover
-    # we seem to have a local copy not installed without setuptools
-    # so the reported version will be unknown
-    __version__ = "unknown"
+def _get_version():
+    try:
+        from importlib.metadata import version
+    except ImportError:
+        # Backport for Python < 3.8
+        from importlib_metadata import version
+
+    try:  # pragma: no cover
+        return version("datastruct")
+    except Exception:  # pragma: no cover
+        # we seem to have a local copy not installed without setuptools
+        # so the reported version will be unknown
+        return "unknown"
+
+
+def __getattr__(name):
+    # The version and the validators module are loaded on first use
+    # to keep `import datastruct` fast.
+    if name == "__version__":
+        globals()[name] = value = _get_version()
+        return value
+    elif name == "validators":
+        import importlib
+
+        # Importing a submodule sets it as an attribute of the package.
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
-    __version__,
-    validators,
-    DataStruct,
-    MissingValueError,
-    UnexpectedKeyError,
-    WrongTypeError,
-    WrongValueError,
-    ValidationError,
-    KeyDefinedValue,
-    INVALID,
-    DEFAULT_TO_KEY,
+    "__version__",
+    "validators",
+    "DataStruct",
+    "MissingValueError",
+    "UnexpectedKeyError",
+    "WrongTypeError",
+    "WrongValueError",
+    "ValidationError",
+    "KeyDefinedValue",
+    "LazyDict",
+    "INVALID",
+    "DEFAULT_TO_KEY",
 ]
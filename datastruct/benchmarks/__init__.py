@@ -0,0 +1,333 @@
+"""
+    datastruct.benchmarks
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Benchmarks for the hot paths of the package.
+
+    The `bench_*` modules of this package register:
+
+    - benchmarks: zero-argument callables to be timed (`benchmark` decorator).
+    - metrics: zero-argument callables returning a number,
+      such as a size in bytes (`metric` decorator).
+      Use `trace_memory` to measure memory usage.
+
+    Run them with::
+
+        python -m datastruct.benchmarks [pattern ...]
+
+    Results can be saved as JSON (`--output`) and compared
+    with previously saved ones (`--compare`) to find regressions
+    across commits. Two git revisions can also be compared directly
+    (`--revisions OLD NEW`), running the current benchmarks on both.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import fnmatch
+import gc
+import importlib
+import json
+import os
+import pathlib
+import pkgutil
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import warnings
+
+#: name -> (callable, number of operations per call)
+BENCHMARKS = {}
+
+#: name -> (callable, unit)
+METRICS = {}
+
+
+def _name(func):
+    return "%s.%s" % (func.__module__.rsplit(".", 1)[-1], func.__name__)
+
+
+def benchmark(func=None, *, name=None, ops=1):
+    """Register a benchmark.
+
+    Parameters
+    ----------
+    func : callable
+        zero-argument callable to time.
+    name : str or None
+        name of the benchmark (default: module.function).
+    ops : int
+        number of operations performed by each call,
+        used to report the time per operation.
+    """
+
+    def _register(func):
+        BENCHMARKS[name or _name(func)] = (func, ops)
+        return func
+
+    if func is None:
+        return _register
+    return _register(func)
+
+
+def metric(func=None, *, name=None, unit=""):
+    """Register a metric.
+
+    Parameters
+    ----------
+    func : callable
+        zero-argument callable returning a number.
+    name : str or None
+        name of the metric (default: module.function).
+    unit : str
+        unit of the returned number.
+    """
+
+    def _register(func):
+        METRICS[name or _name(func)] = (func, unit)
+        return func
+
+    if func is None:
+        return _register
+    return _register(func)
+
+
+def load_all():
+    """Import all the bench_* modules of this package.
+
+    Modules that cannot be imported (e.g. when running the benchmarks
+    on an older revision of the package) are skipped with a warning.
+    """
+    for module in pkgutil.iter_modules(__path__):
+        if module.name.startswith("bench_"):
+            try:
+                importlib.import_module(f"{__name__}.{module.name}")
+            except Exception as ex:
+                warnings.warn(f"Skipping {module.name}: {ex!r}")
+
+
+def trace_memory(func):
+    """Call func tracing the memory allocations.
+
+    Returns
+    -------
+    object
+        the value returned by func.
+    dict
+        size: bytes allocated by the call and still in use when it returns.
+        peak: maximum bytes in use during the call.
+        blocks: number of memory blocks allocated by the call
+        and still in use when it returns.
+    """
+    gc.collect()
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    elif not hasattr(tracemalloc, "reset_peak"):
+        # Python < 3.9, restarting is the only way to reset the peak,
+        # which discards the traces of the memory already in use.
+        tracemalloc.stop()
+        tracemalloc.start()
+
+    try:
+        before = tracemalloc.take_snapshot()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    filters = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    blocks = sum(
+        stat.count_diff
+        for stat in after.filter_traces(filters).compare_to(
+            before.filter_traces(filters), "filename"
+        )
+    )
+
+    return result, dict(size=current - base, peak=peak - base, blocks=blocks)
+
+
+def _selected(key, patterns):
+    return not patterns or any(fnmatch.fnmatch(key, p) for p in patterns)
+
+
+def run(patterns=(), repeat=5):
+    """Run the registered benchmarks and metrics matching any of the patterns.
+
+    Parameters
+    ----------
+    patterns : Iterable[str]
+        fnmatch patterns to select benchmarks by name.
+        If empty, all benchmarks are run.
+    repeat : int
+        the best of this number of repetitions is reported.
+
+    Returns
+    -------
+    dict
+        name -> dict(value=..., unit=...)
+        Benchmarks report the time per operation in seconds.
+    """
+    load_all()
+
+    out = {}
+    for key, (func, ops) in BENCHMARKS.items():
+        if not _selected(key, patterns):
+            continue
+
+        timer = timeit.Timer(func)
+        try:
+            number, _ = timer.autorange()
+        except Exception as ex:
+            warnings.warn(f"Skipping {key}: {ex!r}")
+            continue
+        best = min(timer.repeat(repeat=repeat, number=number))
+        out[key] = dict(value=best / number / ops, unit="s")
+
+    for key, (func, unit) in METRICS.items():
+        if not _selected(key, patterns):
+            continue
+
+        try:
+            out[key] = dict(value=func(), unit=unit)
+        except Exception as ex:
+            warnings.warn(f"Skipping {key}: {ex!r}")
+
+    return out
+
+
+def _git(*args, cwd=None):
+    out = subprocess.run(
+        ("git",) + args,
+        cwd=cwd or __path__[0],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return out.stdout.strip()
+
+
+def _revision():
+    """Git revision of the package source, or None if not available."""
+    try:
+        return _git("rev-parse", "HEAD")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_revision(revision, patterns=(), repeat=5):
+    """Run the benchmarks on another git revision of the package.
+
+    The revision is checked out in a temporary worktree, in which
+    the current benchmarks are copied, and run in a new process.
+
+    Parameters
+    ----------
+    revision : str
+        any git revision (e.g. a commit, branch or tag).
+    patterns : Iterable[str]
+        fnmatch patterns to select benchmarks by name.
+    repeat : int
+        the best of this number of repetitions is reported.
+
+    Returns
+    -------
+    dict
+        results as returned by `run`.
+    """
+    root = _git("rev-parse", "--show-toplevel")
+    package = pathlib.Path(__path__[0]).resolve().parent
+    # Directory containing the package, relative to the repository root.
+    relative = package.parent.relative_to(pathlib.Path(root).resolve())
+
+    with tempfile.TemporaryDirectory(prefix="datastruct-bench-") as tmp:
+        worktree = pathlib.Path(tmp, "src")
+        output = pathlib.Path(tmp, "results.json")
+
+        _git("worktree", "add", "--detach", str(worktree), revision, cwd=root)
+        try:
+            # The benchmarks of the revision (if any) are replaced.
+            target = worktree / relative / package.name / "benchmarks"
+            shutil.rmtree(str(target), ignore_errors=True)
+            shutil.copytree(
+                __path__[0],
+                str(target),
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+            env = dict(os.environ, PYTHONPATH=str(worktree / relative))
+            subprocess.run(
+                [sys.executable, "-m", __name__]
+                + list(patterns)
+                + ["--repeat", str(repeat), "--output", str(output)],
+                cwd=str(worktree / relative),
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            return load(output)
+        finally:
+            _git("worktree", "remove", "--force", str(worktree), cwd=root)
+
+
+def save(results, filename):
+    """Save results (as returned by `run`) into a JSON file,
+    together with information about the environment.
+    """
+    from .. import __version__
+
+    content = dict(
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        machine=platform.machine(),
+        datastruct=__version__,
+        revision=_revision(),
+        results=results,
+    )
+    with open(filename, "w", encoding="utf-8") as fp:
+        json.dump(content, fp, indent=2, sort_keys=True)
+
+
+def load(filename):
+    """Load results saved with `save`."""
+    with open(filename, encoding="utf-8") as fp:
+        return json.load(fp)["results"]
+
+
+def compare(old, new):
+    """Compare two sets of results.
+
+    Parameters
+    ----------
+    old : dict
+    new : dict
+        results as returned by `run` or `load`.
+
+    Returns
+    -------
+    dict
+        name -> dict(old=..., new=..., ratio=..., unit=...)
+        for the names present in both. A ratio (new / old)
+        above 1 means slower (or bigger).
+    """
+    out = {}
+    for key, result in new.items():
+        if key not in old:
+            continue
+        old_value, new_value = old[key]["value"], result["value"]
+        out[key] = dict(
+            old=old_value,
+            new=new_value,
+            ratio=new_value / old_value if old_value else float("nan"),
+            unit=result["unit"],
+        )
+    return out
@@ -0,0 +1,67 @@
+import argparse
+
+from . import compare, load, run, run_revision, save
+
+
+def _format(value, unit):
+    if unit == "s":
+        return f"{value * 1e6:12.3f} us"
+    return f"{value:12.3f} {unit:2}"
+
+
+def _print_comparison(comparison):
+    width = max((len(key) for key in comparison), default=0)
+    for key, result in comparison.items():
+        print(
+            f"{key:<{width}}  {_format(result['old'], result['unit'])}"
+            f"  {_format(result['new'], result['unit'])}"
+            f"  {result['ratio']:6.2f}x"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m datastruct.benchmarks", description="Run the benchmarks."
+    )
+    parser.add_argument(
+        "patterns", nargs="*", help="fnmatch patterns to select benchmarks by name"
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="number of repetitions"
+    )
+    parser.add_argument("-o", "--output", help="save the results to a JSON file")
+    parser.add_argument(
+        "-c", "--compare", help="compare with the results saved in a JSON file"
+    )
+    parser.add_argument(
+        "--revisions",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="compare two git revisions, running the current benchmarks on both",
+    )
+    args = parser.parse_args(argv)
+
+    if args.revisions:
+        old, new = (
+            run_revision(revision, args.patterns, args.repeat)
+            for revision in args.revisions
+        )
+        _print_comparison(compare(old, new))
+        return
+
+    results = run(args.patterns, args.repeat)
+
+    if args.output:
+        save(results, args.output)
+
+    if args.compare:
+        _print_comparison(compare(load(args.compare), results))
+        return
+
+    width = max((len(key) for key in results), default=0)
+    for key, result in results.items():
+        print(f"{key:<{width}}  {_format(**result)}")
+
+
+if __name__ == "__main__":
+    main()
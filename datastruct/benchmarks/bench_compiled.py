@@ -0,0 +1,66 @@
+"""
+    datastruct.benchmarks.bench_compiled
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Time to build and serialize DataStruct instances using the
+    ahead-of-time compiled code (see datastruct.compiler),
+    to compare with the `construct.*` benchmarks.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import types
+
+from ..compiler import compile_module
+from . import benchmark
+from .bench_construct import (
+    FLAT,
+    NUMBERS,
+    OPTIONS,
+    SERVERS,
+    Flat,
+    N,
+    Numbers,
+    Options,
+    Servers,
+)
+
+
+def _compiled(cls):
+    module = types.ModuleType(f"_{cls.__name__.lower()}_compiled")
+    exec(compile(compile_module(cls), module.__name__, "exec"), module.__dict__)
+    return module
+
+
+_FLAT = _compiled(Flat)
+_NUMBERS = _compiled(Numbers)
+_SERVERS = _compiled(Servers)
+_OPTIONS = _compiled(Options)
+
+_SERVERS_OBJ = Servers(SERVERS)
+
+
+@benchmark(name="compiled.flat")
+def flat():
+    _FLAT.load(FLAT)
+
+
+@benchmark(name="compiled.list[int]", ops=N)
+def list_int():
+    _NUMBERS.load(NUMBERS)
+
+
+@benchmark(name="compiled.dict[str,DataStruct]", ops=N)
+def dict_datastruct():
+    _SERVERS.load(SERVERS)
+
+
+@benchmark(name="compiled.kdv", ops=N)
+def kdv():
+    _OPTIONS.load(OPTIONS)
+
+
+@benchmark(name="compiled.dump", ops=N)
+def dump():
+    _SERVERS.dump(_SERVERS_OBJ)
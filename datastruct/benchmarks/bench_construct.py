@@ -0,0 +1,225 @@
+"""
+    datastruct.benchmarks.bench_construct
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Time to build (validate and convert) DataStruct instances:
+    flat and deeply nested structures, large containers,
+    KeyDefinedValue dispatch, repeated content (with and without `dedupe`)
+    and records with low-cardinality strings (with and without `intern`).
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import json
+from typing import Dict, List
+
+from .. import DataStruct, KeyDefinedValue
+from ..validators import Domain
+from . import benchmark
+
+N = 1000
+
+DEPTH = 10
+
+
+class Flat(DataStruct):
+    a: int
+    b: int
+    c: float
+    d: float
+    e: str
+    f: str
+    g: bool
+    h: bool
+    i: list
+    j: dict
+
+
+FLAT = dict(a=1, b=2, c=3.0, d=4.0, e="e", f="f", g=True, h=False, i=[], j={})
+
+
+class Leaf(DataStruct):
+    value: int
+
+
+def _nested_class(depth):
+    klass = Leaf
+    for _ in range(depth):
+        klass = type("Node", (DataStruct,), dict(__annotations__=dict(child=klass)))
+    return klass
+
+
+Nested = _nested_class(DEPTH)
+
+
+def _nested_content(depth):
+    content = dict(value=1)
+    for _ in range(depth):
+        content = dict(child=content)
+    return content
+
+
+NESTED = _nested_content(DEPTH)
+
+
+class Server(DataStruct):
+    host: str
+    port: int
+    tags: List[str]
+
+
+class Servers(DataStruct):
+    servers: Dict[str, Server]
+
+
+SERVERS = dict(
+    servers={
+        f"host{ndx}": dict(host=f"host{ndx}.example.com", port=ndx, tags=["a", "b"])
+        for ndx in range(N)
+    }
+)
+
+
+class Numbers(DataStruct):
+    values: List[int]
+
+
+NUMBERS = dict(values=list(range(N)))
+
+
+class Option(KeyDefinedValue):
+    content = dict(number=int, text=str, server=Server)
+
+
+class Options(DataStruct):
+    options: List[Option]
+
+
+OPTIONS = dict(
+    options=[
+        [dict(number=1), dict(text="a"), dict(server=dict(host="h", port=1, tags=[]))][
+            ndx % 3
+        ]
+        for ndx in range(N)
+    ]
+)
+
+
+class Retry(DataStruct, frozen=True):
+    attempts: int
+    delays: List[float]
+    timeout: float
+
+
+class Tls(DataStruct, frozen=True):
+    verify: bool
+    ca_file: str
+    ciphers: List[str]
+    server_names: List[Domain]
+
+
+class Endpoint(DataStruct):
+    url: str
+    retry: Retry
+    tls: Tls
+
+
+class Endpoints(DataStruct):
+    endpoints: List[Endpoint]
+
+
+#: The same retry policy and TLS settings in all the endpoints.
+REPEATED = dict(
+    endpoints=[
+        dict(
+            url=f"https://host{ndx}.example.com",
+            retry=dict(attempts=3, delays=[0.1, 0.5, 1.0, 5.0], timeout=1.0),
+            tls=dict(
+                verify=True,
+                ca_file="/etc/ssl/certs/ca.pem",
+                ciphers=[
+                    "ECDHE-ECDSA-AES128-GCM-SHA256",
+                    "ECDHE-RSA-AES128-GCM-SHA256",
+                ],
+                server_names=["example.com", "www.example.com", "api.example.com"],
+            ),
+        )
+        for ndx in range(N)
+    ]
+)
+
+
+class Event(DataStruct):
+    id: int
+    region: str
+    zone: str
+    status: str
+    method: str
+    tags: List[str]
+
+
+class InternedEvent(Event, intern=("region", "zone", "status", "method", "tags")):
+    pass
+
+
+#: Records of a log, one JSON document per line (e.g. JSON Lines),
+#: so that each record has its own copies of the keys and repeated values.
+EVENTS = [
+    json.dumps(
+        dict(
+            id=ndx,
+            region=["us-east-1", "eu-west-1", "ap-southeast-2"][ndx % 3],
+            zone=f"zone-{ndx % 4}",
+            status=["ok", "degraded", "failed"][ndx % 3],
+            method=["GET", "POST"][ndx % 2],
+            tags=["production", "web"],
+        )
+    )
+    for ndx in range(N)
+]
+
+
+@benchmark(name="construct.flat")
+def flat():
+    Flat(FLAT)
+
+
+@benchmark(name="construct.nested", ops=DEPTH + 1)
+def nested():
+    Nested(NESTED)
+
+
+@benchmark(name="construct.list[int]", ops=N)
+def list_int():
+    Numbers(NUMBERS)
+
+
+@benchmark(name="construct.dict[str,DataStruct]", ops=N)
+def dict_datastruct():
+    Servers(SERVERS)
+
+
+@benchmark(name="construct.kdv", ops=N)
+def kdv():
+    Options(OPTIONS)
+
+
+@benchmark(name="construct.repeated", ops=N)
+def repeated():
+    Endpoints.from_dict(REPEATED)
+
+
+@benchmark(name="construct.repeated[dedupe]", ops=N)
+def repeated_dedupe():
+    Endpoints.from_dict(REPEATED, dedupe=True)
+
+
+@benchmark(name="construct.events", ops=N)
+def events():
+    [Event(json.loads(line)) for line in EVENTS]
+
+
+@benchmark(name="construct.events[intern]", ops=N)
+def events_intern():
+    [InternedEvent(json.loads(line)) for line in EVENTS]
@@ -0,0 +1,38 @@
+"""
+    datastruct.benchmarks.bench_errors
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Time to build DataStruct instances from content full of errors,
+    which exercises the creation of errors and their paths (`with_parent`).
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+from . import benchmark
+from .bench_construct import N, Servers
+
+INVALID_SERVERS = dict(
+    servers={
+        f"host{ndx}": dict(host=ndx, port="port", tags=[1, 2], extra=True)
+        for ndx in range(N)
+    }
+)
+
+
+@benchmark(name="errors.construct", ops=N)
+def construct():
+    Servers(INVALID_SERVERS)
+
+
+@benchmark(name="errors.from_dict[summary]", ops=N)
+def summary():
+    Servers.from_dict(INVALID_SERVERS, raise_on_error=False, summary=True)
+
+
+INSTANCE = Servers(INVALID_SERVERS)
+
+
+@benchmark(name="errors.get_errors", ops=N)
+def get_errors():
+    INSTANCE.get_errors(err_on_unexpected=False)
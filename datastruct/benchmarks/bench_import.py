@@ -0,0 +1,42 @@
+"""
+    datastruct.benchmarks.bench_import
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Time to import the package in a new interpreter,
+    as reported by `python -X importtime`.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import os
+import pathlib
+import subprocess
+import sys
+
+from . import metric
+
+REPEAT = 5
+
+#: Directory containing the package.
+ROOT = pathlib.Path(__file__).resolve().parent.parent.parent
+
+
+def _import_time(module):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    # The last line is the module itself: self | cumulative | name (in us)
+    cumulative = out.stderr.strip().splitlines()[-1].split("|")[1]
+    return int(cumulative) * 1e-6
+
+
+@metric(name="import.datastruct", unit="s")
+def import_datastruct():
+    # The first run compiles (and caches) the bytecode.
+    return min(_import_time("datastruct") for _ in range(REPEAT + 1))
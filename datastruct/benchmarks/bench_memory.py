@@ -0,0 +1,91 @@
+"""
+    datastruct.benchmarks.bench_memory
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Memory used by DataStruct instances and while loading,
+    converting and merging content, measured with tracemalloc.
+
+    - memory.instance: bytes per instance (including its values).
+    - memory.peak: maximum bytes in use per record while loading,
+      which includes temporary objects (e.g. ValueAndError).
+    - memory.blocks: memory blocks per record allocated by the call
+      and still in use when it returns.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import atexit
+import json
+import pathlib
+import shutil
+import tempfile
+from typing import List
+
+import serialize
+
+from ..common import merge
+from ..ds import ValueAndError, from_plain_value
+from . import metric, trace_memory
+from .bench_construct import (
+    EVENTS,
+    REPEATED,
+    SERVERS,
+    Endpoints,
+    Event,
+    InternedEvent,
+    N,
+    Server,
+    Servers,
+)
+
+RECORDS = list(SERVERS["servers"].values())
+
+_TMPDIR = pathlib.Path(tempfile.mkdtemp(prefix="datastruct-bench-"))
+atexit.register(shutil.rmtree, _TMPDIR, ignore_errors=True)
+
+FILENAME = _TMPDIR / "servers.json"
+serialize.dump(SERVERS, FILENAME)
+
+INSTANCE = Servers(SERVERS)
+
+LAYERS = [
+    {key: dict(value=ndx, nested=dict(value=ndx)) for key in SERVERS["servers"]}
+    for ndx in range(10)
+]
+
+
+def _register(name, func, records=N):
+    metric(
+        lambda: trace_memory(func)[1]["size"] / records,
+        name=f"memory.instance[{name}]",
+        unit="B",
+    )
+
+
+def _register_call(name, func, records=N):
+    metric(
+        lambda: trace_memory(func)[1]["peak"] / records,
+        name=f"memory.peak[{name}]",
+        unit="B",
+    )
+    metric(
+        lambda: trace_memory(func)[1]["blocks"] / records,
+        name=f"memory.blocks[{name}]",
+        unit="",
+    )
+
+
+_register("Server", lambda: [Server(record) for record in RECORDS])
+_register("Servers", lambda: Servers(SERVERS))
+_register("ValueAndError", lambda: [ValueAndError(None) for _ in range(N)])
+_register("Endpoints", lambda: Endpoints.from_dict(REPEATED))
+_register("Endpoints[dedupe]", lambda: Endpoints.from_dict(REPEATED, dedupe=True))
+_register("Event", lambda: [Event(json.loads(line)) for line in EVENTS])
+_register("Event[intern]", lambda: [InternedEvent(json.loads(line)) for line in EVENTS])
+
+_register_call("from_dict", lambda: Servers.from_dict(SERVERS))
+_register_call("from_filename[json]", lambda: Servers.from_filename(FILENAME))
+_register_call("from_plain_value", lambda: from_plain_value(List[Server], RECORDS))
+_register_call("to_dict", INSTANCE.to_dict)
+_register_call("merge", lambda: merge(LAYERS))
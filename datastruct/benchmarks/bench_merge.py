@@ -0,0 +1,34 @@
+"""
+    datastruct.benchmarks.bench_merge
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Time to merge many layers of nested dictionaries (`common.merge`),
+    as done by `from_filenames`.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+from ..common import merge
+from . import benchmark
+
+LAYERS = 20
+
+KEYS = 50
+
+
+def _layer(ndx):
+    return {
+        f"section{key}": dict(
+            value=ndx, common=key, nested=dict(value=ndx, common=key), only={ndx: key}
+        )
+        for key in range(KEYS)
+    }
+
+
+DCTS = [_layer(ndx) for ndx in range(LAYERS)]
+
+
+@benchmark(name="merge.layers", ops=LAYERS)
+def layers():
+    merge(DCTS)
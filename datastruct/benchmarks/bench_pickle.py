@@ -0,0 +1,77 @@
+"""
+    datastruct.benchmarks.bench_pickle
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Size and time of pickling DataStruct instances,
+    compared with the default pickling of the instance __dict__.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import pickle
+from typing import Dict, List
+
+from .. import DataStruct
+from . import benchmark, metric
+
+N = 1000
+
+
+class Server(DataStruct):
+    host: str
+    port: int
+    tags: List[str]
+
+
+class Config(DataStruct):
+    name: str
+    servers: List[Server]
+    by_name: Dict[str, Server]
+
+
+class LegacyServer(Server):
+    __reduce__ = object.__reduce__
+
+
+class LegacyConfig(Config):
+    __reduce__ = object.__reduce__
+
+    servers: List[LegacyServer]
+    by_name: Dict[str, LegacyServer]
+
+
+def _content():
+    servers = [
+        dict(host=f"host{ndx}.example.com", port=8000 + ndx, tags=["a", "b"])
+        for ndx in range(N)
+    ]
+    return dict(
+        name="config",
+        servers=servers,
+        by_name={server["host"]: server for server in servers},
+    )
+
+
+CONTENT = _content()
+
+INSTANCES = {
+    "compact": Config(CONTENT),
+    "default": LegacyConfig(CONTENT),
+}
+
+PICKLES = {key: pickle.dumps(value, -1) for key, value in INSTANCES.items()}
+
+
+def _register(key):
+    instance, pickled = INSTANCES[key], PICKLES[key]
+
+    benchmark(
+        lambda: pickle.dumps(instance, -1), name=f"pickle.dumps[{key}]", ops=2 * N
+    )
+    benchmark(lambda: pickle.loads(pickled), name=f"pickle.loads[{key}]", ops=2 * N)
+    metric(lambda: len(pickled) / (2 * N), name=f"pickle.size[{key}]", unit="B")
+
+
+_register("default")
+_register("compact")
@@ -0,0 +1,49 @@
+"""
+    datastruct.benchmarks.bench_serialize
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Time to convert DataStruct instances to plain values (`to_dict`)
+    and to load them from files (`from_filename`) in each format.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import atexit
+import pathlib
+import shutil
+import tempfile
+
+import serialize
+
+from . import benchmark
+from .bench_construct import SERVERS, N, Servers
+
+INSTANCE = Servers(SERVERS)
+
+_TMPDIR = pathlib.Path(tempfile.mkdtemp(prefix="datastruct-bench-"))
+atexit.register(shutil.rmtree, _TMPDIR, ignore_errors=True)
+
+
+@benchmark(name="serialize.to_dict", ops=N)
+def to_dict():
+    INSTANCE.to_dict()
+
+
+def _register(fmt):
+    filename = _TMPDIR / f"servers.{fmt}"
+    try:
+        serialize.dump(SERVERS, filename)
+    except Exception:
+        # The format is not available (e.g. PyYAML is not installed).
+        return
+
+    benchmark(
+        lambda: Servers.from_filename(filename),
+        name=f"serialize.from_filename[{fmt}]",
+        ops=N,
+    )
+
+
+_register("json")
+_register("yaml")
@@ -0,0 +1,63 @@
+"""
+    datastruct.benchmarks.bench_validators
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Per-call time of the string validators for each backend.
+    The result cache is bypassed by calling the functions directly.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+from .. import validators
+from . import benchmark
+
+VALUES = {
+    validators.Email: [
+        "someone@example.com",
+        "first.last@sub.example.co.uk",
+        "bogus@@example.com",
+        "user@example..com",
+    ],
+    validators.IPAddress: ["127.0.0.1", "2001:db8::8a2e:370:7334", "256.1.1.1", "::g"],
+    validators.URL: [
+        "https://example.com/",
+        "https://sub.example.co.uk/a/b?c=1&d=2",
+        "http://[::1]:8080/",
+        "http://exa mple.com",
+    ],
+    validators.Domain: ["example.com", "sub.example.co.uk", "example..com", "-a.com"],
+}
+
+
+def _bench(func, values):
+    def _run():
+        for value in values:
+            func(value)
+
+    return _run
+
+
+def _register(backend):
+    # Fetch the functions of the backend, leaving the one
+    # in use unchanged for anything imported afterwards.
+    previous = validators._backend
+    try:
+        validators.set_backend(backend)
+    except ImportError:
+        return
+    try:
+        funcs = {klass: klass.func for klass in VALUES}
+    finally:
+        validators.set_backend(previous)
+
+    for klass, values in VALUES.items():
+        benchmark(
+            _bench(funcs[klass], values),
+            name=f"validators.{klass.__name__}[{backend}]",
+            ops=len(values),
+        )
+
+
+_register("validators")
+_register("datastruct")
@@ -0,0 +1,336 @@
+"""
+    datastruct.cli
+    ~~~~~~~~~~~~~~
+
+    Command line interface::
+
+        python -m datastruct profile mypkg.schema:Config settings.yaml
+        python -m datastruct validate mypkg.schema:Config files/*.yaml --jobs 8
+        python -m datastruct compile mypkg.schema:Config -o mypkg/_config_compiled.py
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import argparse
+import concurrent.futures
+import functools
+import importlib
+import inspect
+import json
+import os
+import reprlib
+import sys
+import time
+
+import serialize
+
+from . import instrument
+from .common import merge
+from .ds import DataStruct
+
+
+class ClassSpecError(ValueError):
+    """The DataStruct class given as `module:QualifiedName` cannot be found."""
+
+
+def import_class(spec):
+    """Import a DataStruct class given as `module:QualifiedName`.
+
+    Raises ClassSpecError if the spec is invalid, or the module or class
+    cannot be found. Errors raised while importing the module propagate.
+    """
+    module_name, sep, qualname = spec.partition(":")
+    if not sep or not qualname:
+        raise ClassSpecError(f"Invalid class {spec!r}, use module:ClassName")
+
+    try:
+        obj = importlib.import_module(module_name)
+    except ModuleNotFoundError as ex:
+        # Only if the module itself (or its package) is missing,
+        # not a module imported by it.
+        if ex.name is None or not (
+            module_name == ex.name or module_name.startswith(ex.name + ".")
+        ):
+            raise
+        raise ClassSpecError(f"Cannot import {spec}: {ex}") from None
+
+    for part in qualname.split("."):
+        try:
+            obj = getattr(obj, part)
+        except AttributeError:
+            raise ClassSpecError(f"Cannot find {spec}: no attribute {part!r}") from None
+
+    if not (inspect.isclass(obj) and issubclass(obj, DataStruct)):
+        raise ClassSpecError(f"{spec} is not a DataStruct class")
+
+    return obj
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    out = func(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
+def _format_size(size):
+    for unit in ("B", "kB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def profile(args, out=None):
+    """Time (and measure the memory used by) loading files into a DataStruct."""
+    from .benchmarks import trace_memory
+
+    out = out or sys.stdout
+
+    cls = import_class(args.cls)
+
+    timings = []
+
+    dcts = []
+    for filename in args.filenames:
+        dct, elapsed = _timed(serialize.load, filename, args.fmt)
+        dcts.append(dct)
+        timings.append((f"parse {filename}", elapsed))
+
+    if len(dcts) > 1:
+        dct, elapsed = _timed(merge, dcts)
+        timings.append(("merge", elapsed))
+    else:
+        (dct,) = dcts
+
+    obj, elapsed = _timed(cls, dct)
+    timings.append(("validation", elapsed))
+
+    # Profiled separately, as collecting statistics takes time.
+    with instrument.profile() as profiler:
+        cls(dct)
+
+    # Invalid content (e.g. missing values or INVALID containers)
+    # cannot be serialized.
+    errors = obj.get_errors()
+    if errors:
+        timings.append(("to_dict", None))
+    else:
+        _, elapsed = _timed(obj.to_dict)
+        timings.append(("to_dict", elapsed))
+
+    _, memory = trace_memory(lambda: cls(dct))
+
+    width = max(len(name) for name, _ in timings)
+    print("Timing", file=out)
+    for name, elapsed in timings:
+        if elapsed is None:
+            print(f"  {name:<{width}}  {'skipped':>12}    (invalid content)", file=out)
+        else:
+            print(f"  {name:<{width}}  {elapsed * 1e3:12.3f} ms", file=out)
+    print("", file=out)
+
+    print("Memory", file=out)
+    print(
+        f"  result      {_format_size(memory['size']):>12}  "
+        f"({memory['blocks']} blocks)",
+        file=out,
+    )
+    print(f"  peak        {_format_size(memory['peak']):>12}", file=out)
+    print("", file=out)
+
+    print(f"Errors: {len(errors)}", file=out)
+    print("", file=out)
+
+    print(profiler.report(limit=args.top), file=out, end="")
+
+    return 0
+
+
+def format_path(path):
+    """Format the path of an error (e.g. `servers[0].port`)."""
+    return "".join(
+        part if part.startswith("[") or not ndx else "." + part
+        for ndx, part in enumerate(path)
+    )
+
+
+def _error_to_dict(exc):
+    out = dict(type=exc.__class__.__name__, path=format_path(exc.path))
+    if hasattr(exc, "key"):
+        out["key"] = str(exc.key)
+    if hasattr(exc, "value"):
+        out["value"] = reprlib.repr(exc.value)
+    if hasattr(exc, "expected"):
+        expected = exc.expected
+        out["expected"] = getattr(expected, "__name__", None) or str(expected)
+    return out
+
+
+def _validate_file(spec, fmt, err_on_unexpected, err_on_missing, filename):
+    """Validate a file, returning a JSON compatible report."""
+    out = dict(filename=str(filename))
+    try:
+        cls = import_class(spec)
+        obj = cls(serialize.load(filename, fmt))
+    except Exception as ex:
+        # The file cannot be read or parsed.
+        out["errors"] = [dict(type=ex.__class__.__name__, path="", message=str(ex))]
+    else:
+        out["errors"] = [
+            _error_to_dict(exc)
+            for exc in obj.get_errors(err_on_unexpected, err_on_missing)
+        ]
+    out["valid"] = not out["errors"]
+    return out
+
+
+def validate(args, out=None):
+    """Validate files, each one on its own, and report the errors."""
+    out = out or sys.stdout
+
+    # Fail early if the class cannot be imported.
+    import_class(args.cls)
+
+    func = functools.partial(
+        _validate_file,
+        args.cls,
+        args.fmt,
+        not args.ignore_unexpected,
+        not args.ignore_missing,
+    )
+
+    jobs = args.jobs or os.cpu_count()
+    if jobs > 1 and len(args.filenames) > 1:
+        chunksize = max(1, len(args.filenames) // (jobs * 4))
+        with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+            reports = list(executor.map(func, args.filenames, chunksize=chunksize))
+    else:
+        reports = [func(filename) for filename in args.filenames]
+
+    invalid = sum(not report["valid"] for report in reports)
+
+    if args.format == "json":
+        json.dump(
+            dict(valid=len(reports) - invalid, invalid=invalid, files=reports),
+            out,
+            indent=2,
+        )
+        print("", file=out)
+    else:
+        for report in reports:
+            for error in report["errors"]:
+                details = ", ".join(
+                    f"{key}={value}"
+                    for key, value in error.items()
+                    if key not in ("type", "path")
+                )
+                location = f"{report['filename']}:{error['path']}"
+                print(f"{location}: {error['type']}({details})", file=out)
+        print(f"{len(reports)} files, {invalid} invalid", file=out)
+
+    return 1 if invalid else 0
+
+
+def compile_schema(args, out=None):
+    """Generate a module with a compiled loader and serializer
+    (see datastruct.compiler).
+    """
+    from .compiler import compile_module
+
+    source = compile_module(import_class(args.cls))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fo:
+            fo.write(source)
+    else:
+        (out or sys.stdout).write(source)
+
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m datastruct",
+        description="Tools to work with DataStruct classes.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sub = subparsers.add_parser(
+        "profile",
+        help="profile loading files into a DataStruct",
+        description="Time parsing, validation and to_dict separately, "
+        "and show the slowest classes, fields and validators "
+        "and the memory used by the result.",
+    )
+    sub.add_argument("cls", help="DataStruct class, as module:ClassName")
+    sub.add_argument(
+        "filenames",
+        nargs="+",
+        help="files to load (the first has precedence over the last)",
+    )
+    sub.add_argument("--fmt", help="file format (default: inferred from the extension)")
+    sub.add_argument(
+        "--top", type=int, default=10, help="rows shown in each section (default: 10)"
+    )
+    sub.set_defaults(func=profile)
+
+    sub = subparsers.add_parser(
+        "validate",
+        help="validate many files against a DataStruct",
+        description="Validate each file on its own (using a process pool) "
+        "and report all the errors. The exit code is 1 if any file is invalid.",
+    )
+    sub.add_argument("cls", help="DataStruct class, as module:ClassName")
+    sub.add_argument("filenames", nargs="+", help="files to validate")
+    sub.add_argument("--fmt", help="file format (default: inferred from the extension)")
+    sub.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes, 0 for one per CPU (default: 1)",
+    )
+    sub.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="report format (default: text)",
+    )
+    sub.add_argument(
+        "--ignore-unexpected",
+        action="store_true",
+        help="do not report keys not defined in the schema",
+    )
+    sub.add_argument(
+        "--ignore-missing", action="store_true", help="do not report missing values"
+    )
+    sub.set_defaults(func=validate)
+
+    sub = subparsers.add_parser(
+        "compile",
+        help="compile a DataStruct class tree into a module",
+        description="Generate a module with plain Python code to load "
+        "(load(content)) and serialize (dump(obj)) the class. "
+        "If the schema changes, the module falls back to the normal path.",
+    )
+    sub.add_argument("cls", help="DataStruct class, as module:ClassName")
+    sub.add_argument(
+        "-o", "--output", help="file to write the module (default: stdout)"
+    )
+    sub.set_defaults(func=compile_schema)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # Report a class that cannot be found as a usage error.
+    try:
+        import_class(args.cls)
+    except ClassSpecError as ex:
+        parser.error(str(ex))
+
+    return args.func(args)
@@ -0,0 +1,801 @@
+"""
+    datastruct.compiler
+    ~~~~~~~~~~~~~~~~~~~
+
+    Ahead-of-time compilation of a DataStruct class tree
+    into an importable module::
+
+        python -m datastruct compile mypkg.schema:Config -o mypkg/_config_compiled.py
+
+    The generated module provides `load(content, parent_key=MISSING)`,
+    equivalent to `Config(content, parent_key)`, and `dump(obj)`,
+    equivalent to `obj.to_dict()`. The type checks, validator calls
+    and error reporting of each attribute are written out as plain
+    Python code, so no annotation is inspected while loading.
+
+    The module stores the fingerprint of the schema it was generated from.
+    On first use, it compares it with the one of the current classes and,
+    if they differ, it warns and falls back to the normal path.
+    The check is deferred to keep importing the module fast.
+
+    `load` also uses the normal path when called with `fields` or `dedupe`
+    (see `DataStruct.from_dict`), when instances are being deduplicated or
+    when profiling (see datastruct.instrument).
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import hashlib
+import inspect
+import itertools
+
+from . import ds, exceptions, typing_ext
+from .ds import (
+    DEFAULT_TO_KEY,
+    DataStruct,
+    ValueAndError,
+    _annotation_kind,
+    _deduplicating,
+    _error_policy,
+    _summarized,
+)
+
+#: int
+#: Version of the generated code, part of the fingerprint.
+CODEGEN_VERSION = 5
+
+
+def _unwrap(annotation, path):
+    """Unpack Annotated[type, metadata] (PEP 593)."""
+    if isinstance(annotation, typing_ext._AnnotatedAlias):
+        return annotation.__origin__, path + ".__origin__"
+    return annotation, path
+
+
+def _kind(annotation):
+    """Classify an (unwrapped) annotation for the generated code
+    (see `ds._annotation_kind`).
+
+    The conversion plans of `ds._annotation` are not built,
+    so that checking the fingerprint is cheap.
+    """
+    kind = _annotation_kind(annotation)
+    if kind == "datastruct" and annotation.__init__ is not DataStruct.__init__:
+        # A custom constructor must be called.
+        return "other"
+    elif kind in (
+        "datastruct",
+        "kdv",
+        "validator",
+        "union",
+        "sequence",
+        "dict",
+        "type",
+    ):
+        return kind
+    # e.g. LazyDict, handled by ds.from_plain_value.
+    return "other"
+
+
+def _name(obj):
+    return f"{obj.__module__}.{obj.__qualname__}"
+
+
+def _describe(annotation, classes, described):
+    """Describe everything about an annotation that is written into
+    the generated code, adding the DataStruct classes found to classes.
+
+    Other annotations are described once for each object (by id)
+    in described, as most of them (e.g. int) are used many times.
+    """
+    annotation, _ = _unwrap(annotation, "")
+
+    if inspect.isclass(annotation) and issubclass(annotation, DataStruct):
+        if annotation not in classes:
+            # Set first to support recursive schemas.
+            classes[annotation] = None
+            classes[annotation] = (
+                annotation.__init__ is DataStruct.__init__,
+                annotation.to_dict is DataStruct.to_dict,
+                annotation.__frozen__,
+                tuple(sorted(annotation.__intern__)),
+                tuple(
+                    (
+                        name,
+                        _describe(ann, classes, described),
+                        _default(annotation, name),
+                    )
+                    for name, ann in annotation.__fields__.items()
+                ),
+            )
+        return _name(annotation)
+
+    try:
+        return described[id(annotation)]
+    except KeyError:
+        pass
+
+    kind = _kind(annotation)
+    if kind == "kdv":
+        out = (
+            kind,
+            _name(annotation),
+            tuple(
+                (k, _describe(v, classes, described))
+                for k, v in annotation.content.items()
+            ),
+        )
+    elif kind == "validator":
+        out = kind, hasattr(annotation, "validate_many")
+    elif kind in ("union", "sequence", "dict") or typing_ext.is_qualified_generic(
+        annotation
+    ):
+        out = (
+            kind,
+            repr(annotation.__origin__),
+            tuple(_describe(arg, classes, described) for arg in annotation.__args__),
+        )
+    else:
+        out = kind, repr(annotation)
+
+    described[id(annotation)] = out
+    return out
+
+
+def _default(cls, name):
+    if not hasattr(cls, name):
+        return "required"
+    elif getattr(cls, name) is DEFAULT_TO_KEY:
+        return "default_to_key"
+    return "default"
+
+
+def fingerprint(cls) -> str:
+    """Fingerprint of the schema of a DataStruct class and the classes it uses.
+
+    It changes when any of the classes adds, removes, reorders or
+    changes the annotation or the kind of default of an attribute,
+    or changes the interned attributes.
+    Validators are referenced, so their implementation is not part of it.
+    """
+    classes = {}
+    _describe(cls, classes, {})
+    description = repr(
+        (CODEGEN_VERSION, [(_name(klass), desc) for klass, desc in classes.items()])
+    )
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+# Helpers used by the generated code.
+
+
+def _invalid(exc):
+    """(INVALID, errors) for an error, following the error collection policy."""
+    out = ValueAndError.from_exc(exc)
+    return out.value, out.errors
+
+
+def _value_error(errors, exc, key):
+    policy = _error_policy.get()
+    if policy is not None:
+        exc = policy.accept(exc)
+        if exc is None:
+            return
+    errors.append(exc.with_parent(key))
+
+
+def _index_error(errors, exc, index):
+    policy = _error_policy.get()
+    if policy is not None:
+        exc = policy.accept(exc)
+        if exc is None:
+            return
+    errors.append(exc.with_index(index))
+
+
+def _check_many(annotation, values):
+    """(value, errors) for each value, validated in a single call."""
+    values = list(values)
+    invalid = annotation.validate_many(values)
+    if not invalid:
+        return [(value, ()) for value in values]
+
+    invalid = set(invalid)
+    return [
+        _invalid(exceptions.WrongValueError(value, annotation))
+        if ndx in invalid
+        else (value, ())
+        for ndx, value in enumerate(values)
+    ]
+
+
+def _summarize(dct):
+    dct["__errors__"] = _summarized(dct["__errors__"])
+
+
+def _use_compiled():
+    """False if the compiled code cannot be used in the current context,
+    i.e. when deduplicating instances or profiling.
+    """
+    return ds._dedupe.get() is None and ds._profiler is None
+
+
+def _load(cls, content, parent_key, fields, dedupe):
+    """Load content using the normal path."""
+    with _deduplicating(dedupe):
+        return cls(content, parent_key, fields=fields)
+
+
+_HEADER = '''\
+"""Compiled loader and serializer for {spec}.
+
+Generated by `python -m datastruct compile {spec}`, do not edit.
+
+- load(content, parent_key=MISSING, *, fields=None, dedupe=False) is equivalent
+  to {name}(content, parent_key, fields=fields), deduplicating if dedupe is True
+- dump(obj) is equivalent to obj.to_dict()
+
+On first use, the schema is compared with the one used to generate this module.
+If it does not match, both fall back to the normal path (with a warning).
+"""
+
+import importlib as _importlib
+import warnings as _warnings
+
+from datastruct.compiler import _check_many, _index_error, _invalid, _load
+from datastruct.compiler import _summarize, _use_compiled, _value_error
+from datastruct.compiler import fingerprint as _fingerprint
+from datastruct.ds import INVALID, MISSING
+from datastruct.ds import _add_error, _freeze, _intern, _summarized
+from datastruct.ds import from_plain_value as _from_plain_value
+from datastruct.ds import to_plain_value as _to_plain_value
+from datastruct.exceptions import MissingValueError as _MissingValueError
+from datastruct.exceptions import UnexpectedKeyError as _UnexpectedKeyError
+from datastruct.exceptions import WrongTypeError as _WrongTypeError
+from datastruct.exceptions import WrongValueError as _WrongValueError
+
+FINGERPRINT = {fingerprint!r}
+
+_root = _importlib.import_module({module!r}).{qualname}
+'''
+
+_FOOTER = """
+
+
+#: True if the compiled code is used, False if the schema changed,
+#: None until checked on first use (see `COMPILED`).
+_COMPILED = None
+
+
+def _check():
+    global _COMPILED
+{globals}
+
+    if _COMPILED is None:
+        _COMPILED = _fingerprint(_root) == FINGERPRINT
+        if _COMPILED:
+{constants}
+        else:
+            _warnings.warn(
+                "The schema of {spec} changed after {{}} was generated, "
+                "using the normal path. Compile it again.".format(__name__),
+                stacklevel=3,
+            )
+    return _COMPILED
+
+
+def __getattr__(name):
+    # COMPILED is checked on first access, to keep importing this module fast.
+    if name == "COMPILED":
+        return _check()
+    raise AttributeError("module {{!r}} has no attribute {{!r}}".format(__name__, name))
+
+
+def load(content, parent_key=MISSING, *, fields=None, dedupe=False):
+    if (
+        fields is None
+        and not dedupe
+        and (_COMPILED or _check())
+        and _use_compiled()
+    ):
+        return {loader}(content, parent_key)
+    return _load(_root, content, parent_key, fields, dedupe)
+
+
+def dump(obj):
+    if _COMPILED or _check():
+        return {dumper}(obj)
+    return obj.to_dict()
+"""
+
+
+class _Compiler:
+    """Generate the code for a DataStruct class tree.
+
+    Annotations are referenced by their path from the root class
+    (e.g. `_root.__fields__['servers'].__args__[0]`), so that
+    classes defined within functions (e.g. `value_in`) are supported.
+    """
+
+    def __init__(self):
+        #: Dict[str, str]
+        #: expression -> name of the module level constant.
+        self.constants = {}
+
+        #: List[str]
+        #: Source code of the functions.
+        self.functions = []
+
+        #: Dict[type, str]
+        #: DataStruct class -> name of the function that builds it.
+        self.builders = {}
+
+        #: Dict[type, str]
+        #: DataStruct class -> name of its converter function.
+        self.converters = {}
+
+        #: Dict[type, str]
+        #: DataStruct class -> name of the function that converts it to a dict.
+        self.dumpers = {}
+
+        self.counter = itertools.count()
+
+    def constant(self, expression, prefix="_A"):
+        try:
+            return self.constants[expression]
+        except KeyError:
+            name = self.constants[expression] = f"{prefix}{len(self.constants)}"
+            return name
+
+    def new_name(self, prefix):
+        return f"{prefix}_{next(self.counter)}"
+
+    def add_function(self, lines):
+        self.functions.append("\n".join(lines))
+
+    # Conversion from plain values.
+
+    def leaf(self, annotation, path, var):
+        """Condition and error of a type or validator check,
+        or None if the annotation needs a converter function.
+        """
+        kind = _kind(annotation)
+        if kind == "type":
+            const = self.constant(path)
+            return f"isinstance({var}, {const})", f"_WrongTypeError({var}, {const})"
+        elif kind == "validator":
+            const = self.constant(path)
+            return f"{const}.validate({var})", f"_WrongValueError({var}, {const})"
+        return None
+
+    def converter(self, annotation, path):
+        """Name of a function `(value, key=MISSING) -> (value, errors)`
+        for an annotation (see `ds.from_plain_value`).
+        """
+        annotation, path = _unwrap(annotation, path)
+        kind = _kind(annotation)
+
+        if kind == "datastruct":
+            return self.datastruct_converter(annotation, path)
+
+        name = self.new_name("_convert")
+        lines = [f"def {name}(value, key=MISSING):"]
+
+        leaf = self.leaf(annotation, path, "value")
+        if leaf is not None:
+            cond, exc = leaf
+            lines += [
+                f"    if {cond}:",
+                "        return value, ()",
+                f"    return _invalid({exc})",
+            ]
+
+        elif kind == "kdv":
+            const = self.constant(path)
+            converters = ", ".join(
+                self.converter(value, f"list({path}.content.values())[{ndx}]")
+                for ndx, value in enumerate(annotation.content.values())
+            )
+            table = self.constant(
+                f"dict(zip({const}.content, ({converters},)))", prefix="_T"
+            )
+            lines += [
+                "    if not isinstance(value, dict):",
+                "        return _invalid(_WrongTypeError(value, dict))",
+                "    if len(value) != 1:",
+                '        return _invalid(_WrongValueError(value, "Len 1"))',
+                "    k, v = dict(value).popitem()",
+                f"    convert = {table}.get(k)",
+                "    if convert is None:",
+                "        return _invalid(",
+                "            _WrongValueError(",
+                f'                k, "key in %s" % repr(tuple({const}.content.keys()))',
+                "            )",
+                "        )",
+                "    return convert(v)",
+            ]
+
+        elif kind == "union":
+            const = self.constant(path)
+            types = self.constant(f"tuple({path}.__args__)", prefix="_T")
+            lines += [
+                f"    if isinstance(value, {types}):",
+                "        return value, ()",
+                f"    return _invalid(_WrongValueError(value, {const}))",
+            ]
+
+        elif kind == "sequence":
+            lines += self.sequence_body(annotation, path)
+
+        elif kind == "dict":
+            lines += self.dict_body(annotation, path)
+
+        else:
+            const = self.constant(path)
+            lines += [
+                f"    out = _from_plain_value({const}, value, key)",
+                "    return out.value, out.errors",
+            ]
+
+        self.add_function(lines)
+        return name
+
+    def sequence_body(self, annotation, path):
+        container = annotation.__origin__.__name__
+        element, element_path = _unwrap(annotation.__args__[0], f"{path}.__args__[0]")
+        kind = _kind(element)
+
+        lines = [
+            f"    if not isinstance(value, {container}):",
+            f"        return _invalid(_WrongTypeError(value, {container}))",
+        ]
+
+        if kind == "validator" and hasattr(element, "validate_many"):
+            const = self.constant(element_path)
+            return lines + [
+                f"    return _finish_sequence(_check_many({const}, value), {container})"
+            ]
+
+        leaf = self.leaf(element, element_path, "el")
+        if leaf is not None:
+            cond, exc = leaf
+            return lines + [
+                "    for el in value:",
+                f"        if not ({cond}):",
+                "            break",
+                "    else:",
+                f"        return {container}(value), ()",
+                "    out = []",
+                "    errors = []",
+                "    for ndx, el in enumerate(value):",
+                f"        if {cond}:",
+                "            out.append(el)",
+                "        else:",
+                "            out.append(INVALID)",
+                f"            _index_error(errors, {exc}, ndx)",
+                "    if errors:",
+                "        errors = _summarized(errors)",
+                "    return out, errors"
+                if container == "list"
+                else f"    return {container}(out), errors",
+            ]
+
+        convert = self.converter(element, element_path)
+        return lines + [
+            f"    return _finish_sequence([{convert}(el) for el in value], {container})"
+        ]
+
+    def dict_body(self, annotation, path):
+        lines = [
+            "    if not isinstance(value, dict):",
+            "        return _invalid(_WrongTypeError(value, dict))",
+        ]
+
+        # As in ds.from_plain_value, all keys are converted before the values.
+        for var, ndx, items in (("k", 0, "value"), ("v", 1, "value.values()")):
+            ann, ann_path = _unwrap(annotation.__args__[ndx], f"{path}.__args__[{ndx}]")
+            target = "keys" if ndx == 0 else "values"
+            leaf = self.leaf(ann, ann_path, var)
+
+            if _kind(ann) == "validator" and hasattr(ann, "validate_many"):
+                const = self.constant(ann_path)
+                lines.append(f"    {target} = _check_many({const}, {items})")
+            elif leaf is not None:
+                cond, exc = leaf
+                lines.append(
+                    f"    {target} = [({var}, ()) if {cond} else _invalid({exc}) "
+                    f"for {var} in {items}]"
+                )
+            elif ndx == 0:
+                convert = self.converter(ann, ann_path)
+                lines.append(f"    keys = [{convert}(k) for k in value]")
+            else:
+                convert = self.converter(ann, ann_path)
+                lines.append(
+                    f"    values = [{convert}(v, k) for k, v in value.items()]"
+                )
+
+        return lines + [
+            "    out = {}",
+            "    errors = []",
+            "    for (k, key_errors), (v, value_errors) in zip(keys, values):",
+            "        out[k] = v",
+            "        if key_errors:",
+            '            errors.extend(exc.with_parent("in key") for exc in key_errors)',
+            "        if value_errors:",
+            "            errors.extend(exc.with_index(k) for exc in value_errors)",
+            "    if errors:",
+            "        errors = _summarized(errors)",
+            "    return out, errors",
+        ]
+
+    def datastruct_converter(self, cls, path):
+        try:
+            return self.converters[cls]
+        except KeyError:
+            pass
+
+        builder = self.builder(cls, path)
+        name = self.converters[cls] = self.new_name("_convert")
+        const = self.constant(path)
+        self.add_function(
+            [
+                f"def {name}(value, key=MISSING):",
+                f"    if not isinstance(value, {const}):",
+                "        if not isinstance(value, dict):",
+                "            raise ValueError(",
+                '                "DataStruct instances must be constructed with a dict"',
+                "            )",
+                f"        value = {builder}(value, key)",
+                "    return value, value.__errors__",
+            ]
+        )
+        return name
+
+    def builder(self, cls, path):
+        """Name of a function `(content, parent_key) -> instance`
+        equivalent to `DataStruct.__init__`.
+        """
+        try:
+            return self.builders[cls]
+        except KeyError:
+            pass
+
+        name = self.builders[cls] = self.new_name("_build")
+        const = self.constant(path)
+
+        lines = [
+            f"def {name}(content, key=MISSING):",
+            f"    obj = {const}.__new__({const})",
+            "    dct = obj.__dict__",
+            '    errors = dct["__errors__"] = []',
+            "    value_errors = []",
+        ]
+
+        # Part 1: the provided items.
+        lines.append("    for k, v in content.items():")
+        for ndx, (key, annotation) in enumerate(cls.__fields__.items()):
+            lines.append(f"        {'if' if ndx == 0 else 'elif'} k == {key!r}:")
+            lines += self.field(
+                annotation,
+                f"{path}.__fields__[{key!r}]",
+                key,
+                key in cls.__intern__,
+                cls.__frozen__,
+            )
+
+        unexpected = f"_add_error(errors, _UnexpectedKeyError(k, {const}))"
+        if cls.__fields__:
+            lines += ["        else:", f"            {unexpected}"]
+        else:
+            lines.append(f"        {unexpected}")
+
+        # Part 2: the attributes not provided.
+        for key, annotation in cls.__fields__.items():
+            default = _default(cls, key)
+            if default == "required":
+                lines += [
+                    f"    if {key!r} not in content:",
+                    f"        _add_error(errors, _MissingValueError({key!r}, {const}))",
+                ]
+            elif default == "default_to_key":
+                message = f"In %s.{key}, cannot DEFAULT_TO_KEY outside a dict"
+                lines += [
+                    f"    if {key!r} not in content:",
+                    "        if key is MISSING:",
+                    f"            raise ValueError({message!r} % {const})",
+                    "        v = key",
+                ]
+                lines += self.field(
+                    annotation,
+                    f"{path}.__fields__[{key!r}]",
+                    key,
+                    key in cls.__intern__,
+                    cls.__frozen__,
+                    indent=8,
+                )
+
+        lines += [
+            "    if value_errors:",
+            "        errors.extend(value_errors)",
+            "    if errors:",
+            "        _summarize(dct)",
+            "    return obj",
+        ]
+
+        self.add_function(lines)
+        return name
+
+    def field(self, annotation, path, key, intern=False, freeze=False, indent=12):
+        """Lines converting `v` and storing it in the `key` attribute
+        (interning its strings if intern is True, and converting its
+        containers into read-only ones if freeze is True, see `ds._freeze`).
+        """
+        annotation, path = _unwrap(annotation, path)
+        pad = " " * indent
+        store = "_intern(v)" if intern else "v"
+        if freeze and _kind(annotation) != "datastruct":
+            store = f"_freeze({store})"
+
+        leaf = self.leaf(annotation, path, "v")
+        if leaf is not None:
+            cond, exc = leaf
+            lines = [
+                f"if {cond}:",
+                f"    dct[{key!r}] = {store}",
+                "else:",
+                f"    dct[{key!r}] = INVALID",
+                f"    _value_error(value_errors, {exc}, {key!r})",
+            ]
+        else:
+            convert = self.converter(annotation, path)
+            lines = [
+                f"v, errs = {convert}(v)",
+                f"dct[{key!r}] = {store}",
+                "if errs:",
+                f"    value_errors.extend(exc.with_parent({key!r}) for exc in errs)",
+            ]
+
+        return [pad + line for line in lines]
+
+    # Conversion to plain values.
+
+    def dump_expression(self, annotation, path, var):
+        """Expression converting `var` into a plain value (see `ds.to_plain_value`)."""
+        annotation, path = _unwrap(annotation, path)
+        kind = _kind(annotation)
+
+        if kind in ("type", "validator"):
+            return var
+
+        elif kind == "datastruct":
+            return f"{self.dumper(annotation, path)}({var})"
+
+        elif kind == "sequence":
+            container = annotation.__origin__.__name__
+            element, element_path = _unwrap(
+                annotation.__args__[0], f"{path}.__args__[0]"
+            )
+            el = self.new_name("_el")
+            expr = self.dump_expression(element, element_path, el)
+            if expr == el:
+                return f"{container}({var})"
+            elif container == "list":
+                return f"[{expr} for {el} in {var}]"
+            return f"{container}([{expr} for {el} in {var}])"
+
+        elif kind == "dict":
+            k, v = self.new_name("_k"), self.new_name("_v")
+            kexpr = self.dump_expression(
+                annotation.__args__[0], f"{path}.__args__[0]", k
+            )
+            vexpr = self.dump_expression(
+                annotation.__args__[1], f"{path}.__args__[1]", v
+            )
+            if kexpr == k and vexpr == v:
+                return f"dict({var})"
+            return f"{{{kexpr}: {vexpr} for {k}, {v} in {var}.items()}}"
+
+        return f"_to_plain_value({self.constant(path)}, {var})"
+
+    def dumper(self, cls, path):
+        """Name of a function `(instance) -> dict` equivalent to `to_dict`."""
+        try:
+            return self.dumpers[cls]
+        except KeyError:
+            pass
+
+        name = self.dumpers[cls] = self.new_name("_dump")
+        const = self.constant(path)
+
+        lines = [f"def {name}(obj):"]
+        if cls.to_dict is not DataStruct.to_dict:
+            lines.append("    return obj.to_dict()")
+        else:
+            lines += [
+                f"    if obj.__class__ is not {const}:",
+                "        # e.g. an instance of a subclass.",
+                "        return obj.to_dict()",
+                "    return {",
+            ]
+            for key, annotation in cls.__fields__.items():
+                expr = self.dump_expression(
+                    annotation, f"{path}.__fields__[{key!r}]", f"obj.{key}"
+                )
+                lines.append(f"        {key!r}: {expr},")
+            lines.append("    }")
+
+        self.add_function(lines)
+        return name
+
+
+_FINISH_SEQUENCE = """\
+def _finish_sequence(items, container):
+    out = []
+    errors = []
+    for ndx, (el, errs) in enumerate(items):
+        out.append(el)
+        if errs:
+            errors.extend(exc.with_index(ndx) for exc in errs)
+    if errors:
+        errors = _summarized(errors)
+    return container(out), errors"""
+
+
+def compile_module(cls) -> str:
+    """Generate the source code of a module with a compiled loader
+    and serializer for a DataStruct class (see module docstring).
+
+    Parameters
+    ----------
+    cls : type
+        a DataStruct subclass that can be imported by its module and name.
+
+    Returns
+    -------
+    str
+    """
+    if not (inspect.isclass(cls) and issubclass(cls, DataStruct)):
+        raise ValueError(f"{cls} is not a DataStruct class")
+
+    if "<locals>" in cls.__qualname__:
+        raise ValueError(f"{cls} cannot be imported, define it at module level")
+
+    if _kind(cls) != "datastruct":
+        raise ValueError(f"{cls} defines __init__ and cannot be compiled")
+
+    compiler = _Compiler()
+    builder = compiler.builder(cls, "_root")
+    dumper = compiler.dumper(cls, "_root")
+
+    spec = f"{cls.__module__}:{cls.__qualname__}"
+    constants = "\n".join(
+        f"            {name} = {expression}"
+        for expression, name in compiler.constants.items()
+    )
+    names = list(compiler.constants.values())
+    global_names = "\n".join(
+        "    global " + ", ".join(names[ndx : ndx + 8])
+        for ndx in range(0, len(names), 8)
+    )
+
+    return "\n\n\n".join(
+        [
+            _HEADER.format(
+                spec=spec,
+                name=cls.__name__,
+                fingerprint=fingerprint(cls),
+                module=cls.__module__,
+                qualname=cls.__qualname__,
+            ).rstrip("\n"),
+            _FINISH_SEQUENCE,
+            *compiler.functions,
+        ]
+    ) + _FOOTER.format(
+        spec=spec,
+        loader=builder,
+        dumper=dumper,
+        globals=global_names,
+        constants=constants,
+    )
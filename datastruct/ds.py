@@ -8,16 +8,28 @@
     :license: BSD, see LICENSE for more details.
 """
 
+import collections.abc
+import contextlib
+import contextvars
+import functools
 import inspect
+import itertools
+import math
+import operator
 import pathlib
+import re
+import reprlib
+import sys
+import time
 import typing
-from typing import Iterable, List, Tuple, Union, get_type_hints
-
-import serialize
+from typing import Iterable, Tuple, Union, get_type_hints
 
 from . import exceptions, typing_ext
 from .common import merge
 
+# serialize (and its format backends), asyncio and concurrent.futures
+# are imported when needed to keep `import datastruct` fast.
+
 
 def named_object(name):
     class CLS:
@@ -26,6 +38,10 @@ def named_object(name):
 
         __repr__ = __str__
 
+        def __reduce__(self):
+            # Pickled as a reference to the module level object.
+            return name
+
     return CLS()
 
 
@@ -35,37 +51,30 @@ DEFAULT_TO_KEY = named_object("DEFAULT_TO_KEY")
 
 
 class ValueAndError:
-    """This class provides a comm"""
-
-    def __init__(self, value, error=()):
-        self.value = value
-        self.error = error
-
-    def get_errors(self) -> Tuple[exceptions.ValidationError]:
-        out = []
-        if isinstance(self.value, dict):
-            for k, v in self.value.items():
-                out.extend((exc.with_parent("in key") for exc in k.get_errors()))
-                out.extend((exc.with_index(k.flatten()) for exc in v.get_errors()))
-
-        elif isinstance(self.value, (list, tuple)):
-            for ndx, el in enumerate(self.value):
-                out.extend((exc.with_index(ndx) for exc in el.get_errors()))
+    """A converted value and the errors found when converting it.
 
-        elif isinstance(self.value, self.__class__):
-            out.extend(self.value.get_errors())
+    The value is already flat (i.e. containers hold converted values)
+    and the paths of the errors are relative to the value, so that
+    no further traversal is needed to use them.
+    """
 
-        elif isinstance(self.value, DataStruct):
-            out.extend(self.value.get_errors())
+    __slots__ = ("value", "errors")
 
-        if isinstance(self.error, exceptions.ValidationError):
-            out.append(self.error)
+    def __init__(self, value, errors=()):
+        self.value = value
+        self.errors = errors
 
-        return tuple(out)
+    def get_errors(self) -> Tuple[exceptions.ValidationError]:
+        return tuple(self.errors)
 
     @classmethod
     def from_exc(cls, exc: exceptions.ValidationError):
-        return cls(INVALID, exc)
+        policy = _error_policy.get()
+        if policy is not None:
+            exc = policy.accept(exc)
+            if exc is None:
+                return cls(INVALID)
+        return cls(INVALID, (exc,))
 
     @classmethod
     def auto(cls, value):
@@ -74,134 +83,723 @@ class ValueAndError:
         return cls(value)
 
     def flatten(self):
-        if isinstance(self.value, dict):
-            return {k.flatten(): v.flatten() for k, v in self.value.items()}
-        elif isinstance(self.value, list):
-            return [el.flatten() for el in self.value]
-        elif isinstance(self.value, tuple):
-            return tuple(el.flatten() for el in self.value)
-        elif isinstance(self.value, self.__class__):
-            return self.value.flatten()
-        elif isinstance(self.value, DataStruct):
-            return self.value.flatten()
-        else:
-            return self.value
+        return self.value
+
+
+class _ErrorPolicy:
+    """How errors are collected while loading content (see `DataStruct.from_dict`)."""
+
+    def __init__(self, max_errors=None, summary=False):
+        self.max_errors = max_errors
+        self.summary = summary
+
+        #: int
+        #: Number of errors accepted so far.
+        self.count = 0
+
+    def accept(self, exc):
+        """Return the error to record or None if the limit has been reached.
+
+        Errors beyond the limit have already been built by the caller,
+        they are only discarded here (neither stored nor propagated).
+        """
+        if self.max_errors is not None and self.count >= self.max_errors:
+            return None
+        self.count += 1
+
+        if self.summary and hasattr(exc, "value"):
+            # Do not keep a reference to (possibly large) invalid values.
+            exc.value = reprlib.repr(exc.value)
+
+        return exc
+
+
+#: Error collection policy, None to collect all errors.
+_error_policy = contextvars.ContextVar("error_policy", default=None)
+
+
+@contextlib.contextmanager
+def _collecting_errors(max_errors=None, summary=False):
+    if max_errors is None and not summary:
+        yield
+        return
+
+    token = _error_policy.set(_ErrorPolicy(max_errors, summary))
+    try:
+        yield
+    finally:
+        _error_policy.reset(token)
+
+
+class _Dedupe:
+    """Share the instances of frozen DataStruct classes built from
+    equal content while loading (see `DataStruct.from_dict`).
+    Frozen instances are immutable, so they can be safely shared.
+
+    Plain values are hash-consed: each distinct subtree gets an integer,
+    so that equal content is found without comparing it (or hashing it)
+    again at each level.
+    """
+
+    def __init__(self):
+        #: Dict[tuple, int]
+        #: (type, values or ids of the children) -> id of the distinct subtree.
+        self.nodes = {}
+
+        #: Dict[int, Tuple[int, Any]]
+        #: id(container) -> (id of the distinct subtree, container).
+        #: The container is kept so that its id is not reused.
+        self.containers = {}
+
+        #: Dict[tuple, DataStruct]
+        #: (class, id of the distinct subtree, parent key) -> shared instance.
+        self.instances = {}
+
+    def node(self, value):
+        """Id of the distinct subtree equal to a container (dict, list or tuple).
+
+        Raises TypeError if value contains unhashable leaves.
+        """
+        try:
+            return self.containers[id(value)][0]
+        except KeyError:
+            pass
+
+        # Children are represented by their id (containers), the value (str)
+        # or (type, value) to tell apart equal values of different types
+        # (e.g. 1, 1.0 and True). Floats also include the sign, as 0.0 == -0.0.
+        items = []
+        append = items.append
+        for item in (
+            itertools.chain.from_iterable(value.items())
+            if isinstance(value, dict)
+            else value
+        ):
+            klass = item.__class__
+            if klass is str:
+                append(item)
+            elif klass in (dict, list, tuple) or isinstance(item, (dict, list, tuple)):
+                append(self.node(item))
+            elif isinstance(item, float):
+                append((klass, item, math.copysign(1.0, item)))
+            else:
+                append((klass, item))
+
+        nodes = self.nodes
+        out = nodes.setdefault((value.__class__, tuple(items)), len(nodes))
+        self.containers[id(value)] = (out, value)
+        return out
+
+    def instance(self, cls, content, parent_key=MISSING):
+        """Build an instance of cls, or get the one built from equal content."""
+        try:
+            key = (
+                cls,
+                self.node(content),
+                parent_key if cls.__default_to_key__ else MISSING,
+            )
+            instance = self.instances.get(key)
+        except TypeError:
+            # Unhashable content or key.
+            return cls(content, parent_key)
+
+        if instance is None:
+            instance = cls(content, parent_key)
+            if not instance.__errors__:
+                # Invalid content is not shared, so that the errors
+                # are reported (and counted) at each location.
+                self.instances[key] = instance
+
+        return instance
+
+
+#: Table of the instances shared while loading, None if disabled.
+_dedupe = contextvars.ContextVar("dedupe", default=None)
+
 
+@contextlib.contextmanager
+def _deduplicating(dedupe=False):
+    if not dedupe:
+        yield
+        return
 
-def from_plain_value(annotation, value, key=MISSING):
+    token = _dedupe.set(_Dedupe())
+    try:
+        yield
+    finally:
+        _dedupe.reset(token)
+
+
+def _intern(value):
+    """Intern the strings within a converted value (see the `intern` class keyword).
+
+    Strings in lists, tuples and dicts (keys and values) are interned,
+    other values (including DataStructs) are returned as is.
+    """
+    cls = value.__class__
+    if cls is str:
+        return sys.intern(value)
+    elif cls is list or cls is tuple:
+        return cls([_intern(el) for el in value])
+    elif cls is dict:
+        return {_intern(k): _intern(v) for k, v in value.items()}
+    return value
+
+
+def _intern_attributes(cls, dct):
+    """Intern the names of the attributes stored in dct (usually the keys
+    of the content, which are new strings for each loaded file) and
+    the values of the attributes listed in `cls.__intern__`.
+    """
+    fields = cls.__fields__
+    to_intern = cls.__intern__
+    intern = sys.intern
+
+    # The dict is rebuilt, as assigning an equal key keeps the old one.
+    items = []
+    append = items.append
+    for key, value in dct.items():
+        if key in fields:
+            key = intern(key)
+            if key in to_intern:
+                value = intern(value) if value.__class__ is str else _intern(value)
+        append((key, value))
+    dct.clear()
+    dct.update(items)
+
+
+def _freeze(value):
+    """Read-only version of a converted value (see the `frozen` class keyword).
+
+    Lists and tuples are converted into tuples, and dicts into read-only dicts,
+    recursively. Other values (including DataStructs) are returned as is.
+    """
+    cls = value.__class__
+    if cls is list or cls is tuple:
+        return tuple([_freeze(el) for el in value])
+    elif cls is dict:
+        return _FrozenDict({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _freeze_attributes(cls, dct):
+    """Freeze the values of the attributes stored in dct (see `_freeze`)."""
+    for key in cls.__fields__:
+        if key in dct:
+            dct[key] = _freeze(dct[key])
+
+
+class _FrozenDict(dict):
+    """Read-only dict, used for the dicts in frozen DataStructs.
+
+    It is still a dict, so that it is handled (and compared) as the dicts
+    built when converting values.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("read-only dict does not support modification")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return _FrozenDict, (dict(self),)
+
+
+#: Profiler collecting statistics (see datastruct.instrument), None if disabled.
+_profiler = None
+
+
+def _add_error(errors, exc):
+    """Append an error to a list, following the error collection policy."""
+    policy = _error_policy.get()
+    if policy is not None:
+        exc = policy.accept(exc)
+        if exc is None:
+            return
+    errors.append(exc)
+
+
+def _summarized(errors):
+    """Summarize errors (see `exceptions.summarize`) if the error policy
+    requests it, otherwise return them as is.
+
+    Used for the errors of each DataStruct and container as it is built,
+    so that the errors of all elements are not kept until the root is built.
+    """
+    policy = _error_policy.get()
+    if policy is not None and policy.summary:
+        return exceptions.summarize(errors)
+    return errors
+
+
+def from_plain_value(annotation, value, key=MISSING, fields=None):
     """Convert a plain value (typically loaded from a file)
     into a DataStruct compatible value.
+
+    If fields (a projection, see `DataStruct.from_dict`) is given,
+    only the selected attributes of the DataStructs within the value
+    are converted.
     """
-    # (0) Unpack the annotation if it's an Annotated[type, metadata] instance (PEP 593).
-    if isinstance(annotation, typing_ext._AnnotatedAlias):
-        annotation = annotation.__origin__
+    try:
+        convert = _ANNOTATIONS[id(annotation)].convert
+    except KeyError:
+        convert = _annotation(annotation).convert
+    return convert(value, key, fields)
+
+
+def validate_many(annotation, values):
+    """Validate multiple plain values in a single call if the annotation
+    supports it (i.e. it has a `validate_many` method).
+
+    Parameters
+    ----------
+    annotation
+    values : Iterable
+
+    Returns
+    -------
+    list of ValueAndError or None
+        None if the annotation does not support batch validation.
+    """
+    validator = _annotation(annotation).batch
+    if validator is None:
+        return None
+    return _validate_batch(validator, values)
+
+
+def _validate_batch(validator, values):
+    values = list(values)
+    if _profiler is None:
+        invalid = set(validator.validate_many(values))
+    else:
+        invalid = set(_profiler.validate_many(validator, values))
+
+    if not invalid:
+        return [ValueAndError(value) for value in values]
+
+    return [
+        ValueAndError.from_exc(exceptions.WrongValueError(value, validator))
+        if ndx in invalid
+        else ValueAndError(value)
+        for ndx, value in enumerate(values)
+    ]
+
+
+class _Annotation:
+    """How the values of an annotation are converted and serialized.
+
+    Built once for each annotation object (see `_annotation`),
+    and shared by all the DataStruct classes that use it.
+    """
+
+    __slots__ = ("annotation", "kind", "batch", "convert", "serialize")
 
+    def __init__(self, annotation, equal=None):
+        self.annotation = annotation
+
+        # An equal annotation object (see `_annotation`) shares the plan.
+        if equal is not None:
+            self._share(equal)
+            return
+
+        # (0) Annotated[type, metadata] (PEP 593) is handled as type.
+        if isinstance(annotation, typing_ext._AnnotatedAlias):
+            self._share(_annotation(annotation.__origin__))
+            return
+
+        #: str
+        #: kind of annotation (see `_annotation_kind`).
+        self.kind = _annotation_kind(annotation)
+
+        #: validator with a validate_many method, or None.
+        self.batch = (
+            annotation
+            if self.kind == "validator" and hasattr(annotation, "validate_many")
+            else None
+        )
+
+        #: Callable[[Any, Any, Any], ValueAndError]
+        #: (value, key, fields) -> converted value, see `from_plain_value`.
+        self.convert = _make_converter(self.kind, annotation)
+
+        #: Callable[[Any], Any]
+        #: value -> plain value, see `to_plain_value`.
+        self.serialize = _make_serializer(self.kind, annotation)
+
+    def _share(self, other):
+        self.kind = other.kind
+        self.batch = other.batch
+        self.convert = other.convert
+        self.serialize = other.serialize
+
+
+#: Dict[int, _Annotation]
+#: id(annotation) -> how to convert and serialize it.
+#: Looking up by id is much faster than hashing a generic (e.g. Dict[str, int]).
+#: Each entry references its annotation object, so that the id is not reused.
+_ANNOTATIONS = {}
+
+#: Dict[Any, _Annotation]
+#: annotation -> how to convert and serialize it, to share the plan
+#: between equal annotation objects (e.g. get_type_hints builds new ones
+#: when removing Annotated).
+_EQUAL_ANNOTATIONS = {}
+
+#: int
+#: Maximum number of entries in _ANNOTATIONS. Annotations created at runtime
+#: (e.g. classes defined in functions, `value_in(...)` validators or generics
+#: built again after typing evicts them from its cache) would otherwise be kept
+#: forever, so the caches start over when the limit is reached.
+_MAX_ANNOTATIONS = 4096
+
+
+def _annotation(annotation):
+    """Get (or build and cache) the _Annotation for an annotation object."""
+    try:
+        return _ANNOTATIONS[id(annotation)]
+    except KeyError:
+        pass
+
+    if len(_ANNOTATIONS) >= _MAX_ANNOTATIONS:
+        _ANNOTATIONS.clear()
+        _EQUAL_ANNOTATIONS.clear()
+
+    try:
+        equal = _EQUAL_ANNOTATIONS.get(annotation)
+    except TypeError:
+        # Unhashable, e.g. Annotated with a list as metadata.
+        equal = None
+        hashable = False
+    else:
+        hashable = True
+
+    out = _Annotation(annotation, equal)
+    if equal is None and hashable:
+        _EQUAL_ANNOTATIONS[annotation] = out
+
+    _ANNOTATIONS[id(annotation)] = out
+    return out
+
+
+def _annotation_kind(annotation):
+    """Classify an annotation (without unpacking Annotated)."""
     # (1) The annotation is a DataStruct subclass.
     if inspect.isclass(annotation) and issubclass(annotation, DataStruct):
-        if not isinstance(value, dict):
-            raise ValueError("DataStruct instances must be constructed with a dict")
-
-        return annotation(value, key)
+        return "datastruct"
 
     # (2) The annotation is a KeyDefinedValue subclass.
     elif inspect.isclass(annotation) and issubclass(annotation, KeyDefinedValue):
+        return "kdv"
 
-        if not isinstance(value, dict):
-            return ValueAndError.from_exc(exceptions.WrongTypeError(value, dict))
+    # (3) The annotation type has a validate method.
+    elif hasattr(annotation, "validate"):
+        return "validator"
+
+    # (4) The annotation type is a Qualified Generic (e.g. List[int])
+    elif typing_ext.is_qualified_generic(annotation):
+        container_type = annotation.__origin__
+        if container_type is typing.Union:
+            return "union"
+        elif container_type is LazyDict:
+            return "lazydict"
+        elif container_type is dict:
+            return "dict"
+        elif container_type in (list, tuple):
+            return "sequence"
+        return "container"
 
-        if len(value) != 1:
-            return ValueAndError.from_exc(exceptions.WrongValueError(value, "Len 1"))
+    # (5) The annotation type is a Base Generic (e.g. List). Not supported, use list instead.
+    elif typing_ext.is_base_generic(annotation):
+        return "base_generic"
 
-        k, v = dict(value).popitem()
+    # (6) If the annotation type is a type
+    elif isinstance(annotation, type):
+        return "type"
 
-        if k not in annotation.content:
-            return ValueAndError.from_exc(
-                exceptions.WrongValueError(
-                    k, "key in %s" % repr(tuple(annotation.content.keys()))
+    # (7) Other cases are not supported.
+    return "unknown"
+
+
+def _not_supported(*args):
+    raise Exception(
+        "This should have been catched as subclass creation. Please open an issue."
+    )
+
+
+def _identity(value):
+    return value
+
+
+def _make_converter(kind, annotation):
+    """Build the function converting plain values of an annotation
+    (see `from_plain_value`).
+    """
+    if kind == "datastruct":
+
+        def convert(value, key=MISSING, fields=None):
+            if not isinstance(value, annotation):
+                if not isinstance(value, dict):
+                    raise ValueError(
+                        "DataStruct instances must be constructed with a dict"
+                    )
+
+                dedupe = _dedupe.get()
+                if dedupe is None or fields is not None or not annotation.__frozen__:
+                    value = annotation(value, key, fields=fields)
+                else:
+                    value = dedupe.instance(annotation, value, key)
+
+            # Already built instances are used by reference.
+            return ValueAndError(value, value.__errors__)
+
+    elif kind == "kdv":
+
+        def convert(value, key=MISSING, fields=None):
+            if not isinstance(value, dict):
+                return ValueAndError.from_exc(exceptions.WrongTypeError(value, dict))
+
+            if len(value) != 1:
+                return ValueAndError.from_exc(
+                    exceptions.WrongValueError(value, "Len 1")
                 )
-            )
 
-        return from_plain_value(annotation.content[k], v)
+            k, v = dict(value).popitem()
 
-    # (3) The annotation type has a validate method.
-    elif hasattr(annotation, "validate"):
+            if k not in annotation.content:
+                return ValueAndError.from_exc(
+                    exceptions.WrongValueError(
+                        k, "key in %s" % repr(tuple(annotation.content.keys()))
+                    )
+                )
 
-        if annotation.validate(value):
-            return ValueAndError(value)
-        else:
+            return from_plain_value(annotation.content[k], v)
+
+    elif kind == "validator":
+
+        def convert(value, key=MISSING, fields=None):
+            if _profiler is None:
+                valid = annotation.validate(value)
+            else:
+                valid = _profiler.validate(annotation, value)
+
+            if valid:
+                return ValueAndError(value)
+            else:
+                return ValueAndError.from_exc(
+                    exceptions.WrongValueError(value, annotation)
+                )
+
+    elif kind == "union":
+        # Only plain types are allowed in Union (see DataStruct.__init_subclass__).
+        types = tuple(annotation.__args__)
+
+        def convert(value, key=MISSING, fields=None):
+            if isinstance(value, types):
+                return ValueAndError(value)
             return ValueAndError.from_exc(exceptions.WrongValueError(value, annotation))
 
-    # (4) The annotation type is a Qualified Generic (e.g. List[int])
-    elif typing_ext.is_qualified_generic(annotation):
+    elif kind == "lazydict":
+        key_annotation, value_annotation = annotation.__args__
+        key_batch = _annotation(key_annotation).batch
+        convert_key = _annotation(key_annotation).convert
+
+        def convert(value, key=MISSING, fields=None):
+            if not isinstance(value, dict):
+                return ValueAndError.from_exc(exceptions.WrongTypeError(value, dict))
+
+            # Keys are validated right away, values on first access.
+            if key_batch is not None:
+                keys = _validate_batch(key_batch, value.keys())
+            else:
+                keys = [convert_key(elk, MISSING, None) for elk in value]
+
+            content = {}
+            errors = []
+            for celk, elv in zip(keys, value.values()):
+                if celk.errors:
+                    errors.extend(exc.with_parent("in key") for exc in celk.errors)
+                else:
+                    content[celk.value] = elv
+
+            if errors:
+                errors = _summarized(errors)
+
+            return ValueAndError(
+                LazyDict(value_annotation, content, errors, fields), errors
+            )
+
+    elif kind == "dict":
+        key_batch = _annotation(annotation.__args__[0]).batch
+        convert_key = _annotation(annotation.__args__[0]).convert
+        value_batch = _annotation(annotation.__args__[1]).batch
+        convert_value = _annotation(annotation.__args__[1]).convert
+
+        # Values and errors are collected in a single pass,
+        # errors are only traversed if there are any.
 
+        def convert(value, key=MISSING, fields=None):
+            if not isinstance(value, dict):
+                return ValueAndError.from_exc(exceptions.WrongTypeError(value, dict))
+
+            if key_batch is not None:
+                keys = _validate_batch(key_batch, value.keys())
+            else:
+                keys = [convert_key(elk, MISSING, None) for elk in value]
+
+            if value_batch is not None:
+                values = _validate_batch(value_batch, value.values())
+            else:
+                values = [convert_value(elv, elk, fields) for elk, elv in value.items()]
+
+            out = {}
+            errors = []
+            for celk, celv in zip(keys, values):
+                k = celk.value
+                out[k] = celv.value
+                if celk.errors:
+                    errors.extend(exc.with_parent("in key") for exc in celk.errors)
+                if celv.errors:
+                    errors.extend(exc.with_index(k) for exc in celv.errors)
+
+            if errors:
+                errors = _summarized(errors)
+
+            return ValueAndError(out, errors)
+
+    elif kind == "sequence":
         container_type = annotation.__origin__
-        internal_annotations = annotation.__args__
+        batch = _annotation(annotation.__args__[0]).batch
+        convert_element = _annotation(annotation.__args__[0]).convert
 
-        if container_type is typing.Union:
-            for t in internal_annotations:
-                out = from_plain_value(t, value)
-                if not isinstance(out, exceptions.ValidationError):
-                    return ValueAndError(out)
+        def convert(value, key=MISSING, fields=None):
+            if not isinstance(value, container_type):
+                return ValueAndError.from_exc(
+                    exceptions.WrongTypeError(value, container_type)
+                )
+
+            if batch is not None:
+                tmp = _validate_batch(batch, value)
             else:
+                tmp = [convert_element(el, MISSING, fields) for el in value]
+
+            out = []
+            errors = []
+            for ndx, cel in enumerate(tmp):
+                out.append(cel.value)
+                if cel.errors:
+                    errors.extend(exc.with_index(ndx) for exc in cel.errors)
+
+            if container_type is tuple:
+                out = tuple(out)
+
+            if errors:
+                errors = _summarized(errors)
+
+            return ValueAndError(out, errors)
+
+    elif kind == "container":
+        container_type = annotation.__origin__
+
+        def convert(value, key=MISSING, fields=None):
+            if not isinstance(value, container_type):
                 return ValueAndError.from_exc(
-                    exceptions.WrongValueError(value, "Union of {internal_types}")
+                    exceptions.WrongTypeError(value, container_type)
                 )
+            raise TypeError(f"Unknown container type {container_type}")
 
-        if not isinstance(value, container_type):
-            return ValueAndError.from_exc(
-                exceptions.WrongTypeError(value, container_type)
-            )
+    elif kind == "type":
 
-        if container_type is dict:
+        def convert(value, key=MISSING, fields=None):
+            if isinstance(value, annotation):
+                return ValueAndError(value)
+            else:
+                return ValueAndError.from_exc(
+                    exceptions.WrongTypeError(value, annotation)
+                )
 
-            tmp = []
+    else:
+        convert = _not_supported
 
-            for ndx, (elk, elv) in enumerate(value.items()):
-                celk = from_plain_value(internal_annotations[0], elk)
-                celv = from_plain_value(internal_annotations[1], elv, elk)
+    return convert
 
-                tmp.append((ValueAndError.auto(celk), ValueAndError.auto(celv)))
 
-            return ValueAndError(dict(tmp))
+def _make_serializer(kind, annotation):
+    """Build the function converting values of an annotation
+    into plain values (see `to_plain_value`).
+    """
+    if kind == "datastruct":
 
-        elif container_type in (list, tuple):
+        def serialize(value):
+            return value.to_dict()
+
+    elif kind == "kdv":
+
+        def serialize(value):
+            for k, v in annotation.content.items():
+                if isinstance(value, v):
+                    return {k: to_plain_value(v, value)}
+            else:
+                raise TypeError("Type %s cannot be matched to %s" % (annotation, value))
+
+    elif kind in ("validator", "type"):
+        serialize = _identity
+
+    elif kind == "union":
+
+        def serialize(value):
+            raise Exception("Union not implemented yet for serialization")
 
-            tmp = []
-            for ndx, el in enumerate(value):
-                cel = from_plain_value(internal_annotations[0], el)
+    elif kind in ("dict", "lazydict"):
+        serialize_key = _annotation(annotation.__args__[0]).serialize
+        serialize_value = _annotation(annotation.__args__[1]).serialize
 
-                tmp.append(ValueAndError.auto(cel))
+        if serialize_key is _identity and serialize_value is _identity:
 
-            return ValueAndError(container_type(tmp))
+            def serialize(value):
+                return dict(value.items())
 
         else:
-            raise TypeError(f"Unknown container type {container_type}")
 
-    # (5) The annotation type is a Base Generic (e.g. List). Not supported, use list instead.
-    elif typing_ext.is_base_generic(annotation):
-        raise Exception(
-            "This should have been catched as subclass creation. "
-            "Please open an issue."
-        )
+            def serialize(value):
+                return {
+                    serialize_key(elk): serialize_value(elv)
+                    for elk, elv in value.items()
+                }
+
+    elif kind == "sequence":
+        container_type = annotation.__origin__
+        serialize_element = _annotation(annotation.__args__[0]).serialize
+
+        if serialize_element is _identity:
+
+            def serialize(value):
+                return container_type(value)
 
-    # (6) If the annotation type is a type
-    elif isinstance(annotation, type):
-        if isinstance(value, annotation):
-            return ValueAndError(value)
         else:
-            return ValueAndError.from_exc(exceptions.WrongTypeError(value, annotation))
 
-    # (7) Other cases are not supported.
+            def serialize(value):
+                return container_type([serialize_element(el) for el in value])
+
+    elif kind == "container":
+        container_type = annotation.__origin__
+
+        def serialize(value):
+            raise TypeError(f"Unknown container type {container_type}")
+
     else:
-        raise Exception(
-            "This should have been catched as subclass creation. "
-            "Please open an issue."
-        )
+        serialize = _not_supported
 
+    return serialize
 
-def to_plain_value(annotation, value):
-    """Convert a value present in a DataStruct
-    into a plain value (compatible with serialization/)
+
+def construct_value(annotation, value, key=MISSING):
+    """Convert a trusted plain value into a DataStruct compatible value.
+
+    No validation is performed: the value is assumed to be valid
+    (e.g. it was produced by `DataStruct.to_dict`).
     """
     # (0) Unpack the annotation if it's an Annotated[type, metadata] instance (PEP 593).
     if isinstance(annotation, typing_ext._AnnotatedAlias):
@@ -209,76 +807,55 @@ def to_plain_value(annotation, value):
 
     # (1) The annotation is a DataStruct subclass.
     if inspect.isclass(annotation) and issubclass(annotation, DataStruct):
-
-        return value.to_dict()
+        return annotation.construct(value, key)
 
     # (2) The annotation is a KeyDefinedValue subclass.
     elif inspect.isclass(annotation) and issubclass(annotation, KeyDefinedValue):
+        ((k, v),) = value.items()
+        return construct_value(annotation.content[k], v)
 
-        for k, v in annotation.content.items():
-            if isinstance(value, v):
-                return {k: to_plain_value(v, value)}
-        else:
-            raise TypeError("Type %s cannot be matched to %s" % (annotation, value))
-
-    # (3) The annotation type has a validate method.
-    elif hasattr(annotation, "validate"):
-
-        return value
-
-    # (4) The annotation type is a Qualified Generic (e.g. List[int])
+    # (3) The annotation type is a Qualified Generic (e.g. List[int])
     elif typing_ext.is_qualified_generic(annotation):
 
         container_type = annotation.__origin__
         internal_annotations = annotation.__args__
 
         if container_type is typing.Union:
+            return value
 
-            raise Exception("Union not implemented yet for serialization")
+        if container_type is LazyDict:
+            return LazyDict(internal_annotations[1], value, trusted=True)
 
         if container_type is dict:
-
-            tmp = []
-
-            for ndx, (elk, elv) in enumerate(value.items()):
-                celk = to_plain_value(internal_annotations[0], elk)
-                celv = to_plain_value(internal_annotations[1], elv)
-
-                tmp.append((celk, celv))
-
-            return dict(tmp)
+            return {
+                construct_value(internal_annotations[0], elk): construct_value(
+                    internal_annotations[1], elv, elk
+                )
+                for elk, elv in value.items()
+            }
 
         elif container_type in (list, tuple):
-
-            tmp = []
-            for ndx, el in enumerate(value):
-                cel = to_plain_value(internal_annotations[0], el)
-
-                tmp.append(cel)
-
-            return container_type(tmp)
+            return container_type(
+                construct_value(internal_annotations[0], el) for el in value
+            )
 
         else:
             raise TypeError(f"Unknown container type {container_type}")
 
-    # (5) The annotation type is a Base Generic (e.g. List). Not supported, use list instead.
-    elif typing_ext.is_base_generic(annotation):
-        raise Exception(
-            "This should have been catched as subclass creation. "
-            "Please open an issue."
-        )
-
-    # (6) If the annotation type is a a type
-    elif isinstance(annotation, type):
-
+    # (4) Other annotations (types and validators) take the value as is.
+    else:
         return value
 
-    # (7) Other cases are not supported.
-    else:
-        raise Exception(
-            "This should have been catched as subclass creation. "
-            "Please open an issue."
-        )
+
+def to_plain_value(annotation, value):
+    """Convert a value present in a DataStruct
+    into a plain value (compatible with serialization/)
+    """
+    try:
+        serialize = _ANNOTATIONS[id(annotation)].serialize
+    except KeyError:
+        serialize = _annotation(annotation).serialize
+    return serialize(value)
 
 
 class DataStruct:
@@ -287,54 +864,154 @@ class DataStruct:
     Parameters
     ----------
     content : Mapping
-
+    parent_key
+        key of the dict in which this object is stored (for DEFAULT_TO_KEY).
+    fields : Iterable[str] or None
+        paths of the attributes to load (see `from_dict`).
+
+    Subclasses defined with `frozen=True` (i.e. `class Config(DataStruct, frozen=True)`)
+    produce immutable and hashable instances. The hash is computed once and cached.
+    Lists within their values are converted into tuples and dicts into read-only
+    dicts (the values of a LazyDict are not converted).
+
+    Subclasses defined with `validate_assignment=True` validate the values
+    assigned to attributes, updating the errors of the instance for that attribute.
+    Only the errors of the assigned instance are updated: the errors of the
+    objects containing it (e.g. `cfg` after `cfg.servers[0].port = 1`) are
+    not. Use `replace_path` on the root object to keep all of them up to date.
+
+    Subclasses defined with `intern=("region", "status")` intern (see `sys.intern`)
+    the strings within the values of those attributes, and the names of all
+    attributes, so that instances loaded from different documents share them.
+    Use it for low-cardinality strings (e.g. enumerations, tags).
     """
 
-    def __init_subclass__(cls, **kwargs):
+    # Class attributes are not annotated to keep them out of the schema.
+
+    #: Dict[str, Any]
+    #: Annotation of each attribute, as given by get_type_hints.
+    __fields__ = {}
+
+    #: Tuple[str]
+    #: Attributes that default to the key of the containing dict.
+    __default_to_key__ = ()
+
+    #: Callable[[dict], tuple]
+    #: Get the values of all attributes (in annotation order) from __dict__.
+    __values_getter__ = staticmethod(lambda dct: ())
+
+    #: List[exceptions.ValidationError]
+    #: Errors found when filling the data structure.
+    __errors__ = ()
+
+    #: bool
+    #: True if instances are immutable and hashable.
+    __frozen__ = False
+
+    #: bool
+    #: True if values assigned to attributes are validated.
+    __validate_assignment__ = False
+
+    #: FrozenSet[str]
+    #: Attributes whose string values are interned (see `sys.intern`).
+    __intern__ = frozenset()
+
+    def __init_subclass__(
+        cls, frozen=None, validate_assignment=None, intern=None, **kwargs
+    ):
         errs = []
-        for name, annotation in get_type_hints(cls).items():
-            # (0) Unpack the annotation if it's an Annotated[type, metadata] instance (PEP 593).
-            if isinstance(annotation, typing_ext._AnnotatedAlias):
-                annotation = annotation.__origin__
 
-            if inspect.isclass(annotation) and issubclass(annotation, DataStruct):
-                continue
+        if frozen is not None:
+            if cls.__frozen__ and not frozen:
+                raise TypeError(f"Class {cls.__name__} cannot unfreeze a frozen class")
+            cls.__frozen__ = frozen
 
-            elif inspect.isclass(annotation) and issubclass(
-                annotation, KeyDefinedValue
-            ):
-                continue
+        if validate_assignment is not None:
+            cls.__validate_assignment__ = validate_assignment
 
-            elif hasattr(annotation, "validate"):
-                continue
+        if cls.__frozen__ and cls.__validate_assignment__:
+            raise TypeError(
+                f"Class {cls.__name__} cannot be frozen and validate assignments"
+            )
 
-            elif typing_ext.is_qualified_generic(annotation):
+        # Methods defined in the class body have precedence.
+        def _set_method(name, func):
+            if name not in cls.__dict__:
+                setattr(cls, name, func)
+
+        if cls.__frozen__:
+            _set_method("__setattr__", _frozen_setattr)
+            _set_method("__delattr__", _frozen_delattr)
+            _set_method("__eq__", _frozen_eq)
+            _set_method("__hash__", _frozen_hash)
+            _set_method("__copy__", _frozen_copy)
+            _set_method("__deepcopy__", _frozen_deepcopy)
+        elif cls.__validate_assignment__:
+            _set_method("__setattr__", _validating_setattr)
+        elif cls.__setattr__ is _validating_setattr:
+            _set_method("__setattr__", object.__setattr__)
+
+        cls.__fields__ = get_type_hints(cls)
+        cls.__default_to_key__ = tuple(
+            name
+            for name in cls.__fields__
+            if getattr(cls, name, None) is DEFAULT_TO_KEY
+        )
+        for name in cls.__default_to_key__:
+            if cls.__dict__.get(name) is DEFAULT_TO_KEY:
+                setattr(cls, name, _DefaultToKeyAttribute(name))
+        cls.__values_getter__ = staticmethod(_tuple_getter(tuple(cls.__fields__)))
+
+        if cls.__frozen__:
+            # Defaults are shared by all instances.
+            for name in cls.__fields__:
+                default = getattr(cls, name, None)
+                frozen_default = _freeze(default)
+                if frozen_default is not default:
+                    setattr(cls, name, frozen_default)
+
+        if intern is not None:
+            if isinstance(intern, str):
+                intern = (intern,)
+            cls.__intern__ = frozenset(intern)
+        for name in sorted(cls.__intern__):
+            if name not in cls.__fields__:
+                errs.append(f"{name} cannot be interned, it is not an attribute.")
+
+        for name, annotation in cls.__fields__.items():
+            if cls.__frozen__:
+                for klass in _iter_datastructs(annotation):
+                    if not klass.__frozen__:
+                        errs.append(
+                            f"In {name}, {klass} must be frozen to be used in a frozen class."
+                        )
 
-                container_type = annotation.__origin__
-                internal_annotations = annotation.__args__
-                valid_union_types = {int, float, bool, str, tuple, list, dict}
+            # (0) Unpack the annotation if it's an Annotated[type, metadata] instance (PEP 593).
+            if isinstance(annotation, typing_ext._AnnotatedAlias):
+                annotation = annotation.__origin__
 
-                if container_type is not typing.Union:
-                    continue
+            # Only classified: the conversion plan (see `_annotation`) is built
+            # on first use, so that importing a schema (e.g. one used through
+            # a compiled module, see datastruct.compiler) stays cheap.
+            kind = _annotation_kind(annotation)
 
-                for t in internal_annotations:
+            if kind == "union":
+                valid_union_types = {int, float, bool, str, tuple, list, dict}
+
+                for t in annotation.__args__:
                     if t not in valid_union_types:
                         raise TypeError(
                             "%s are not currently allowed in Union, only %s"
                             % (t, repr(valid_union_types))
                         )
-                continue
 
-            elif typing_ext.is_base_generic(annotation):
+            elif kind == "base_generic":
                 errs.append(
                     f"In {name}, {annotation} is an invalid annotation. "
                     f"Based generics (e.g. List) are allowed, used types (e.g. list) instead."
                 )
 
-            elif isinstance(annotation, type):
-                continue
-
-            else:
+            elif kind == "unknown":
                 errs.append(
                     f"In {name}, {annotation} is an unknown kind of annotation."
                 )
@@ -344,56 +1021,271 @@ class DataStruct:
             )
         super().__init_subclass__(**kwargs)
 
-    def __init__(self, content, parent_key=MISSING):
+    def __init__(self, content, parent_key=MISSING, fields=None):
+
+        # Attributes are stored directly in __dict__ to support frozen classes.
+        self.__dict__["__errors__"] = []
+
+        th = dict(self.__fields__)
+
+        if fields is not None:
+            if not isinstance(fields, dict):
+                fields = _projection(self.__class__, fields)
+
+            # Attributes not selected are neither converted nor reported.
+            content = {key: value for key, value in content.items() if key in fields}
+            th = {key: value for key, value in th.items() if key in fields}
+
+        dct = self.__dict__
+
+        #: List[exceptions.ValidationError]
+        #: Errors found in the values, reported after missing and unexpected keys.
+        value_errors = []
+
+        profiler = _profiler
+        if profiler is not None:
+            start = time.perf_counter()
+
+        # Rationale: Part 1
+        #   We iterate over the items provided to fill the DataStructure
+        #   and try to assign them to the corresponding attribute.
+        #
+        #   If a value is invalid, it is not used.
+
+        for key, value in content.items():
+
+            # (1) If the attribute is not specified in the schema,
+            #     we report it and move on.
+            try:
+                annotation = th.pop(key)
+            except KeyError:
+                _add_error(
+                    self.__errors__, exceptions.UnexpectedKeyError(key, self.__class__)
+                )
+                continue
+
+            # (2) We convert the value, walking the errors only if there are any.
+            subfields = None if fields is None else fields[key]
+            if profiler is None:
+                out = from_plain_value(annotation, value, fields=subfields)
+            else:
+                out = profiler.convert(
+                    self.__class__, key, annotation, value, fields=subfields
+                )
+            if out.errors:
+                value_errors.extend(exc.with_parent(key) for exc in out.errors)
+            dct[key] = out.value
+
+        # Rationale: Part 2
+        #   We then iterate over the annotations that have not been consumed by a provided items
+        #   and report an error if there is no default value.
+        for key, ann in th.items():
+            if key in self.__default_to_key__:
+                if parent_key is MISSING:
+                    raise ValueError(
+                        f"In {self.__class__}.{key}, cannot DEFAULT_TO_KEY outside a dict"
+                    )
+                elif profiler is None:
+                    out = from_plain_value(ann, parent_key)
+                else:
+                    out = profiler.convert(self.__class__, key, ann, parent_key)
+
+                if out.errors:
+                    value_errors.extend(exc.with_parent(key) for exc in out.errors)
+                dct[key] = out.value
+            elif not hasattr(self, key):
+                _add_error(
+                    self.__errors__, exceptions.MissingValueError(key, self.__class__)
+                )
+
+        if self.__intern__:
+            _intern_attributes(self.__class__, dct)
+
+        if self.__frozen__:
+            _freeze_attributes(self.__class__, dct)
+
+        if value_errors:
+            self.__errors__.extend(value_errors)
+
+        if self.__errors__:
+            self.__dict__["__errors__"] = _summarized(self.__errors__)
+
+        if profiler is not None:
+            profiler.add_instance(
+                self.__class__, time.perf_counter() - start, len(self.__errors__)
+            )
+
+    @classmethod
+    def construct(cls, content, parent_key=MISSING):
+        """Build an instance from trusted content, skipping validation.
+
+        The content is assumed to be valid (e.g. it was produced by `to_dict`):
+        no type checks are done and no errors are collected.
+
+        Parameters
+        ----------
+        content : Mapping
+        parent_key
+            key of the dict in which this object is stored (for DEFAULT_TO_KEY).
+
+        Returns
+        -------
+        DataStruct
+        """
+        self = cls.__new__(cls)
+        fields = cls.__fields__
+
+        new_content = {
+            key: construct_value(fields[key], value) for key, value in content.items()
+        }
+
+        for key in cls.__default_to_key__:
+            if key not in new_content:
+                if parent_key is MISSING:
+                    raise ValueError(
+                        f"In {cls}.{key}, cannot DEFAULT_TO_KEY outside a dict"
+                    )
+                new_content[key] = construct_value(fields[key], parent_key)
+
+        if cls.__intern__:
+            _intern_attributes(cls, new_content)
+
+        if cls.__frozen__:
+            _freeze_attributes(cls, new_content)
+
+        self.__dict__.update(new_content)
+        return self
+
+    def __reduce__(self):
+        """Pickle only the values of the attributes (in annotation order)
+        and the errors, if any.
+
+        The instance is restored without validation, and therefore
+        the class must have the same schema when unpickling.
+        """
+        dct = self.__dict__
+        try:
+            values = self.__values_getter__(dct)
+        except KeyError:
+            # Some attributes are missing (e.g. taken from class defaults).
+            values = {key: dct[key] for key in self.__fields__ if key in dct}
+
+        if self.__errors__:
+            return _unpickle, (self.__class__, values, tuple(self.__errors__))
+        return _unpickle, (self.__class__, values)
+
+    def replace(self, **changes):
+        """Return a new instance with some attributes replaced.
+
+        Only the new values are validated, and the errors are updated
+        only for the replaced attributes. Values not replaced
+        (including nested DataStructs) are shared with this instance.
+
+        Parameters
+        ----------
+        **changes
+            new (plain) values of the attributes.
+
+        Returns
+        -------
+        DataStruct
+        """
+        values = {}
+        errors = list(self.__errors__)
+
+        for key, value in changes.items():
+            values[key], new_errors = self._convert_attribute(key, value)
+            errors = [exc for exc in errors if not _is_under(exc, (key,))]
+            errors.extend(new_errors)
+
+        return self._evolve(values, errors)
+
+    def replace_path(self, path: str, value):
+        """Return a new instance with the value at a given path replaced.
+
+        Only the new value is validated, and the errors are updated
+        only for the replaced location. Each DataStruct and container
+        from the root to the replaced location is copied, but all other
+        values are shared with this instance.
+
+        Parameters
+        ----------
+        path : str
+            location of the value to replace, e.g. `a.b[2].c`.
+            Use brackets for list indices and dict keys.
+        value
+            new (plain) value.
+
+        Returns
+        -------
+        DataStruct
+        """
+        new, _, _ = self._replace_steps(_parse_path(path), value)
+        return new
+
+    def _convert_attribute(self, key, value):
+        """Convert a plain value of an attribute.
 
-        #: Errors found when filling the data structure.
-        self.__errors__: List[exceptions.ValidationError] = []
+        Returns the value and the errors found (relative to this object).
+        """
+        try:
+            annotation = self.__fields__[key]
+        except KeyError:
+            raise TypeError(
+                f"{self.__class__.__name__} has no attribute {key!r}"
+            ) from None
 
-        th = get_type_hints(self.__class__)
+        out = from_plain_value(annotation, value)
+        value = out.flatten()
+        if key in self.__intern__:
+            value = _intern(value)
 
-        #: Dict[str, Union[DataStruct, ValueAndError]]
-        new_content = {}
+        return value, tuple(exc.with_parent(key) for exc in out.get_errors())
 
-        # Rationale: Part 1
-        #   We iterate over the items provided to fill the DataStructure
-        #   and try to assign them to the corresponding attribute.
-        #
-        #   If a value is invalid, it is not used.
+    def _replace_steps(self, steps, value):
+        """Replace the value found following steps (see _parse_path).
 
-        for key, value in content.items():
+        Returns the new instance, the location of the replaced value
+        (as a path in errors) and the errors found in the new value.
+        """
+        key, steps = steps[0], steps[1:]
 
-            # (1) If the attribute is not specified in the schema,
-            #     we report it and move on.
+        if not isinstance(key, str):
+            raise TypeError(f"{self.__class__.__name__} cannot be indexed")
+
+        if steps:
             try:
-                annotation = th.pop(key)
+                annotation = self.__fields__[key]
             except KeyError:
-                self.__errors__.append(
-                    exceptions.UnexpectedKeyError(key, self.__class__)
-                )
-                continue
+                raise TypeError(
+                    f"{self.__class__.__name__} has no attribute {key!r}"
+                ) from None
+            new_value, location, new_errors = _replace_value(
+                annotation, getattr(self, key), steps, value
+            )
+            new_errors = tuple(exc.with_parent(key) for exc in new_errors)
+        else:
+            new_value, new_errors = self._convert_attribute(key, value)
+            location = ()
 
-            # (2) We build a dictionary with the content.
-            new_content[key] = from_plain_value(annotation, value)
+        location = (key,) + location
 
-        # Rationale: Part 2
-        #   We then iterate over the annotations that have not been consumed by a provided items
-        #   and report an error if there is no default value.
-        for key, ann in th.items():
-            if not hasattr(self, key):
-                self.__errors__.append(
-                    exceptions.MissingValueError(key, self.__class__)
-                )
-            elif getattr(self, key) is DEFAULT_TO_KEY:
-                if parent_key is MISSING:
-                    raise ValueError(
-                        f"In {self.__class__}.{key}, cannot DEFAULT_TO_KEY outside a dict"
-                    )
-                else:
-                    new_content[key] = from_plain_value(ann, parent_key)
+        errors = [exc for exc in self.__errors__ if not _is_under(exc, location)]
+        errors.extend(new_errors)
 
-        for key, value in new_content.items():
-            self.__errors__.extend((exc.with_parent(key) for exc in value.get_errors()))
-            setattr(self, key, value.flatten())
+        return self._evolve({key: new_value}, errors), location, new_errors
+
+    def _evolve(self, values, errors):
+        """Create a copy of this instance with new values and errors."""
+        new = self.__class__.__new__(self.__class__)
+        dct = new.__dict__
+        dct.update(self.__dict__)
+        dct.pop("__hash_value__", None)
+        if self.__frozen__:
+            _freeze_attributes(self.__class__, values)
+        dct.update(values)
+        dct["__errors__"] = errors
+        return new
 
     def flatten(self):
         return self
@@ -425,7 +1317,17 @@ class DataStruct:
 
     @classmethod
     def from_dict(
-        cls, dct, *, raise_on_error=True, err_on_unexpected=True, err_on_missing=True
+        cls,
+        dct,
+        *,
+        raise_on_error=True,
+        err_on_unexpected=True,
+        err_on_missing=True,
+        trusted=False,
+        fields=None,
+        max_errors=None,
+        summary=False,
+        dedupe=False,
     ):
         """Load the content of a dictionary into this datastructure
 
@@ -442,13 +1344,44 @@ class DataStruct:
         err_on_missing : bool
             If true, a missing value will produce an error.
             If false, only a warning is issued.
+        trusted : bool
+            If true, the content is assumed to be valid and it is not validated
+            (see `construct`).
+        fields : Iterable[str] or None
+            If given, only these attributes are loaded, e.g. `["database", "servers[*].host"]`.
+            Use `[*]` to select within all the elements of a list or dict.
+            Other attributes are left unset, and not reported as missing or unexpected:
+            accessing them gives the default value, if any, or raises AttributeError
+            (also for attributes defaulting to the key, see `DEFAULT_TO_KEY`).
+        max_errors : int or None
+            If given, stop collecting errors after this number.
+        summary : bool
+            If true, errors of the same kind found at the same path pattern
+            (e.g. `servers[*].port`) are merged, keeping the number of errors
+            in `count`, and invalid values are stored as truncated reprs.
+            Errors are merged within each DataStruct and container as it is
+            built, but each nested DataStruct keeps the summary of its own
+            errors: use `max_errors` to bound the number of errors built.
+        dedupe : bool
+            If true, the instances of frozen classes within the content
+            built from equal (valid) content are validated once and shared,
+            which saves time and memory when the content is repeated
+            (e.g. the same retry policy in many services).
 
         Returns
         -------
         DataStruct
         """
 
-        ds = cls(dct)
+        if trusted:
+            if fields is not None:
+                raise ValueError("fields cannot be used with trusted content")
+            if dedupe:
+                raise ValueError("dedupe cannot be used with trusted content")
+            return cls.construct(dct)
+
+        with _collecting_errors(max_errors, summary), _deduplicating(dedupe):
+            ds = cls(dct, fields=fields)
 
         if raise_on_error:
             errs = ds.get_errors(err_on_unexpected, err_on_missing)
@@ -468,6 +1401,11 @@ class DataStruct:
         raise_on_error=True,
         err_on_unexpected=True,
         err_on_missing=True,
+        trusted=False,
+        fields=None,
+        max_errors=None,
+        summary=False,
+        dedupe=False,
     ):
         """Load the content of a filename into this datastructure
 
@@ -486,17 +1424,35 @@ class DataStruct:
         err_on_missing : bool
             If true, a missing value will produce an error.
             If false, only a warning is issued.
+        trusted : bool
+            If true, the content is assumed to be valid and it is not validated
+            (see `construct`).
+        fields : Iterable[str] or None
+            If given, only these attributes are loaded (see `from_dict`).
+        max_errors : int or None
+            If given, stop collecting errors after this number (see `from_dict`).
+        summary : bool
+            If true, merge errors found at the same path pattern (see `from_dict`).
+        dedupe : bool
+            If true, share the frozen instances built from equal content (see `from_dict`).
 
         Returns
         -------
         DataStruct
         """
 
+        import serialize
+
         return cls.from_dict(
             serialize.load(filename, fmt),
             raise_on_error=raise_on_error,
             err_on_unexpected=err_on_unexpected,
             err_on_missing=err_on_missing,
+            trusted=trusted,
+            fields=fields,
+            max_errors=max_errors,
+            summary=summary,
+            dedupe=dedupe,
         )
 
     @classmethod
@@ -508,6 +1464,12 @@ class DataStruct:
         raise_on_error=True,
         err_on_unexpected=True,
         err_on_missing=True,
+        trusted=False,
+        fields=None,
+        max_errors=None,
+        summary=False,
+        dedupe=False,
+        max_workers=1,
     ):
         """Load the content of a multiple filenames into this datastructure
 
@@ -517,6 +1479,8 @@ class DataStruct:
         ----------
         filenames : List[str]
             Multiple filenames. The first has precedence over the last.
+        fmt : str or None
+            File format. Use None (default) to infer from the extension)
         raise_on_error : bool
             If true, an exception will be raised. If false, the exception will be recorded.
         err_on_unexpected : bool
@@ -525,18 +1489,203 @@ class DataStruct:
         err_on_missing : bool
             If true, a missing value will produce an error.
             If false, only a warning is issued.
+        trusted : bool
+            If true, the content is assumed to be valid and it is not validated
+            (see `construct`).
+        fields : Iterable[str] or None
+            If given, only these attributes are loaded (see `from_dict`).
+        max_errors : int or None
+            If given, stop collecting errors after this number (see `from_dict`).
+        summary : bool
+            If true, merge errors found at the same path pattern (see `from_dict`).
+        dedupe : bool
+            If true, share the frozen instances built from equal content (see `from_dict`).
+        max_workers : int
+            Number of threads used to load the files concurrently,
+            which is useful for slow (e.g. network) filesystems.
+            Use 1 (default) to load them sequentially.
 
         Returns
         -------
         DataStruct
         """
 
-        dct = merge(tuple(serialize.load(filename, fmt) for filename in filenames))
+        import serialize
+
+        if max_workers > 1:
+            import concurrent.futures
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                dcts = tuple(
+                    executor.map(functools.partial(serialize.load, fmt=fmt), filenames)
+                )
+        else:
+            dcts = tuple(serialize.load(filename, fmt) for filename in filenames)
+
+        dct = merge(dcts)
         return cls.from_dict(
             dct,
             raise_on_error=raise_on_error,
             err_on_unexpected=err_on_unexpected,
             err_on_missing=err_on_missing,
+            trusted=trusted,
+            fields=fields,
+            max_errors=max_errors,
+            summary=summary,
+            dedupe=dedupe,
+        )
+
+    @classmethod
+    async def from_filename_async(
+        cls,
+        filename: Union[str, pathlib.Path],
+        fmt=None,
+        *,
+        executor=None,
+        raise_on_error=True,
+        err_on_unexpected=True,
+        err_on_missing=True,
+        trusted=False,
+        fields=None,
+        max_errors=None,
+        summary=False,
+        dedupe=False,
+    ):
+        """Load the content of a filename into this datastructure
+        without blocking the event loop.
+
+        The file is read in the default executor of the loop,
+        while parsing and validation are done in `executor`.
+
+        Parameters
+        ----------
+        filename : str or pathlib.Path
+        fmt : str or None
+            File format. Use None (default) to infer from the extension)
+        executor : concurrent.futures.Executor or None
+            Executor used to parse and validate the content.
+            Use None (default) for the default executor of the loop.
+        raise_on_error : bool
+            If true, an exception will be raised. If false, the exception will be recorded.
+        err_on_unexpected : bool
+            If true, an unexpected value will produce an error.
+            If false, only a warning is issued.
+        err_on_missing : bool
+            If true, a missing value will produce an error.
+            If false, only a warning is issued.
+        trusted : bool
+            If true, the content is assumed to be valid and it is not validated
+            (see `construct`).
+        fields : Iterable[str] or None
+            If given, only these attributes are loaded (see `from_dict`).
+        max_errors : int or None
+            If given, stop collecting errors after this number (see `from_dict`).
+        summary : bool
+            If true, merge errors found at the same path pattern (see `from_dict`).
+        dedupe : bool
+            If true, share the frozen instances built from equal content (see `from_dict`).
+
+        Returns
+        -------
+        DataStruct
+        """
+
+        return await cls.from_filenames_async(
+            (filename,),
+            fmt,
+            executor=executor,
+            raise_on_error=raise_on_error,
+            err_on_unexpected=err_on_unexpected,
+            err_on_missing=err_on_missing,
+            trusted=trusted,
+            fields=fields,
+            max_errors=max_errors,
+            summary=summary,
+            dedupe=dedupe,
+        )
+
+    @classmethod
+    async def from_filenames_async(
+        cls,
+        filenames: Iterable[Union[str, pathlib.Path]],
+        fmt=None,
+        *,
+        executor=None,
+        raise_on_error=True,
+        err_on_unexpected=True,
+        err_on_missing=True,
+        trusted=False,
+        fields=None,
+        max_errors=None,
+        summary=False,
+        dedupe=False,
+    ):
+        """Load the content of a multiple filenames into this datastructure
+        without blocking the event loop.
+
+        All files are read concurrently in the default executor of the loop,
+        while parsing, merging and validation are done in `executor`.
+
+        Parameters
+        ----------
+        filenames : List[str]
+            Multiple filenames. The first has precedence over the last.
+        fmt : str or None
+            File format. Use None (default) to infer from the extension)
+        executor : concurrent.futures.Executor or None
+            Executor used to parse and validate the content.
+            Use None (default) for the default executor of the loop.
+        raise_on_error : bool
+            If true, an exception will be raised. If false, the exception will be recorded.
+        err_on_unexpected : bool
+            If true, an unexpected value will produce an error.
+            If false, only a warning is issued.
+        err_on_missing : bool
+            If true, a missing value will produce an error.
+            If false, only a warning is issued.
+        trusted : bool
+            If true, the content is assumed to be valid and it is not validated
+            (see `construct`).
+        fields : Iterable[str] or None
+            If given, only these attributes are loaded (see `from_dict`).
+        max_errors : int or None
+            If given, stop collecting errors after this number (see `from_dict`).
+        summary : bool
+            If true, merge errors found at the same path pattern (see `from_dict`).
+        dedupe : bool
+            If true, share the frozen instances built from equal content (see `from_dict`).
+
+        Returns
+        -------
+        DataStruct
+        """
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        filenames = tuple(pathlib.Path(filename) for filename in filenames)
+        fmts = tuple(_get_format(filename, fmt) for filename in filenames)
+        contents = await asyncio.gather(
+            *(loop.run_in_executor(None, filename.read_bytes) for filename in filenames)
+        )
+
+        return await loop.run_in_executor(
+            executor,
+            functools.partial(
+                _from_contents,
+                cls,
+                contents,
+                fmts,
+                raise_on_error=raise_on_error,
+                err_on_unexpected=err_on_unexpected,
+                err_on_missing=err_on_missing,
+                trusted=trusted,
+                fields=fields,
+                max_errors=max_errors,
+                summary=summary,
+                dedupe=dedupe,
+            ),
         )
 
     def to_dict(self):
@@ -546,10 +1695,8 @@ class DataStruct:
         -------
         dict
         """
-        th = get_type_hints(self.__class__)
-
         out = {}
-        for key, annotation in th.items():
+        for key, annotation in self.__fields__.items():
             out[key] = to_plain_value(annotation, getattr(self, key))
 
         return out
@@ -566,12 +1713,454 @@ class DataStruct:
             File format. Use None (default) to infer from the extension)
 
         """
+        import serialize
+
         return serialize.dump(self.to_dict(), filename_or_file, fmt=fmt)
 
 
+def _get_format(filename, fmt):
+    """File format of a filename, inferred from the extension
+    as in serialize.load if fmt is None.
+
+    This is the only place using serialize internals.
+    """
+    if fmt is not None:
+        return fmt
+
+    import serialize
+
+    ext = filename.suffix.lstrip(".")
+    try:
+        get_format_from_ext = serialize.all._get_format_from_ext
+    except AttributeError:
+        # Not available in this version of serialize: formats are named
+        # after their extension, and serialize.loads rejects unknown ones.
+        return ext.lower()
+    return get_format_from_ext(ext)
+
+
+def _from_contents(cls, contents, fmts, **kwargs):
+    """Parse and merge the contents of multiple files
+    and load them into a DataStruct class.
+    """
+    import serialize
+
+    dcts = tuple(serialize.loads(content, fmt) for content, fmt in zip(contents, fmts))
+    return cls.from_dict(merge(dcts), **kwargs)
+
+
+_PATH_FIRST_RE = re.compile(r"[^.\[\]]+")
+_PATH_STEP_RE = re.compile(r"\.([^.\[\]]+)|\[([^\[\]]+)\]")
+
+
+class _Index(str):
+    """A list index or dict key in a path."""
+
+
+def _parse_path(path):
+    """Parse a path (e.g. `a.b[2].c`) into steps.
+
+    Attributes are str and indices (or keys) are _Index.
+    """
+    match = _PATH_FIRST_RE.match(path)
+    if match is None:
+        raise ValueError(f"Invalid path {path!r}")
+
+    steps = [match.group()]
+    pos = match.end()
+    while pos < len(path):
+        match = _PATH_STEP_RE.match(path, pos)
+        if match is None:
+            raise ValueError(f"Invalid path {path!r} at position {pos}")
+        attr, index = match.groups()
+        steps.append(attr if index is None else _Index(index))
+        pos = match.end()
+
+    return steps
+
+
+def _projection(cls, paths):
+    """Build the projection tree of a DataStruct class from paths
+    (e.g. `servers[*].host`).
+
+    The tree maps each selected attribute to the projection of its value
+    or None if the whole value is selected. Containers are transparent:
+    the projection applies to all their elements.
+    """
+    tree = {}
+
+    for path in paths:
+        steps = _parse_path(path)
+        attributes = sum(not isinstance(step, _Index) for step in steps)
+
+        node = tree
+        annotation = cls
+        for step in steps:
+            if isinstance(annotation, typing_ext._AnnotatedAlias):
+                annotation = annotation.__origin__
+
+            if isinstance(step, _Index):
+                if step != "*" or not (
+                    typing_ext.is_qualified_generic(annotation)
+                    and annotation.__origin__ in (dict, list, tuple, LazyDict)
+                ):
+                    raise ValueError(f"Invalid path {path!r}: cannot select [{step}]")
+                annotation = annotation.__args__[
+                    0 if annotation.__origin__ in (list, tuple) else 1
+                ]
+                continue
+
+            if not (inspect.isclass(annotation) and issubclass(annotation, DataStruct)):
+                raise ValueError(f"Invalid path {path!r}: cannot select {step!r}")
+
+            try:
+                annotation = annotation.__fields__[step]
+            except KeyError:
+                raise ValueError(
+                    f"Invalid path {path!r}: {annotation.__name__} has no attribute {step!r}"
+                ) from None
+
+            attributes -= 1
+            if node is None:
+                # A parent is already fully selected.
+                continue
+            elif not attributes:
+                node[step] = node = None
+            else:
+                node = node.setdefault(step, {})
+
+    return tree
+
+
+def _is_under(exc, location):
+    """True if an error ocurred within the location (a path)."""
+    path = exc.path
+    if isinstance(exc, exceptions.MissingValueError):
+        path = path + (exc.key,)
+    return path[: len(location)] == location
+
+
+def _replace_value(annotation, current, steps, value):
+    """Replace the value found following steps (see _parse_path)
+    within the current value.
+
+    Returns the new value, the location of the replaced value
+    (as a path in errors) and the errors found in the new value.
+    """
+    if isinstance(current, DataStruct):
+        return current._replace_steps(steps, value)
+
+    if isinstance(annotation, typing_ext._AnnotatedAlias):
+        annotation = annotation.__origin__
+
+    key, steps = steps[0], steps[1:]
+
+    if not isinstance(key, _Index):
+        raise TypeError(f"{type(current).__name__} has no attribute {key!r}")
+
+    if isinstance(current, dict) and typing_ext.is_qualified_generic(annotation):
+        if key not in current:
+            key = _int_key(key)
+        element = current[key]
+        element_annotation = annotation.__args__[1]
+        parent_key = key
+    elif isinstance(current, (list, tuple)) and typing_ext.is_qualified_generic(
+        annotation
+    ):
+        key = _int_key(key)
+        element = current[key]
+        element_annotation = annotation.__args__[0]
+        parent_key = MISSING
+    else:
+        raise TypeError(f"{type(current).__name__} cannot be indexed")
+
+    if steps:
+        new_element, location, errors = _replace_value(
+            element_annotation, element, steps, value
+        )
+    else:
+        out = from_plain_value(element_annotation, value, parent_key)
+        new_element, location, errors = out.flatten(), (), out.get_errors()
+
+    if isinstance(current, dict):
+        new = dict(current)
+        new[key] = new_element
+    else:
+        new = list(current)
+        new[key] = new_element
+        new = current.__class__(new)
+
+    return (
+        new,
+        ("[%s]" % key,) + location,
+        tuple(exc.with_index(key) for exc in errors),
+    )
+
+
+def _int_key(key):
+    try:
+        return int(key)
+    except ValueError:
+        raise KeyError(str(key)) from None
+
+
+def _iter_datastructs(annotation):
+    """Iterate over the DataStruct classes used in an annotation
+    (e.g. within containers or KeyDefinedValues).
+    """
+    if isinstance(annotation, typing_ext._AnnotatedAlias):
+        annotation = annotation.__origin__
+
+    if inspect.isclass(annotation) and issubclass(annotation, DataStruct):
+        yield annotation
+
+    elif inspect.isclass(annotation) and issubclass(annotation, KeyDefinedValue):
+        for value in annotation.content.values():
+            yield from _iter_datastructs(value)
+
+    elif typing_ext.is_qualified_generic(annotation):
+        for arg in annotation.__args__:
+            yield from _iter_datastructs(arg)
+
+
+def _hashable(value):
+    """Convert a DataStruct attribute value into a hashable object."""
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_hashable, value))
+    elif isinstance(value, (dict, LazyDict)):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    return value
+
+
+class _DefaultToKeyAttribute:
+    """Class attribute of a DataStruct attribute defaulting to the key
+    of the containing dict.
+
+    It is DEFAULT_TO_KEY when accessed through the class, and raises
+    AttributeError for instances in which the attribute was not set
+    (e.g. it was not selected with `fields`).
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return DEFAULT_TO_KEY
+        raise AttributeError(
+            f"{owner.__name__!r} object has no attribute {self.name!r}"
+        )
+
+
+# Methods of frozen and validate_assignment DataStruct classes.
+
+
+def _frozen_setattr(self, name, value):
+    raise AttributeError(
+        f"Cannot assign to '{name}', {self.__class__.__name__} is frozen"
+    )
+
+
+def _frozen_delattr(self, name):
+    raise AttributeError(f"Cannot delete '{name}', {self.__class__.__name__} is frozen")
+
+
+def _frozen_hash(self):
+    try:
+        return self.__dict__["__hash_value__"]
+    except KeyError:
+        pass
+
+    value = hash(
+        (self.__class__,)
+        + tuple(_hashable(getattr(self, key, MISSING)) for key in self.__fields__)
+    )
+    self.__dict__["__hash_value__"] = value
+    return value
+
+
+def _frozen_eq(self, other):
+    if self is other:
+        return True
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    if hash(self) != hash(other):
+        return False
+    return all(
+        getattr(self, key, MISSING) == getattr(other, key, MISSING)
+        for key in self.__fields__
+    )
+
+
+def _validating_setattr(self, name, value):
+    if name not in self.__fields__:
+        object.__setattr__(self, name, value)
+        return
+
+    value, new_errors = self._convert_attribute(name, value)
+
+    errors = [exc for exc in self.__errors__ if not _is_under(exc, (name,))]
+    errors.extend(new_errors)
+
+    dct = self.__dict__
+    dct["__errors__"] = errors
+    dct[name] = value
+
+
+def _frozen_copy(self):
+    return self
+
+
+def _frozen_deepcopy(self, memo):
+    return self
+
+
+def _tuple_getter(keys):
+    """Return a function to get the values of keys from a dict as a tuple."""
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda dct: (dct[key],)
+    elif keys:
+        return operator.itemgetter(*keys)
+    return lambda dct: ()
+
+
+def _unpickle(cls, values, errors=()):
+    """Restore a DataStruct pickled with DataStruct.__reduce__"""
+    self = cls.__new__(cls)
+    if values.__class__ is dict:
+        self.__dict__.update(values)
+    else:
+        self.__dict__.update(zip(cls.__fields__, values))
+    if cls.__intern__:
+        _intern_attributes(cls, self.__dict__)
+    if cls.__frozen__:
+        _freeze_attributes(cls, self.__dict__)
+    if errors:
+        # Written directly, as frozen classes reject assignment.
+        self.__dict__["__errors__"] = list(errors)
+    return self
+
+
 class KeyDefinedValue:
     """KeyDefinedValues are those in which the type of the value is defined by the value
     of a string key.
     """
 
     content: dict
+
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+# Generic goes first, so that LazyDict[K, V] is a typing generic alias.
+class LazyDict(typing.Generic[K, V], collections.abc.Mapping):
+    """Mapping in which each value is converted (and validated)
+    on first access, and then cached.
+
+    Use it as annotation (e.g. `LazyDict[str, Server]`) for large dicts
+    of which only a few values are used. Keys are validated when the
+    DataStruct is created, but the errors of a value are only found
+    when it is accessed, and are raised by `__getitem__`.
+    Use `validate_all` to convert all the values.
+
+    Parameters
+    ----------
+    annotation
+        annotation of the values.
+    content : dict
+        plain values by (valid) key.
+    errors : Iterable[exceptions.ValidationError]
+        errors found in the keys.
+    fields : dict or None
+        projection applied to the values (see `DataStruct.from_dict`).
+    trusted : bool
+        If true, the values are assumed to be valid (see `DataStruct.construct`).
+    """
+
+    def __init__(self, annotation, content, errors=(), fields=None, trusted=False):
+        self._annotation = annotation
+        self._content = content
+        self._key_errors = tuple(errors)
+        self._fields = fields
+        self._trusted = trusted
+
+        #: Dict[Any, Any]
+        #: Converted values by key.
+        self._values = {}
+
+        #: Dict[Any, Tuple[exceptions.ValidationError]]
+        #: Errors found in the converted values (if any) by key.
+        self._errors = {}
+
+    def __getitem__(self, key):
+        try:
+            value = self._values[key]
+        except KeyError:
+            value = self._convert(key)
+
+        errors = self._errors.get(key)
+        if errors:
+            if len(errors) == 1:
+                raise errors[0]
+            raise exceptions.MultipleError(*errors)
+
+        return value
+
+    def __iter__(self):
+        return iter(self._content)
+
+    def __len__(self):
+        return len(self._content)
+
+    def __contains__(self, key):
+        return key in self._content
+
+    def __repr__(self):
+        return (
+            f"<LazyDict with {len(self._content)} values "
+            f"({len(self._values)} converted)>"
+        )
+
+    def _convert(self, key):
+        value = self._content[key]
+
+        if self._trusted:
+            value = construct_value(self._annotation, value, key)
+        else:
+            out = from_plain_value(self._annotation, value, key, self._fields)
+            errors = out.get_errors()
+            if errors:
+                self._errors[key] = tuple(exc.with_index(key) for exc in errors)
+            value = out.flatten()
+
+        self._values[key] = value
+        return value
+
+    def validate_all(self) -> Tuple[exceptions.ValidationError]:
+        """Convert all values not yet accessed.
+
+        Returns
+        -------
+        tuple of Exceptions
+            all the errors found (see `get_errors`).
+        """
+        for key in self._content:
+            if key not in self._values:
+                self._convert(key)
+
+        return self.get_errors()
+
+    def get_errors(self) -> Tuple[exceptions.ValidationError]:
+        """Get the errors found in the keys and in the values
+        converted so far.
+
+        Returns
+        -------
+        tuple of Exceptions
+        """
+        out = list(self._key_errors)
+        for key in self._content:
+            out.extend(self._errors.get(key, ()))
+        return tuple(out)
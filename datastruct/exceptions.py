@@ -9,10 +9,14 @@
     - WrongTypeError
     - WrongValueError
 
+    and `summarize` to merge errors found at the same path pattern.
+
     :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
     :license: BSD, see LICENSE for more details.
 """
 
+import copy
+import copyreg
 from typing import Tuple
 
 
@@ -22,6 +26,9 @@ class ValidationError(Exception):
     #: top-to-bottom path to reach location at which the error has ocurred.
     path: Tuple[str]
 
+    #: number of errors merged into this one (see `summarize`).
+    count: int = 1
+
     def __init__(self, *, path=()):
         if isinstance(path, str):
             self.path = (path,)
@@ -45,6 +52,7 @@ class ValidationError(Exception):
             (f"expected={self.expected}" if hasattr(self, "expected") else ""),
             (f"klass={self.klass}" if hasattr(self, "klass") else ""),
             (f"path={self.path}" if self.path else ""),
+            (f"count={self.count}" if self.count != 1 else ""),
         )
 
         return (
@@ -55,6 +63,11 @@ class ValidationError(Exception):
 
     __str__ = __repr__
 
+    def __reduce__(self):
+        # Exceptions are pickled using the arguments given to the constructor,
+        # which fails for the keyword only arguments used in with_parent.
+        return copyreg.__newobj__, (self.__class__,), self.__dict__
+
     def with_parent(self, parent: str):
         """Return a new object of the same class prepending a new parent.
 
@@ -79,7 +92,10 @@ class ValidationError(Exception):
         if hasattr(self, "key"):
             kw["key"] = self.key
 
-        return self.__class__(**kw)
+        new = self.__class__(**kw)
+        if self.count != 1:
+            new.count = self.count
+        return new
 
     def with_index(self, index):
         """Return a new object of the same class prepending a new parent from index
@@ -96,6 +112,42 @@ class ValidationError(Exception):
         return self.with_parent("[%s]" % index)
 
 
+def summarize(errors):
+    """Merge errors of the same kind found at the same path pattern,
+    in which all indices and keys are replaced by `[*]`
+    (e.g. `servers[*].port`).
+
+    Parameters
+    ----------
+    errors : Iterable[ValidationError]
+
+    Returns
+    -------
+    list of ValidationError
+        the first error of each kind and pattern, with the number
+        of merged errors in `count`.
+    """
+    out = {}
+    for exc in errors:
+        path = tuple("[*]" if part.startswith("[") else part for part in exc.path)
+        kind = (
+            exc.__class__,
+            path,
+            getattr(exc, "key", None),
+            getattr(exc, "expected", None),
+            getattr(exc, "klass", None),
+        )
+        try:
+            merged = out[kind]
+        except KeyError:
+            out[kind] = merged = copy.copy(exc)
+            merged.path = path
+        else:
+            merged.count += exc.count
+
+    return list(out.values())
+
+
 class MissingValueError(ValidationError):
     """A value required by the schema was not provided."""
 
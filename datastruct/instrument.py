@@ -0,0 +1,218 @@
+"""
+    datastruct.instrument
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Statistics of the time spent validating and converting content,
+    to find which classes, fields and validators are slow.
+
+    Use it as a context manager::
+
+        >>> with instrument.profile() as profiler:
+        ...     cfg = Config.from_filename("settings.yaml")
+        >>> print(profiler.report())
+
+    or enable it globally with `enable` (and `disable`).
+
+    The following statistics are collected:
+
+    - classes: instances built, total time and errors found.
+    - fields (as `Class.attribute`): values converted, total time
+      (including nested DataStructs) and errors found.
+    - validators: values validated, total time and invalid values.
+
+    When disabled, the only overhead is checking a module variable.
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import contextlib
+import time
+
+from . import ds
+
+
+class Stats:
+    """Number of calls, total time (in seconds) and number of errors."""
+
+    __slots__ = ("calls", "time", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.errors = 0
+
+    def add(self, elapsed, errors, calls=1):
+        self.calls += calls
+        self.time += elapsed
+        self.errors += errors
+
+    def as_dict(self):
+        return dict(calls=self.calls, time=self.time, errors=self.errors)
+
+
+class Profiler:
+    """Collect statistics while converting and validating content."""
+
+    def __init__(self):
+        #: Dict[type, Stats]
+        self.classes = {}
+
+        #: Dict[Tuple[type, str], Stats]
+        self.fields = {}
+
+        #: Dict[type, Stats]
+        self.validators = {}
+
+    def _stats(self, dct, key):
+        try:
+            return dct[key]
+        except KeyError:
+            dct[key] = stats = Stats()
+            return stats
+
+    def add_instance(self, klass, elapsed, errors):
+        self._stats(self.classes, klass).add(elapsed, errors)
+
+    def convert(
+        self, klass, key, annotation, value, parent_key=ds.MISSING, fields=None
+    ):
+        """Convert the value of an attribute (see `from_plain_value`)."""
+        start = time.perf_counter()
+        out = ds.from_plain_value(annotation, value, parent_key, fields)
+        elapsed = time.perf_counter() - start
+        self._stats(self.fields, (klass, key)).add(elapsed, len(out.errors))
+        return out
+
+    def validate(self, validator, value):
+        start = time.perf_counter()
+        valid = validator.validate(value)
+        elapsed = time.perf_counter() - start
+        self._stats(self.validators, validator).add(elapsed, 0 if valid else 1)
+        return valid
+
+    def validate_many(self, validator, values):
+        start = time.perf_counter()
+        invalid = validator.validate_many(values)
+        elapsed = time.perf_counter() - start
+        self._stats(self.validators, validator).add(elapsed, len(invalid), len(values))
+        return invalid
+
+    def clear(self):
+        """Discard all statistics."""
+        self.classes.clear()
+        self.fields.clear()
+        self.validators.clear()
+
+    def as_dict(self):
+        """Return the statistics.
+
+        Returns
+        -------
+        dict
+            classes, fields and validators, each mapping names
+            to dict(calls=..., time=..., errors=...).
+        """
+        return dict(
+            classes={
+                _name(klass): stats.as_dict() for klass, stats in self.classes.items()
+            },
+            fields={
+                f"{_name(klass)}.{key}": stats.as_dict()
+                for (klass, key), stats in self.fields.items()
+            },
+            validators={
+                _name(validator): stats.as_dict()
+                for validator, stats in self.validators.items()
+            },
+        )
+
+    def report(self, limit=None, sort="time"):
+        """Return a text report, with sections sorted by decreasing time.
+
+        Parameters
+        ----------
+        limit : int or None
+            maximum number of rows in each section.
+        sort : str
+            "time", "calls" or "errors".
+        """
+        lines = []
+        for section, rows in self.as_dict().items():
+            rows = sorted(rows.items(), key=lambda item: item[1][sort], reverse=True)
+            if limit is not None:
+                rows = rows[:limit]
+            if not rows:
+                continue
+
+            width = max(len(section), *(len(name) for name, _ in rows))
+            lines.append(
+                f"{section.capitalize():<{width}}  {'calls':>10}  "
+                f"{'total (ms)':>12}  {'per call (us)':>14}  {'errors':>8}"
+            )
+            for name, stats in rows:
+                calls = stats["calls"]
+                lines.append(
+                    f"{name:<{width}}  {calls:>10}  {stats['time'] * 1e3:>12.3f}  "
+                    f"{stats['time'] / calls * 1e6 if calls else 0:>14.3f}  "
+                    f"{stats['errors']:>8}"
+                )
+            lines.append("")
+
+        return "\n".join(lines)
+
+
+def _name(obj):
+    return getattr(obj, "__qualname__", None) or repr(obj)
+
+
+def enable(profiler=None):
+    """Start collecting statistics.
+
+    Parameters
+    ----------
+    profiler : Profiler or None
+        profiler in which statistics are collected (default: a new one).
+
+    Returns
+    -------
+    Profiler
+    """
+    ds._profiler = profiler = profiler or Profiler()
+    return profiler
+
+
+def disable():
+    """Stop collecting statistics.
+
+    Returns
+    -------
+    Profiler or None
+        the profiler that was collecting the statistics (if any).
+    """
+    profiler, ds._profiler = ds._profiler, None
+    return profiler
+
+
+def is_enabled():
+    return ds._profiler is not None
+
+
+@contextlib.contextmanager
+def profile(profiler=None):
+    """Collect statistics within a with block.
+
+    Parameters
+    ----------
+    profiler : Profiler or None
+        profiler in which statistics are collected (default: a new one).
+
+    Yields
+    ------
+    Profiler
+    """
+    previous = ds._profiler
+    try:
+        yield enable(profiler)
+    finally:
+        ds._profiler = previous
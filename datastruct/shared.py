@@ -0,0 +1,293 @@
+"""
+    datastruct.shared
+    ~~~~~~~~~~~~~~~~~
+
+    Publication of read-only DataStruct instances to other processes
+    using shared memory (requires Python 3.8+).
+
+    The publisher serializes the instance once::
+
+        >>> shm = publish(cfg)
+
+    and each worker attaches to the block by name::
+
+        >>> cfg = attach(shm.name, Config)
+
+    The attached object is an instance of (a read-only subclass of) the
+    published class. Each attribute is decoded from the shared memory
+    block on first access.
+
+    Decoded values are read-only too: DataStruct instances are decoded as
+    read-only views, lists as tuples and dicts as read-only dicts.
+    Pickling a view (e.g. to send it to another process) gives an instance
+    of the published class, in which nested DataStructs are instances of
+    their classes too, but containers are still read-only.
+
+    The block layout is:
+
+    - header: magic, number of fields and size of the class reference.
+    - the class reference (pickled).
+    - a table with the (offset, size) of each field in annotation order,
+      followed by the one of the errors. A size of 0 means that the
+      attribute was not set.
+    - the values (pickled).
+
+    :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import pickle
+import struct
+from multiprocessing import shared_memory
+
+from .ds import DataStruct, LazyDict, _FrozenDict, _unpickle
+
+_MAGIC = b"DSSHM001"
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<QQ")
+
+
+def publish(obj: DataStruct, name=None) -> shared_memory.SharedMemory:
+    """Serialize a DataStruct into a new shared memory block.
+
+    Parameters
+    ----------
+    obj : DataStruct
+    name : str or None
+        name of the shared memory block (default: a random name).
+
+    Returns
+    -------
+    SharedMemory
+        The caller owns the block, and must call `close` and `unlink`
+        when it is no longer needed.
+    """
+    cls = obj.__class__
+    dct = obj.__dict__
+
+    klass = pickle.dumps(cls, pickle.HIGHEST_PROTOCOL)
+    blobs = [
+        pickle.dumps(dct[key], pickle.HIGHEST_PROTOCOL) if key in dct else b""
+        for key in cls.__fields__
+    ]
+    errors = tuple(obj.__errors__)
+    blobs.append(pickle.dumps(errors, pickle.HIGHEST_PROTOCOL) if errors else b"")
+
+    offset = _HEADER.size + len(klass) + _ENTRY.size * len(blobs)
+    table = []
+    for blob in blobs:
+        table.append(_ENTRY.pack(offset, len(blob)))
+        offset += len(blob)
+
+    data = b"".join(
+        [_HEADER.pack(_MAGIC, len(blobs) - 1, len(klass)), klass] + table + blobs
+    )
+
+    shm = shared_memory.SharedMemory(name, create=True, size=len(data))
+    shm.buf[: len(data)] = data
+    return shm
+
+
+def attach(name: str, cls=None) -> DataStruct:
+    """Attach to a shared memory block created by `publish`.
+
+    Parameters
+    ----------
+    name : str
+        name of the shared memory block.
+    cls : type or None
+        if given, check that the published object is an instance of it.
+
+    Returns
+    -------
+    DataStruct
+        a read-only, lazily decoded, view of the published object.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Python < 3.13
+        shm = shared_memory.SharedMemory(name)
+
+    magic, count, size = _HEADER.unpack_from(shm.buf)
+    if magic != _MAGIC:
+        shm.close()
+        raise ValueError(f"{name} is not a shared memory block created by publish")
+
+    with shm.buf[_HEADER.size : _HEADER.size + size] as buf:
+        klass = pickle.loads(buf)
+
+    if cls is not None and not issubclass(klass, cls):
+        shm.close()
+        raise TypeError(f"{name} contains a {klass}, not a {cls}")
+
+    fields = tuple(klass.__fields__)
+    if len(fields) != count:
+        shm.close()
+        raise ValueError(f"The schema of {klass} does not match the published one")
+
+    view = object.__new__(_view_class(klass))
+    view.__dict__["__shared__"] = _Block(shm, _HEADER.size + size, count + 1)
+    return view
+
+
+class _Block:
+    """Access to the values stored in a shared memory block."""
+
+    def __init__(self, shm, table_offset, count):
+        self.shm = shm
+        self.table = [
+            _ENTRY.unpack_from(shm.buf, table_offset + ndx * _ENTRY.size)
+            for ndx in range(count)
+        ]
+
+    def load(self, ndx):
+        """Decode the value at position ndx of the table.
+
+        Raises LookupError if the value was not set.
+        """
+        offset, size = self.table[ndx]
+        if not size:
+            raise LookupError(ndx)
+        with self.shm.buf[offset : offset + size] as buf:
+            return pickle.loads(buf)
+
+
+class _LazyAttribute:
+    """Non-data descriptor that decodes a value from the shared memory block
+    and caches it in the instance.
+    """
+
+    def __init__(self, name, ndx):
+        self.name = name
+        self.ndx = ndx
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return getattr(owner.__base__, self.name)
+
+        try:
+            value = instance.__dict__["__shared__"].load(self.ndx)
+        except LookupError:
+            # Not set when published (or a nested view, which has no block
+            # as all its values are in __dict__): use the class default (if any).
+            return getattr(instance.__class__.__base__, self.name)
+
+        value = _read_only(value, {})
+        instance.__dict__[self.name] = value
+        return value
+
+
+class _LazyErrors(_LazyAttribute):
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return ()
+
+        try:
+            value = list(instance.__dict__["__shared__"].load(self.ndx))
+        except LookupError:
+            value = []
+
+        instance.__dict__[self.name] = value
+        return value
+
+
+def _setattr(self, name, value):
+    raise AttributeError(f"{self.__class__.__name__} attached objects are read-only")
+
+
+def _delattr(self, name):
+    raise AttributeError(f"{self.__class__.__name__} attached objects are read-only")
+
+
+def _reduce(self):
+    # Pickle as an instance of the published class.
+    values = {key: getattr(self, key) for key in self.__fields__ if hasattr(self, key)}
+    return _unpickle, (self.__class__.__base__, values, tuple(self.__errors__))
+
+
+def _read_only(value, memo):
+    """Read-only version of a decoded value.
+
+    DataStruct instances are converted into views, lists into tuples
+    and dicts into read-only dicts. memo (id -> converted value) keeps
+    objects shared within the value (e.g. by dedupe) shared.
+    """
+    klass = value.__class__
+    if klass is str or klass is int or klass is float or klass is bool:
+        return value
+
+    try:
+        return memo[id(value)]
+    except KeyError:
+        pass
+
+    if isinstance(value, DataStruct):
+        out = object.__new__(_view_class(klass))
+        dct = out.__dict__
+        dct.update(value.__dict__)
+        dct.pop("__hash_value__", None)
+        for key in klass.__fields__:
+            if key in dct:
+                dct[key] = _read_only(dct[key], memo)
+        dct["__errors__"] = list(value.__errors__)
+    elif isinstance(value, (list, tuple)):
+        out = tuple(_read_only(el, memo) for el in value)
+    elif isinstance(value, dict):
+        out = _FrozenDict((key, _read_only(el, memo)) for key, el in value.items())
+    elif isinstance(value, LazyDict):
+        out = _LazyDictView.__new__(_LazyDictView)
+        out.__dict__.update(value.__dict__)
+        out._values = {key: _read_only(el, memo) for key, el in value._values.items()}
+    else:
+        return value
+
+    memo[id(value)] = out
+    return out
+
+
+class _LazyDictView(LazyDict):
+    """LazyDict converting each value into a read-only one on first access."""
+
+    def _convert(self, key):
+        value = self._values[key] = _read_only(super()._convert(key), {})
+        return value
+
+    def __reduce__(self):
+        # Pickle as a LazyDict.
+        return _unpickle_lazy_dict, (self.__dict__,)
+
+
+def _unpickle_lazy_dict(state):
+    out = LazyDict.__new__(LazyDict)
+    out.__dict__.update(state)
+    return out
+
+
+#: DataStruct class -> view class
+_VIEW_CLASSES = {}
+
+
+def _view_class(cls):
+    """Create (or get from the cache) a read-only subclass of cls
+    with lazily decoded attributes.
+    """
+    try:
+        return _VIEW_CLASSES[cls]
+    except KeyError:
+        pass
+
+    namespace = {
+        name: _LazyAttribute(name, ndx) for ndx, name in enumerate(cls.__fields__)
+    }
+    namespace.update(
+        __errors__=_LazyErrors("__errors__", len(cls.__fields__)),
+        __setattr__=_setattr,
+        __delattr__=_delattr,
+        __reduce__=_reduce,
+        __module__=cls.__module__,
+        __qualname__=cls.__qualname__,
+    )
+
+    _VIEW_CLASSES[cls] = view_class = type(cls.__name__, (cls,), namespace)
+    return view_class
@@ -0,0 +1,96 @@
+from typing import List
+
+import pytest
+
+from datastruct import INVALID as INVALID_VALUE
+from datastruct import DataStruct, exceptions
+
+
+class Server(DataStruct, validate_assignment=True):
+    host: str
+    port: int = 80
+
+
+class Config(DataStruct, validate_assignment=True):
+    name: str
+    servers: List[Server]
+
+
+class NotValidated(Server, validate_assignment=False):
+    pass
+
+
+def test_valid_assignment():
+    o = Config(dict(name="config", servers=[dict(host="a")]))
+    o.name = "other"
+    assert o.name == "other"
+
+    o.servers = [dict(host="b", port=1)]
+    assert isinstance(o.servers[0], Server)
+    assert o.servers[0].port == 1
+    assert not o.get_errors()
+
+    o.servers[0].port = 2
+    assert o.servers[0].port == 2
+
+    # Attributes not in the schema are not validated
+    o.extra = 1
+    assert o.extra == 1
+
+
+def test_nested_assignment():
+    o = Config(dict(name="config", servers=[dict(host="a")]))
+    o.servers[0].port = "abc"
+    error = exceptions.WrongTypeError("abc", int).with_parent("port")
+    assert o.servers[0].get_errors() == (error,)
+
+    # Only the errors of the assigned instance are updated.
+    assert not o.get_errors()
+
+    o2 = o.replace_path("servers[0].port", "abc")
+    assert o2.get_errors() == (error.with_parent("[0]").with_parent("servers"),)
+
+    o3 = o2.replace_path("servers[0].port", 1)
+    assert not o3.get_errors()
+    assert not o3.servers[0].get_errors()
+
+
+def test_invalid_assignment():
+    o = Server(dict(host="a", port="1", extra=1))
+    assert len(o.get_errors()) == 2
+
+    o.port = "abc"
+    assert o.port is INVALID_VALUE
+    assert o.get_errors() == (
+        exceptions.UnexpectedKeyError("extra", Server),
+        exceptions.WrongTypeError("abc", int).with_parent("port"),
+    )
+
+    o.port = 8080
+    assert o.port == 8080
+    assert o.get_errors() == (exceptions.UnexpectedKeyError("extra", Server),)
+
+    o = Server(dict(port=1))
+    assert o.get_errors() == (exceptions.MissingValueError("host", Server),)
+    o.host = "a"
+    assert not o.get_errors()
+
+
+def test_construct():
+    o = Server.construct(dict(host="a"))
+    o.port = "abc"
+    assert len(o.get_errors()) == 1
+
+
+def test_disabled():
+    o = NotValidated(dict(host="a"))
+    o.port = "abc"
+    assert o.port == "abc"
+    assert not o.get_errors()
+
+
+def test_frozen():
+    with pytest.raises(TypeError):
+
+        class Both(DataStruct, frozen=True, validate_assignment=True):
+            a: int
@@ -0,0 +1,96 @@
+import asyncio
+import concurrent.futures
+import json
+
+import pytest
+
+from datastruct import DataStruct, exceptions
+
+
+class Example(DataStruct):
+    a: int
+    b: str = "h"
+
+
+def _write(path, content):
+    path.write_text(json.dumps(content))
+    return path
+
+
+def test_from_filename_async(tmp_path):
+    filename = _write(tmp_path / "example.json", dict(a=1))
+
+    o = asyncio.run(Example.from_filename_async(filename))
+    assert o.a == 1
+    assert o.b == "h"
+
+    o = asyncio.run(Example.from_filename_async(str(filename), "json"))
+    assert o.a == 1
+
+
+def test_from_filename_async_errors(tmp_path):
+    filename = _write(tmp_path / "example.json", dict(a="1", c=2))
+
+    with pytest.raises(exceptions.MultipleError) as excinfo:
+        asyncio.run(Example.from_filename_async(filename))
+
+    sync_errs = Example.from_filename(filename, raise_on_error=False).get_errors()
+    assert excinfo.value.exceptions == sync_errs
+
+    o = asyncio.run(Example.from_filename_async(filename, raise_on_error=False))
+    assert o.get_errors() == sync_errs
+
+    with pytest.raises(exceptions.WrongTypeError):
+        asyncio.run(Example.from_filename_async(filename, err_on_unexpected=False))
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(Example.from_filename_async(tmp_path / "missing.json"))
+
+
+def test_from_filename_async_extension(tmp_path):
+    filename = _write(tmp_path / "example.JSON", dict(a=1))
+    o = asyncio.run(Example.from_filename_async(filename))
+    assert o.to_dict() == Example.from_filename(filename).to_dict()
+
+    filename = _write(tmp_path / "example.unknown", dict(a=1))
+    with pytest.raises(ValueError) as sync_excinfo:
+        Example.from_filename(filename)
+
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(Example.from_filename_async(filename))
+    assert str(excinfo.value) == str(sync_excinfo.value)
+
+
+def test_from_filenames_async(tmp_path):
+    filenames = [
+        _write(tmp_path / "first.json", dict(a=1)),
+        _write(tmp_path / "second.json", dict(a=2, b="s")),
+    ]
+
+    o = asyncio.run(Example.from_filenames_async(filenames))
+    assert o.a == 1
+    assert o.b == "s"
+    assert o.to_dict() == Example.from_filenames(filenames).to_dict()
+
+
+@pytest.mark.parametrize(
+    "executor_class",
+    [concurrent.futures.ThreadPoolExecutor, concurrent.futures.ProcessPoolExecutor],
+)
+def test_executor(tmp_path, executor_class):
+    filenames = [
+        _write(tmp_path / "first.json", dict(a=1)),
+        _write(tmp_path / "second.json", dict(b="s")),
+    ]
+
+    async def load(executor):
+        return await asyncio.gather(
+            Example.from_filename_async(filenames[0], executor=executor),
+            Example.from_filenames_async(filenames, executor=executor),
+        )
+
+    with executor_class(2) as executor:
+        o1, o2 = asyncio.run(load(executor))
+
+    assert o1.to_dict() == dict(a=1, b="h")
+    assert o2.to_dict() == dict(a=1, b="s")
@@ -0,0 +1,89 @@
+import importlib
+import tracemalloc
+
+import pytest
+
+from datastruct import benchmarks, validators
+
+
+def test_run_save_compare(tmp_path):
+    results = benchmarks.run(["merge.layers", "pickle.size*"], repeat=1)
+    assert set(results) == {
+        "merge.layers",
+        "pickle.size[compact]",
+        "pickle.size[default]",
+    }
+    assert results["merge.layers"]["unit"] == "s"
+    assert results["merge.layers"]["value"] > 0
+
+    filename = tmp_path / "results.json"
+    benchmarks.save(results, filename)
+    assert benchmarks.load(filename) == results
+
+    out = benchmarks.compare(results, results)
+    assert out["merge.layers"]["ratio"] == 1
+    assert out["pickle.size[compact]"]["unit"] == "B"
+
+
+def test_registered():
+    benchmarks.load_all()
+    for name in (
+        "construct.flat",
+        "construct.nested",
+        "construct.list[int]",
+        "construct.dict[str,DataStruct]",
+        "construct.kdv",
+        "serialize.to_dict",
+        "serialize.from_filename[json]",
+        "merge.layers",
+        "errors.construct",
+    ):
+        assert name in benchmarks.BENCHMARKS
+
+
+def test_validators_backend_unchanged():
+    pytest.importorskip("validators")
+    from datastruct.benchmarks import bench_validators
+
+    validators.set_backend("validators")
+    try:
+        importlib.reload(bench_validators)
+        assert validators._backend == "validators"
+        assert validators.Email.func is not validators.is_email
+    finally:
+        validators.set_backend("datastruct")
+
+    importlib.reload(bench_validators)
+    assert validators._backend == "datastruct"
+    assert validators.Email.func is validators.is_email
+
+
+def test_trace_memory():
+    result, out = benchmarks.trace_memory(lambda: [bytearray(1000) for _ in range(10)])
+    assert len(result) == 10
+    assert out["size"] >= 10000
+    assert out["peak"] >= out["size"]
+    assert out["blocks"] >= 10
+
+
+@pytest.mark.parametrize("tracing", [False, True])
+def test_trace_memory_without_reset_peak(monkeypatch, tracing):
+    # Python < 3.9
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    if tracing:
+        tracemalloc.start()
+    try:
+        _, out = benchmarks.trace_memory(lambda: [bytearray(1000) for _ in range(10)])
+        assert tracemalloc.is_tracing() is tracing
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    assert out["size"] >= 10000
+    assert out["peak"] >= out["size"]
+
+
+def test_memory_metrics():
+    benchmarks.load_all()
+    assert benchmarks.METRICS["memory.instance[Server]"][1] == "B"
+    results = benchmarks.run(["memory.instance[[]Server[]]"])
+    assert results["memory.instance[Server]"]["value"] > 0
@@ -0,0 +1,178 @@
+import io
+import json
+from typing import List
+
+import pytest
+
+from datastruct import DataStruct, cli, validators
+
+
+class Server(DataStruct):
+    host: validators.Domain
+    port: int
+
+
+class Config(DataStruct):
+    name: str
+    servers: List[Server]
+
+
+CONTENT = dict(name="config", servers=[dict(host="example.com", port=1)])
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    filename = tmp_path / "config.json"
+    filename.write_text(json.dumps(CONTENT))
+    return filename
+
+
+def test_import_class():
+    assert cli.import_class("datastruct.testsuite.test_cli:Config") is Config
+
+    for spec in (
+        "datastruct.testsuite.test_cli",
+        "datastruct.testsuite.test_cli:CONTENT",
+    ):
+        with pytest.raises(cli.ClassSpecError):
+            cli.import_class(spec)
+
+    with pytest.raises(cli.ClassSpecError):
+        cli.import_class("datastruct.testsuite.test_cli:Unknown")
+
+    with pytest.raises(cli.ClassSpecError):
+        cli.import_class("datastruct.testsuite.unknown_module:Config")
+
+
+def test_profile(config_file, tmp_path):
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps(dict(name="other")))
+
+    args = cli.build_parser().parse_args(
+        [
+            "profile",
+            "datastruct.testsuite.test_cli:Config",
+            str(config_file),
+            str(other),
+        ]
+    )
+    out = io.StringIO()
+    assert cli.profile(args, out) == 0
+
+    report = out.getvalue()
+    for text in (
+        f"parse {config_file}",
+        "merge",
+        "validation",
+        "to_dict",
+        "Memory",
+        "Errors: 0",
+        "Config.servers",
+        "Server.host",
+        "Domain",
+    ):
+        assert text in report
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        dict(name="config"),
+        dict(name="config", servers=dict(a=1)),
+        dict(name="config", servers=[dict(host="example.com")]),
+    ],
+)
+def test_profile_invalid(tmp_path, content):
+    filename = tmp_path / "invalid.json"
+    filename.write_text(json.dumps(content))
+
+    args = cli.build_parser().parse_args(
+        ["profile", "datastruct.testsuite.test_cli:Config", str(filename)]
+    )
+    out = io.StringIO()
+    assert cli.profile(args, out) == 0
+
+    report = out.getvalue()
+    assert "to_dict" in report
+    assert "skipped" in report
+    assert "Memory" in report
+    assert "Errors: 1" in report
+
+
+def test_main_errors(config_file, capsys, monkeypatch):
+    with pytest.raises(SystemExit):
+        cli.main(["profile", "datastruct.testsuite.test_cli:Unknown", str(config_file)])
+    assert "Unknown" in capsys.readouterr().err
+
+    # Other errors are not reported as usage errors.
+    def broken(args, out=None):
+        raise ValueError("internal")
+
+    monkeypatch.setattr(cli, "profile", broken)
+    with pytest.raises(ValueError, match="internal"):
+        cli.main(["profile", "datastruct.testsuite.test_cli:Config", str(config_file)])
+
+
+def test_format_path():
+    assert cli.format_path(()) == ""
+    assert cli.format_path(("servers", "[0]", "port")) == "servers[0].port"
+    assert cli.format_path(("[a]", "in key")) == "[a].in key"
+
+
+@pytest.fixture
+def files(tmp_path):
+    filenames = []
+    for ndx in range(6):
+        content = dict(CONTENT, name=f"config{ndx}")
+        if ndx % 3 == 1:
+            content["servers"] = [dict(host="bad host", port="x")]
+        filename = tmp_path / f"config{ndx}.json"
+        filename.write_text(json.dumps(content))
+        filenames.append(str(filename))
+
+    filename = tmp_path / "broken.json"
+    filename.write_text("{")
+    filenames.append(str(filename))
+
+    return filenames
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_json(files, jobs, capsys):
+    code = cli.main(
+        ["validate", "datastruct.testsuite.test_cli:Config", "--format", "json"]
+        + ["--jobs", str(jobs)]
+        + files
+    )
+    assert code == 1
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["valid"] == 4
+    assert report["invalid"] == 3
+    assert [item["filename"] for item in report["files"]] == files
+
+    assert report["files"][0] == dict(filename=files[0], valid=True, errors=[])
+    assert report["files"][1]["errors"] == [
+        dict(
+            type="WrongValueError",
+            path="servers[0].host",
+            value="'bad host'",
+            expected="Domain",
+        ),
+        dict(
+            type="WrongTypeError", path="servers[0].port", value="'x'", expected="int"
+        ),
+    ]
+    assert report["files"][-1]["errors"][0]["type"] == "JSONDecodeError"
+
+
+def test_validate_text(files, capsys):
+    assert (
+        cli.main(["validate", "datastruct.testsuite.test_cli:Config"] + files[:1]) == 0
+    )
+    assert capsys.readouterr().out == "1 files, 0 invalid\n"
+
+    assert cli.main(["validate", "datastruct.testsuite.test_cli:Config"] + files) == 1
+    out = capsys.readouterr().out
+    assert f"{files[1]}:servers[0].port: WrongTypeError(value='x', expected=int)" in out
+    assert out.endswith("7 files, 3 invalid\n")
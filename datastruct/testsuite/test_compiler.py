@@ -0,0 +1,283 @@
+import importlib.util
+import io
+from typing import Dict, List, Tuple, Union
+
+import pytest
+
+from datastruct import (
+    DEFAULT_TO_KEY,
+    INVALID,
+    DataStruct,
+    KeyDefinedValue,
+    LazyDict,
+    cli,
+    compiler,
+    ds,
+    instrument,
+    validators,
+)
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+
+class Port(DataStruct):
+    name: str = DEFAULT_TO_KEY
+    number: int
+
+
+Tag = validators.value_in("a", "b")
+
+
+class Server(DataStruct):
+    host: validators.Domain
+    ports: Dict[str, Port]
+    tags: List[Tag] = []
+
+
+class Value(KeyDefinedValue):
+    content = dict(i=int, s=str)
+
+
+class Config(DataStruct):
+    name: Annotated[str, "the name"]
+    servers: List[Server]
+    pair: Tuple[int, ...] = ()
+    number: Union[int, str] = 0
+    value: Value = 1
+    lazy: LazyDict[str, int] = {}
+    nested: Dict[str, List[int]] = {}
+
+
+class Point(DataStruct, frozen=True):
+    x: int
+    y: int
+
+
+class Shape(DataStruct):
+    points: List[Point]
+
+
+class Polygon(DataStruct, frozen=True):
+    points: List[Point]
+    labels: Dict[str, List[str]] = {}
+
+
+CONTENTS = [
+    dict(name="config", servers=[]),
+    dict(
+        name="config",
+        servers=[
+            dict(
+                host="example.com",
+                ports=dict(http=dict(number=80), https=dict(name="s", number=443)),
+                tags=["a"],
+            )
+        ],
+        pair=(1, 2),
+        number="x",
+        value=dict(s="a"),
+        lazy=dict(a=1),
+        nested=dict(a=[1, 2]),
+    ),
+    dict(
+        name=1,
+        servers=[
+            dict(host="not a domain", ports={1: dict(number="x")}, tags=["c", "a"]),
+            dict(host="example.com", ports=[]),
+            dict(other=1),
+        ],
+        pair=[1],
+        number=1.0,
+        value=dict(f=1.0),
+        lazy={1: 1},
+        nested=dict(a=[1, "b"], b=2),
+        other=True,
+    ),
+]
+
+
+def plain(value):
+    """Values of DataStructs (and their errors), recursively."""
+    if isinstance(value, DataStruct):
+        return type(value), {key: plain(v) for key, v in value.__dict__.items()}
+    elif isinstance(value, (list, tuple)):
+        return type(value), [plain(v) for v in value]
+    elif isinstance(value, dict):
+        return {key: plain(v) for key, v in value.items()}
+    return value
+
+
+def load_module(source, tmp_path, name="_config_compiled"):
+    filename = tmp_path / f"{name}.py"
+    filename.write_text(source)
+    spec = importlib.util.spec_from_file_location(name, filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    return load_module(compiler.compile_module(Config), tmp_path)
+
+
+@pytest.mark.parametrize("content", CONTENTS)
+def test_load(compiled, content):
+    assert compiled.COMPILED
+
+    expected = Config(content)
+    obj = compiled.load(content)
+
+    assert type(obj) is Config
+    assert obj.get_errors() == expected.get_errors()
+    assert plain(obj) == plain(expected)
+
+
+def test_dump(tmp_path):
+    module = load_module(compiler.compile_module(Server), tmp_path, "_server_compiled")
+
+    obj = Server(CONTENTS[1]["servers"][0])
+    assert module.dump(obj) == obj.to_dict()
+
+
+def test_error_policy(compiled):
+    content = CONTENTS[-1]
+
+    for kwargs in (dict(max_errors=3), dict(summary=True)):
+        with ds._collecting_errors(**kwargs):
+            expected = Config(content)
+        with ds._collecting_errors(**kwargs):
+            obj = compiled.load(content)
+
+        assert obj.get_errors() == expected.get_errors()
+        assert [exc.count for exc in obj.get_errors()] == [
+            exc.count for exc in expected.get_errors()
+        ]
+
+
+def test_default_to_key(tmp_path):
+    module = load_module(compiler.compile_module(Port), tmp_path, "_port_compiled")
+
+    assert module.load(dict(number=1), "http").name == "http"
+    with pytest.raises(ValueError):
+        module.load(dict(number=1))
+
+
+def test_invalid_values(compiled):
+    obj = compiled.load(CONTENTS[-1])
+    assert obj.name is INVALID
+    assert obj.servers[0].tags == [INVALID, "a"]
+    assert obj.nested == dict(a=[1, INVALID], b=INVALID)
+
+
+def test_fingerprint():
+    assert compiler.fingerprint(Config) == compiler.fingerprint(Config)
+    assert compiler.fingerprint(Config) != compiler.fingerprint(Server)
+
+    class Other(DataStruct):
+        name: str
+        number: int
+
+    class Reordered(DataStruct):
+        number: int
+        name: str
+
+    class WithDefault(DataStruct):
+        name: str
+        number: int = 0
+
+    fingerprints = {
+        compiler.fingerprint(klass) for klass in (Other, Reordered, WithDefault)
+    }
+    assert len(fingerprints) == 3
+
+
+def test_fallback(tmp_path):
+    source = compiler.compile_module(Config)
+    source = source.replace(compiler.fingerprint(Config), "0" * 64)
+
+    # The fingerprint is checked on first use.
+    module = load_module(source, tmp_path, "_stale_compiled")
+    assert module._COMPILED is None
+
+    with pytest.warns(UserWarning, match="changed"):
+        assert not module.COMPILED
+
+    content = CONTENTS[-1]
+    assert plain(module.load(content)) == plain(Config(content))
+
+
+def test_lazy_check(compiled):
+    assert compiled._COMPILED is None
+    compiled.load(CONTENTS[0])
+    assert compiled._COMPILED is True
+
+
+def test_normal_path(tmp_path, compiled):
+    content = CONTENTS[1]
+    fields = ["name", "servers[*].host"]
+    assert plain(compiled.load(content, fields=fields)) == plain(
+        Config(content, fields=fields)
+    )
+
+    with instrument.profile() as profiler:
+        compiled.load(content)
+    assert Config in profiler.classes
+
+    module = load_module(compiler.compile_module(Shape), tmp_path, "_shape_compiled")
+    content = dict(points=[dict(x=1, y=2), dict(x=1, y=2)])
+
+    obj = module.load(content)
+    assert obj.points[0] is not obj.points[1]
+
+    obj = module.load(content, dedupe=True)
+    assert obj.points[0] is obj.points[1]
+
+    with ds._deduplicating(True):
+        obj = module.load(content)
+    assert obj.points[0] is obj.points[1]
+
+
+def test_frozen(tmp_path):
+    module = load_module(
+        compiler.compile_module(Polygon), tmp_path, "_polygon_compiled"
+    )
+    content = dict(points=[dict(x=1, y=2)], labels=dict(a=["b"]))
+
+    obj = module.load(content)
+    assert plain(obj) == plain(Polygon(content))
+    assert isinstance(obj.points, tuple)
+    with pytest.raises(TypeError):
+        obj.labels["b"] = ()
+
+
+def test_not_compilable():
+    class Local(DataStruct):
+        name: str
+
+    with pytest.raises(ValueError):
+        compiler.compile_module(Local)
+
+    with pytest.raises(ValueError):
+        compiler.compile_module(dict)
+
+
+def test_cli(tmp_path):
+    output = tmp_path / "_cli_compiled.py"
+    assert (
+        cli.main(
+            ["compile", "datastruct.testsuite.test_compiler:Config", "-o", str(output)]
+        )
+        == 0
+    )
+    assert output.read_text() == compiler.compile_module(Config)
+
+    args = cli.build_parser().parse_args(
+        ["compile", "datastruct.testsuite.test_compiler:Server"]
+    )
+    out = io.StringIO()
+    assert cli.compile_schema(args, out) == 0
+    assert out.getvalue() == compiler.compile_module(Server)
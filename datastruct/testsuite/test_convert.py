@@ -2,9 +2,14 @@ from typing import Dict, List, Tuple, Union
 
 import pytest
 
-from datastruct import exceptions
+from datastruct import DataStruct, ds, exceptions, validators
 from datastruct.ds import INVALID, KeyDefinedValue, from_plain_value
 
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
 
 @pytest.mark.parametrize(
     "annotation,value", [(float, 8.0), (int, 8), (bool, True), (str, "hello")]
@@ -36,6 +41,7 @@ def test_basic_types_not_ok(annotation, value):
         ),  # noqa E231
         (Tuple[int], (8,)),
         (Union[int, float], 8),
+        (Union[int, float], 8.0),
         (Dict[int, int], {1: 2}),
     ],
 )
@@ -114,3 +120,73 @@ def test_kdv_not_ok(annotation, value, errs):
     o = from_plain_value(annotation, value)
     assert o.get_errors() == errs
     assert o.value == INVALID
+
+
+def test_flat_value_and_errors():
+    out = from_plain_value(Dict[str, List[int]], {"a": [1, "x"], "b": [2]})
+    assert out.value == {"a": [1, INVALID], "b": [2]}
+    assert out.get_errors() == (
+        exceptions.WrongTypeError("x", int).with_index(1).with_index("a"),
+    )
+
+    out = from_plain_value(Tuple[int], (1, 2))
+    assert out.value == (1, 2)
+    assert not out.errors
+
+
+def test_annotation_cache(monkeypatch):
+    calls = []
+    annotation_kind = ds._annotation_kind
+
+    def counting_kind(annotation):
+        calls.append(annotation)
+        return annotation_kind(annotation)
+
+    monkeypatch.setattr(ds, "_annotation_kind", counting_kind)
+
+    class Point(DataStruct):
+        x: int
+
+    annotation = Dict[str, List[Annotated[Point, ["unhashable"]]]]
+
+    class A(DataStruct):
+        values: annotation
+
+    class B(DataStruct):
+        other: annotation
+
+    # Equal annotations (e.g. get_type_hints may build new ones when
+    # removing Annotated) share the entry of the cache.
+    assert (
+        ds._annotation(A.__fields__["values"]).convert
+        is ds._annotation(B.__fields__["other"]).convert
+    )
+
+    def use():
+        content = dict(values={"a": [dict(x=1)]})
+        assert A(content).to_dict() == content
+        assert B(dict(other={"a": [dict(x="x")]})).get_errors()
+        assert from_plain_value(annotation, {}).value == {}
+
+    # Each annotation is classified once, for all classes and values.
+    use()
+    classified = len(calls)
+    use()
+    assert len(calls) == classified
+
+    # Annotated shares the functions of its origin.
+    info = ds._annotation(Annotated[int, ["unhashable"]])
+    assert info.convert is ds._annotation(int).convert
+    assert info.serialize is ds._annotation(int).serialize
+
+
+def test_annotation_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(ds, "_MAX_ANNOTATIONS", 10)
+
+    for ndx in range(25):
+        annotation = validators.value_in(ndx)
+        assert from_plain_value(annotation, ndx).value == ndx
+        assert len(ds._ANNOTATIONS) <= 10
+
+    # Entries keep their annotation object alive, so that its id is not reused.
+    assert all(id(entry.annotation) == key for key, entry in ds._ANNOTATIONS.items())
@@ -0,0 +1,108 @@
+import json
+import math
+from typing import Dict, List
+
+import pytest
+
+from datastruct import DEFAULT_TO_KEY, DataStruct
+
+
+class Retry(DataStruct, frozen=True):
+    attempts: int
+    delays: List[float] = []
+
+
+class Service(DataStruct, frozen=True):
+    name: str = DEFAULT_TO_KEY
+    retry: Retry
+
+
+class Config(DataStruct):
+    services: Dict[str, Service]
+    retries: List[Retry] = []
+
+
+RETRY = dict(attempts=3, delays=[0.1, 1.0])
+
+CONTENT = dict(
+    services={f"s{ndx}": dict(retry=dict(RETRY)) for ndx in range(10)},
+    retries=[dict(RETRY), dict(attempts=1)],
+)
+
+
+def test_shared():
+    o = Config.from_dict(CONTENT, dedupe=True)
+    assert o.to_dict() == Config.from_dict(CONTENT).to_dict()
+
+    retries = {id(service.retry) for service in o.services.values()}
+    assert len(retries) == 1
+    assert o.retries[0] is o.services["s0"].retry
+    assert o.retries[1] is not o.retries[0]
+
+    # The parent key (DEFAULT_TO_KEY) is part of the content.
+    assert [service.name for service in o.services.values()] == list(
+        CONTENT["services"]
+    )
+
+    # Not shared by default.
+    o = Config.from_dict(CONTENT)
+    assert o.retries[0] is not o.services["s0"].retry
+
+
+def test_not_frozen():
+    class Item(DataStruct):
+        value: int
+
+    class Items(DataStruct):
+        items: List[Item]
+
+    o = Items.from_dict(dict(items=[dict(value=1), dict(value=1)]), dedupe=True)
+    assert o.items[0] is not o.items[1]
+
+
+def test_equal_content_types():
+    content = dict(retries=[dict(attempts=1), dict(attempts=True)], services={})
+    o = Config.from_dict(content, dedupe=True, raise_on_error=False)
+    assert o.retries[0] is not o.retries[1]
+    assert o.retries[1].attempts is True
+
+
+def test_signed_zero():
+    content = dict(
+        retries=[
+            dict(attempts=1, delays=[0.0]),
+            dict(attempts=1, delays=[-0.0]),
+            dict(attempts=1, delays=[0.0]),
+        ],
+        services={},
+    )
+    o = Config.from_dict(content, dedupe=True)
+    assert o.retries[0] is not o.retries[1]
+    assert o.retries[0] is o.retries[2]
+    assert [math.copysign(1.0, r.delays[0]) for r in o.retries] == [1.0, -1.0, 1.0]
+
+
+def test_invalid_not_shared():
+    invalid = dict(attempts="x")
+    content = dict(services={}, retries=[invalid, dict(invalid)])
+
+    o = Config.from_dict(content, dedupe=True, raise_on_error=False)
+    assert o.retries[0] is not o.retries[1]
+    assert o.get_errors() == Config(content).get_errors()
+
+    # Errors are counted at each location.
+    o = Config.from_dict(content, dedupe=True, summary=True, raise_on_error=False)
+    assert [exc.count for exc in o.get_errors()] == [2]
+
+
+def test_from_filename(tmp_path):
+    filename = tmp_path / "config.json"
+    filename.write_text(json.dumps(CONTENT))
+
+    o = Config.from_filename(filename, dedupe=True)
+    assert o.retries[0] is o.services["s0"].retry
+
+
+def test_trusted():
+    with pytest.raises(ValueError):
+        Config.from_dict(CONTENT, trusted=True, dedupe=True)
@@ -0,0 +1,98 @@
+from typing import Dict, List
+
+import pytest
+
+from datastruct import INVALID, DataStruct, ds, exceptions
+
+
+class Server(DataStruct):
+    host: str
+    port: int
+
+
+class Config(DataStruct):
+    servers: List[Server]
+    ports: List[int]
+
+
+BIG = dict(data=list(range(1000)))
+
+CONTENT = dict(
+    servers=[dict(host="a", port=1)] + [dict(host=BIG, port="x")] * 10,
+    ports=[1, "a", "b"],
+)
+
+
+def test_max_errors():
+    o = Config.from_dict(CONTENT, raise_on_error=False, max_errors=3)
+    errs = o.get_errors()
+    assert len(errs) == 3
+    assert errs[0] == exceptions.WrongTypeError(BIG, str).with_parent(
+        "host"
+    ).with_index(1).with_parent("servers")
+
+    # Values are invalid even if the error was not collected.
+    assert o.ports == [1, INVALID, INVALID]
+
+    with pytest.raises(exceptions.MultipleError) as excinfo:
+        Config.from_dict(CONTENT, max_errors=2)
+    assert len(excinfo.value.exceptions) == 2
+
+    with pytest.raises(exceptions.WrongTypeError):
+        Config.from_dict(CONTENT, max_errors=1)
+
+
+def test_summary():
+    o = Config.from_dict(CONTENT, raise_on_error=False, summary=True)
+    errs = o.get_errors()
+    assert [(exc.__class__, exc.path, exc.count) for exc in errs] == [
+        (exceptions.WrongTypeError, ("servers", "[*]", "host"), 10),
+        (exceptions.WrongTypeError, ("servers", "[*]", "port"), 10),
+        (exceptions.WrongTypeError, ("ports", "[*]"), 2),
+    ]
+    assert isinstance(errs[0].value, str)
+    assert len(errs[0].value) < 100
+    assert "count=10" in repr(errs[0])
+
+    o = Config.from_dict(CONTENT, raise_on_error=False, summary=True, max_errors=4)
+    assert sum(exc.count for exc in o.get_errors()) == 4
+
+
+def test_summary_in_containers():
+    # Errors are merged for each container, not only at the root.
+    with ds._collecting_errors(summary=True):
+        out = ds.from_plain_value(List[int], ["a"] * 100)
+    assert [(exc.path, exc.count) for exc in out.get_errors()] == [(("[*]",), 100)]
+
+    with ds._collecting_errors(summary=True):
+        out = ds.from_plain_value(Dict[str, Server], {str(n): {} for n in range(10)})
+    assert [(exc.path, exc.count) for exc in out.get_errors()] == [
+        (("[*]",), 10),
+        (("[*]",), 10),
+    ]
+
+
+def test_default():
+    o = Config.from_dict(CONTENT, raise_on_error=False)
+    errs = o.get_errors()
+    assert len(errs) == 22
+    assert errs[0].value is BIG
+    assert all(exc.count == 1 for exc in errs)
+
+
+def test_summarize():
+    errs = [
+        exceptions.MissingValueError("a", Server).with_index(0),
+        exceptions.MissingValueError("a", Server).with_index(1),
+        exceptions.MissingValueError("b", Server).with_index(1),
+        exceptions.WrongValueError(1, "Len 1").with_parent("in key"),
+    ]
+    out = exceptions.summarize(errs)
+    assert [(exc.path, exc.count) for exc in out] == [
+        (("[*]",), 2),
+        (("[*]",), 1),
+        (("in key",), 1),
+    ]
+    assert out[0].with_parent("x").count == 2
+    # The original errors are not modified.
+    assert errs[0].path == ("[0]",)
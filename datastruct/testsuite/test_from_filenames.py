@@ -0,0 +1,45 @@
+import json
+import pathlib
+import sys
+import types
+
+import pytest
+
+from datastruct import DataStruct, ds
+
+
+class Example(DataStruct):
+    a: int
+    b: str = "h"
+
+
+def _write(path, content):
+    path.write_text(json.dumps(content))
+    return path
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 8])
+def test_from_filenames_max_workers(tmp_path, max_workers):
+    filenames = [
+        _write(tmp_path / f"file{ndx}.json", dict(b=str(ndx)))
+        for ndx in reversed(range(10))
+    ]
+    filenames.append(_write(tmp_path / "a.json", dict(a=1)))
+
+    o = Example.from_filenames(filenames, max_workers=max_workers)
+    assert o.a == 1
+    assert o.b == "9"
+
+    with pytest.raises(FileNotFoundError):
+        Example.from_filenames(
+            filenames + [tmp_path / "missing.json"], max_workers=max_workers
+        )
+
+
+def test_format_without_serialize_helper(monkeypatch):
+    # The helper is private in serialize, fall back if it is missing.
+    fake = types.SimpleNamespace(all=types.SimpleNamespace())
+    monkeypatch.setitem(sys.modules, "serialize", fake)
+
+    assert ds._get_format(pathlib.Path("a.JSON"), None) == "json"
+    assert ds._get_format(pathlib.Path("a.JSON"), "yaml") == "yaml"
@@ -0,0 +1,163 @@
+import copy
+import pickle
+from typing import Dict, List
+
+import pytest
+
+from datastruct import DataStruct
+
+
+class Server(DataStruct, frozen=True):
+    host: str
+    port: int = 80
+
+
+class Config(DataStruct, frozen=True):
+    name: str
+    servers: List[Server]
+    by_name: Dict[str, Server]
+
+
+class Inventory(DataStruct, frozen=True):
+    servers: List[Server]
+    ports: Dict[str, List[int]]
+    tags: List[str] = ["a"]
+
+
+class Mutable(DataStruct):
+    a: int
+
+
+CONTENT = dict(
+    name="config",
+    servers=[dict(host="a.example.com"), dict(host="b.example.com", port=8080)],
+    by_name=dict(a=dict(host="a.example.com")),
+)
+
+
+def test_immutable():
+    o = Config(CONTENT)
+    with pytest.raises(AttributeError):
+        o.name = "other"
+    with pytest.raises(AttributeError):
+        del o.name
+    with pytest.raises(AttributeError):
+        o.servers[0].port = 1
+    assert o.name == "config"
+
+
+def test_hash_and_eq():
+    o1 = Config(CONTENT)
+    o2 = Config(CONTENT)
+    assert o1 is not o2
+    assert o1 == o2
+    assert hash(o1) == hash(o2)
+    assert len({o1, o2}) == 1
+    assert {o1: 1}[o2] == 1
+
+    assert o1.servers[0] == o1.by_name["a"]
+    assert Server(dict(host="a", port=80)) == Server(dict(host="a"))
+
+    o3 = Config(dict(CONTENT, name="other"))
+    assert o1 != o3
+
+    assert Server(dict(host="a")) != Mutable(dict(a=1))
+    assert Server(dict(host="a")) != "a"
+
+
+def test_hash_is_cached():
+    o = Config(CONTENT)
+    value = hash(o)
+    assert o.__dict__["__hash_value__"] == value
+    assert hash(o) == value
+
+
+def test_copy_shares():
+    o = Config(CONTENT)
+    assert copy.copy(o) is o
+    assert copy.deepcopy(o) is o
+
+    hash(o)
+    o2 = pickle.loads(pickle.dumps(o))
+    assert "__hash_value__" not in o2.__dict__
+    assert o2 == o
+
+
+def test_pickle_with_errors():
+    o = Config(dict(CONTENT, name=1))
+    assert o.get_errors()
+
+    o2 = pickle.loads(pickle.dumps(o))
+    assert o2.get_errors() == o.get_errors()
+    assert o2 == o
+
+
+INVENTORY = dict(
+    servers=[dict(host="a.example.com")],
+    ports=dict(a=[80, 443]),
+)
+
+
+def _check_read_only(o):
+    assert o.servers == (Server(dict(host="a.example.com")),)
+    assert o.ports == dict(a=(80, 443))
+    with pytest.raises(AttributeError):
+        o.servers.append(Server(dict(host="b.example.com")))
+    with pytest.raises(TypeError):
+        o.ports["b"] = (1,)
+    with pytest.raises(TypeError):
+        o.ports.update(b=(1,))
+    with pytest.raises(AttributeError):
+        o.ports["a"].append(1)
+    with pytest.raises(AttributeError):
+        o.tags.append("b")
+
+
+def test_read_only_containers():
+    o = Inventory(INVENTORY)
+    _check_read_only(o)
+    assert o.to_dict() == dict(
+        servers=[dict(host="a.example.com", port=80)],
+        ports=dict(a=[80, 443]),
+        tags=["a"],
+    )
+    assert hash(o) == hash(Inventory(INVENTORY))
+
+    _check_read_only(Inventory.construct(INVENTORY))
+    _check_read_only(pickle.loads(pickle.dumps(o)))
+    _check_read_only(o.replace(tags=["a"]))
+    _check_read_only(o.replace_path("ports[a]", [80, 443]))
+    _check_read_only(Inventory.from_dict(INVENTORY, dedupe=True))
+
+    o2 = o.replace_path("ports[a][1]", 8080)
+    assert o2.ports == dict(a=(80, 8080))
+    assert o2 != o
+
+
+def test_construct():
+    assert Config.construct(CONTENT) == Config(CONTENT)
+
+
+def test_mutable_is_not_hashable_by_value():
+    o1 = Mutable(dict(a=1))
+    o2 = Mutable(dict(a=1))
+    assert o1 != o2
+    o1.a = 2
+    assert o1.a == 2
+
+
+def test_definition():
+    class Derived(Server):
+        extra: int = 1
+
+    assert Derived.__frozen__
+
+    with pytest.raises(TypeError):
+
+        class Unfrozen(Server, frozen=False):
+            pass
+
+    with pytest.raises(TypeError):
+
+        class WithMutable(DataStruct, frozen=True):
+            items: List[Mutable]
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+import datastruct
+
+#: Modules that `import datastruct` must not import.
+LAZY_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "datastruct.validators",
+    "importlib.metadata",
+    "serialize",
+    "validators",
+    "yaml",
+)
+
+
+def test_lazy_imports():
+    code = (
+        "import sys, datastruct; "
+        f"print([name for name in {LAZY_MODULES!r} if name in sys.modules])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_lazy_attributes():
+    from datastruct import validators
+
+    assert datastruct.validators is validators
+    assert isinstance(datastruct.__version__, str)
+
+    for name in datastruct.__all__:
+        assert hasattr(datastruct, name)
+
+
+def test_lazy_regex():
+    from datastruct.validators import _LazyRegex
+
+    regex = _LazyRegex("a+", 0)
+    assert regex._compiled is None
+    assert regex.match("aa").group() == "aa"
+    assert regex.__dict__["match"] == regex._compiled.match
@@ -0,0 +1,75 @@
+from typing import List
+
+from datastruct import DataStruct, instrument, validators
+from datastruct.ds import from_plain_value
+
+
+class Server(DataStruct):
+    host: validators.Domain
+    port: int
+
+
+class Config(DataStruct):
+    name: str
+    servers: List[Server]
+    emails: List[validators.Email]
+
+
+CONTENT = dict(
+    name="config",
+    servers=[dict(host="example.com", port=1), dict(host="bad host", port="x")],
+    emails=["a@example.com", "bad"],
+)
+
+
+def test_profile():
+    assert not instrument.is_enabled()
+
+    with instrument.profile() as profiler:
+        assert instrument.is_enabled()
+        Config(CONTENT)
+
+    assert not instrument.is_enabled()
+
+    stats = profiler.as_dict()
+    assert stats["classes"]["Config"]["calls"] == 1
+    assert stats["classes"]["Config"]["errors"] == 3
+    assert stats["classes"]["Server"]["calls"] == 2
+    assert stats["classes"]["Server"]["errors"] == 2
+
+    assert stats["fields"]["Config.servers"]["calls"] == 1
+    assert stats["fields"]["Config.servers"]["errors"] == 2
+    assert stats["fields"]["Server.port"] == dict(
+        calls=2, errors=1, time=stats["fields"]["Server.port"]["time"]
+    )
+    assert (
+        stats["fields"]["Config.servers"]["time"]
+        >= stats["fields"]["Server.port"]["time"]
+    )
+
+    assert stats["validators"]["Domain"]["calls"] == 2
+    assert stats["validators"]["Domain"]["errors"] == 1
+    # Batch validation
+    assert stats["validators"]["Email"]["calls"] == 2
+    assert stats["validators"]["Email"]["errors"] == 1
+
+    report = profiler.report(limit=2)
+    assert report.startswith("Classes")
+    assert "Config.servers" in report
+    assert "Fields" in report and "Validators" in report
+
+
+def test_enable_disable():
+    profiler = instrument.enable()
+    try:
+        from_plain_value(validators.Domain, "example.com")
+        Server(dict(host="example.com", port=1))
+    finally:
+        assert instrument.disable() is profiler
+
+    Server(dict(host="example.com", port=1))
+    assert profiler.classes[Server].calls == 1
+
+    profiler.clear()
+    assert not profiler.as_dict()["classes"]
+    assert instrument.disable() is None
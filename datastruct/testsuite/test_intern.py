@@ -0,0 +1,131 @@
+import importlib.util
+import json
+import pickle
+import sys
+from typing import Dict, List
+
+import pytest
+
+from datastruct import DataStruct, compiler
+
+
+class Event(DataStruct, intern=("region", "tags", "labels")):
+    id: int
+    region: str
+    tags: List[str] = []
+    labels: Dict[str, str] = {}
+    message: str = ""
+
+
+class Assigned(DataStruct, intern="region", validate_assignment=True):
+    region: str
+
+
+LINES = [
+    json.dumps(
+        dict(
+            id=ndx,
+            region="us-east-1",
+            tags=["production", "web-1"],
+            labels={"team-name": "infra-team"},
+            message="hello world",
+        )
+    )
+    for ndx in range(2)
+]
+
+
+def load(cls=Event):
+    # Each line is parsed separately, so the strings are not shared.
+    return [cls(json.loads(line)) for line in LINES]
+
+
+def name_of(obj, name):
+    """The string used to store an attribute."""
+    return next(key for key in obj.__dict__ if key == name)
+
+
+def test_values():
+    a, b = load()
+    assert a.region == "us-east-1"
+    assert a.region is b.region
+    assert all(x is y for x, y in zip(a.tags, b.tags))
+    assert all(x is y for x, y in zip(a.labels, b.labels))
+    assert all(x is y for x, y in zip(a.labels.values(), b.labels.values()))
+
+    # Only the listed attributes.
+    assert a.message is not b.message
+    assert a.get_errors() == ()
+
+
+def test_names():
+    a, b = load()
+    for name in Event.__fields__:
+        assert name_of(a, name) is name_of(b, name) is sys.intern(name)
+
+
+def test_not_interned_by_default():
+    class Plain(DataStruct):
+        region: str
+
+    a, b = (Plain(dict(region=json.loads('"us-east-1"'))) for _ in range(2))
+    assert a.region is not b.region
+
+
+def test_invalid_values():
+    obj = Event(dict(id=1, region=1, tags=["a", 2]))
+    assert len(obj.get_errors()) == 2
+    assert obj.tags[0] is sys.intern("a")
+
+
+def test_inherited():
+    class Derived(Event):
+        extra: str = ""
+
+    assert Derived.__intern__ == Event.__intern__
+
+    a, b = load(Derived)
+    assert a.region is b.region
+
+
+def test_unknown_attribute():
+    with pytest.raises(TypeError):
+
+        class Wrong(DataStruct, intern=("other",)):
+            name: str
+
+
+def test_construct():
+    a, b = (Event.construct(json.loads(line)) for line in LINES)
+    assert a.region is b.region
+    assert name_of(a, "region") is name_of(b, "region")
+
+
+def test_replace():
+    a = load()[0]
+    region = json.loads('"eu-west-1"')
+    c = a.replace(region=region)
+    assert c.region is sys.intern(region)
+
+    obj = Assigned(dict(region="x"))
+    obj.region = region
+    assert obj.region is sys.intern(region)
+
+
+def test_pickle():
+    a, b = (pickle.loads(pickle.dumps(obj)) for obj in load())
+    assert a.region is b.region
+
+
+def test_compiled(tmp_path):
+    filename = tmp_path / "_event_compiled.py"
+    filename.write_text(compiler.compile_module(Event))
+    spec = importlib.util.spec_from_file_location("_event_compiled", filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    a, b = (module.load(json.loads(line)) for line in LINES)
+    assert module.COMPILED
+    assert a.region is b.region
+    assert a.tags[0] is b.tags[0]
+    assert a.message is not b.message
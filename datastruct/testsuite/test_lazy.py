@@ -0,0 +1,90 @@
+import pickle
+
+import pytest
+
+from datastruct import DEFAULT_TO_KEY, DataStruct, LazyDict, exceptions, validators
+
+
+class Server(DataStruct):
+    name: str = DEFAULT_TO_KEY
+    port: int
+
+
+class Config(DataStruct):
+    servers: LazyDict[str, Server]
+
+
+class Ports(DataStruct):
+    ports: LazyDict[validators.Domain, int]
+
+
+CONTENT = dict(servers=dict(a=dict(port=1), b=dict(port="x"), c=dict(port=3)))
+
+
+def test_lazy():
+    o = Config(CONTENT)
+    assert not o.get_errors()
+
+    servers = o.servers
+    assert isinstance(servers, LazyDict)
+    assert len(servers) == 3
+    assert list(servers) == ["a", "b", "c"]
+    assert "a" in servers
+    assert "d" not in servers
+    assert not servers._values
+
+    a = servers["a"]
+    assert a.name == "a"
+    assert a.port == 1
+    assert servers["a"] is a
+    assert list(servers._values) == ["a"]
+
+    with pytest.raises(KeyError):
+        servers["d"]
+
+
+def test_lazy_errors():
+    o = Config(CONTENT)
+    err = exceptions.WrongTypeError("x", int).with_parent("port").with_index("b")
+
+    with pytest.raises(exceptions.WrongTypeError) as excinfo:
+        o.servers["b"]
+    assert excinfo.value == err
+    assert o.servers.get_errors() == (err,)
+
+    # Cached
+    with pytest.raises(exceptions.WrongTypeError):
+        o.servers["b"]
+
+    assert o.servers.validate_all() == (err,)
+    assert o.servers["c"].port == 3
+
+
+def test_lazy_keys():
+    o = Ports(dict(ports={"example.com": 1, "bad key": 2}))
+    assert list(o.ports) == ["example.com"]
+    assert o.get_errors() == (
+        exceptions.WrongValueError("bad key", validators.Domain)
+        .with_parent("in key")
+        .with_parent("ports"),
+    )
+
+    o = Ports(dict(ports=[]))
+    assert o.get_errors() == (exceptions.WrongTypeError([], dict).with_parent("ports"),)
+
+
+def test_lazy_roundtrip():
+    o = Config(dict(servers=dict(a=dict(port=1))))
+    assert o.to_dict() == dict(servers=dict(a=dict(name="a", port=1)))
+
+    o = Config.from_dict(o.to_dict(), trusted=True)
+    assert o.servers["a"].port == 1
+
+    o = pickle.loads(pickle.dumps(o))
+    assert o.servers["a"].port == 1
+
+
+def test_lazy_projection():
+    o = Config(CONTENT, fields=["servers[*].name"])
+    assert o.servers["b"].name == "b"
+    assert not hasattr(o.servers["b"], "port")
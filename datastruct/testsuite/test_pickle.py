@@ -0,0 +1,85 @@
+import pickle
+from typing import Dict, List
+
+import pytest
+
+from datastruct import INVALID, DataStruct, exceptions
+
+
+class Single(DataStruct):
+    a: int
+    b: str = "h"
+
+
+class Example(DataStruct):
+    x: float
+    singles: List[Single]
+    named: Dict[str, Single]
+
+
+class Empty(DataStruct):
+    pass
+
+
+class One(DataStruct):
+    a: int
+
+
+CONTENT = dict(
+    x=1.0,
+    singles=[dict(a=1), dict(a=2, b="s")],
+    named=dict(k=dict(a=3)),
+)
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_round_trip(protocol):
+    o = Example(CONTENT)
+    o2 = pickle.loads(pickle.dumps(o, protocol))
+    assert type(o2) is Example
+    assert o2.to_dict() == o.to_dict()
+    assert type(o2.singles[0]) is Single
+    assert type(o2.named["k"]) is Single
+    assert not o2.get_errors()
+
+
+def test_defaults_are_not_stored():
+    o = pickle.loads(pickle.dumps(Single(dict(a=1))))
+    assert o.b == "h"
+    assert "b" not in o.__dict__
+
+
+def test_errors():
+    o = Example(dict(x=1, singles=[dict(a="a")], named=dict(k=dict(a=3, z=2))))
+    errs = o.get_errors()
+    assert errs
+
+    o2 = pickle.loads(pickle.dumps(o))
+    assert o2.get_errors() == errs
+    assert o2.x is INVALID
+    assert o2.singles[0].a is INVALID
+    assert o2.named["k"].get_errors() == (exceptions.UnexpectedKeyError("z", Single),)
+
+    o = pickle.loads(pickle.dumps(Single(dict(b="s"))))
+    assert o.get_errors() == (exceptions.MissingValueError("a", Single),)
+    assert not hasattr(o, "a")
+    assert o.b == "s"
+
+
+def test_few_fields():
+    o = pickle.loads(pickle.dumps(Empty({})))
+    assert type(o) is Empty
+    assert not o.get_errors()
+
+    o = pickle.loads(pickle.dumps(One(dict(a=1))))
+    assert o.a == 1
+
+
+class Legacy(Single):
+    __reduce__ = object.__reduce__
+
+
+def test_compact():
+    objs = [Single(dict(a=ndx, b="s")) for ndx in range(100)]
+    legacy = [Legacy(dict(a=ndx, b="s")) for ndx in range(100)]
+    assert len(pickle.dumps(objs)) < len(pickle.dumps(legacy))
@@ -0,0 +1,106 @@
+from typing import Dict, List
+
+import pytest
+
+from datastruct import DEFAULT_TO_KEY, DataStruct, exceptions
+
+
+class Server(DataStruct):
+    name: str = DEFAULT_TO_KEY
+    host: str
+    port: int
+
+
+class Database(DataStruct):
+    url: str
+    timeout: int = 10
+
+
+class Config(DataStruct):
+    title: str
+    database: Database
+    servers: List[Server]
+    by_name: Dict[str, Server]
+
+
+CONTENT = dict(
+    title=1,
+    database=dict(url="sqlite://", timeout="x"),
+    servers=[dict(host="a", port="x"), dict(host="b")],
+    by_name=dict(main=dict(host="c", port=1)),
+    extra=True,
+)
+
+
+def test_projection():
+    o = Config.from_dict(CONTENT, fields=["database.url", "servers[*].host"])
+
+    assert o.database.url == "sqlite://"
+    assert o.database.timeout == 10
+    assert [s.host for s in o.servers] == ["a", "b"]
+    assert not hasattr(o.servers[0], "port")
+    assert not hasattr(o, "title")
+    assert not hasattr(o, "by_name")
+    assert not o.get_errors()
+
+
+def test_projection_default_to_key():
+    o = Config.from_dict(CONTENT, fields=["by_name[*].host"])
+    server = o.by_name["main"]
+    assert server.host == "c"
+    with pytest.raises(AttributeError):
+        server.name
+    assert Server.name is DEFAULT_TO_KEY
+
+    o = Config.from_dict(CONTENT, fields=["by_name[*].name"])
+    assert o.by_name["main"].name == "main"
+
+
+def test_projection_whole():
+    o = Config(CONTENT, fields=["by_name", "by_name[*].host", "database"])
+    assert o.by_name["main"].name == "main"
+    assert o.by_name["main"].port == 1
+    assert o.get_errors() == (
+        exceptions.WrongTypeError("x", int)
+        .with_parent("timeout")
+        .with_parent("database"),
+    )
+
+
+def test_projection_errors():
+    o = Config(CONTENT, fields=["servers[*].port", "title"])
+    assert o.get_errors() == (
+        exceptions.WrongTypeError(1, str).with_parent("title"),
+        exceptions.WrongTypeError("x", int)
+        .with_parent("port")
+        .with_index(0)
+        .with_parent("servers"),
+        exceptions.MissingValueError("port", Server)
+        .with_index(1)
+        .with_parent("servers"),
+    )
+
+    with pytest.raises(exceptions.ValidationError):
+        Config.from_dict(CONTENT, fields=["title"])
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["unknown", "title.x", "servers.host", "database[*]", "servers[0].host", "[*]"],
+)
+def test_projection_invalid(path):
+    with pytest.raises(ValueError):
+        Config.from_dict(CONTENT, fields=[path])
+
+
+def test_projection_trusted():
+    with pytest.raises(ValueError):
+        Config.from_dict(CONTENT, fields=["title"], trusted=True)
+
+
+def test_projection_file(tmp_path):
+    filename = tmp_path / "config.json"
+    filename.write_text('{"title": "t", "database": {"url": 1}}')
+    o = Config.from_filename(filename, fields=["title"])
+    assert o.title == "t"
+    assert not hasattr(o, "database")
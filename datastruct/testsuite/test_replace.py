@@ -0,0 +1,160 @@
+from typing import Dict, List
+
+import pytest
+
+from datastruct import DEFAULT_TO_KEY, DataStruct, exceptions
+
+
+class Server(DataStruct):
+    host: str
+    port: int = 80
+    name: str = DEFAULT_TO_KEY
+
+
+class Cluster(DataStruct):
+    servers: List[Server]
+    weights: Dict[str, int]
+
+
+class Config(DataStruct):
+    name: str
+    cluster: Cluster
+    by_name: Dict[str, Server]
+
+
+CONTENT = dict(
+    name="config",
+    cluster=dict(
+        servers=[dict(host="a", name="a"), dict(host="b", name="b")],
+        weights=dict(a=1, b=2),
+    ),
+    by_name=dict(a=dict(host="a"), b=dict(host="b", port=8080)),
+)
+
+
+def test_replace():
+    o = Config(CONTENT)
+    o2 = o.replace(name="other")
+    assert o2.name == "other"
+    assert o.name == "config"
+    assert o2.cluster is o.cluster
+    assert o2.by_name is o.by_name
+    assert not o2.get_errors()
+
+    o3 = o.replace(cluster=dict(servers=[], weights={}), name="x")
+    assert o3.cluster.servers == []
+    assert o3.name == "x"
+    assert o3.by_name is o.by_name
+
+    # Built instances are used as they are.
+    o4 = o.replace(cluster=o3.cluster)
+    assert o4.cluster is o3.cluster
+
+    with pytest.raises(TypeError):
+        o.replace(unknown=1)
+
+
+def test_replace_errors():
+    o = Config(CONTENT)
+    o2 = o.replace(name=1)
+    assert o2.get_errors() == (exceptions.WrongTypeError(1, str).with_parent("name"),)
+    assert not o.get_errors()
+
+    o3 = o2.replace(name="fixed")
+    assert not o3.get_errors()
+
+    o = Config(dict(CONTENT, cluster=dict(servers="a")))
+    assert len(o.get_errors()) == 2
+    o2 = o.replace(cluster=CONTENT["cluster"])
+    assert not o2.get_errors()
+
+    o = Config(dict(name="config", by_name={}))
+    assert o.get_errors() == (exceptions.MissingValueError("cluster", Config),)
+    assert not o.replace(cluster=CONTENT["cluster"]).get_errors()
+
+
+def test_replace_path():
+    o = Config(CONTENT)
+
+    o2 = o.replace_path("cluster.servers[1].port", 8000)
+    assert o2.cluster.servers[1].port == 8000
+    assert o.cluster.servers[1].port == 80
+    assert o2.cluster.servers[0] is o.cluster.servers[0]
+    assert o2.cluster.weights is o.cluster.weights
+    assert o2.by_name is o.by_name
+    assert not o2.get_errors()
+
+    o3 = o.replace_path("by_name[b].port", 1)
+    assert o3.by_name["b"].port == 1
+    assert o3.by_name["a"] is o.by_name["a"]
+    assert o3.cluster is o.cluster
+
+    o4 = o.replace_path("cluster.weights[a]", 10)
+    assert o4.cluster.weights == dict(a=10, b=2)
+    assert o.cluster.weights == dict(a=1, b=2)
+
+    # Replace a whole element with DEFAULT_TO_KEY
+    o6 = o.replace_path("by_name[a]", dict(host="z"))
+    assert o6.by_name["a"].host == "z"
+    assert o6.by_name["a"].name == "a"
+
+    o7 = o.replace_path("name", "other")
+    assert o7.name == "other"
+
+
+def test_replace_path_errors():
+    o = Config(CONTENT)
+
+    o2 = o.replace_path("cluster.servers[1].port", "x")
+    err = exceptions.WrongTypeError("x", int).with_parent("port").with_index(1)
+    assert o2.get_errors() == (err.with_parent("servers").with_parent("cluster"),)
+    assert o2.cluster.get_errors() == (err.with_parent("servers"),)
+    assert o2.cluster.servers[1].get_errors() == (
+        exceptions.WrongTypeError("x", int).with_parent("port"),
+    )
+    assert not o.get_errors()
+
+    o3 = o2.replace_path("cluster.servers[0].port", "y")
+    assert len(o3.get_errors()) == 2
+
+    o4 = o3.replace_path("cluster.servers[1]", dict(host="c", name="c"))
+    assert len(o4.get_errors()) == 1
+    assert o4.get_errors()[0].path == ("cluster", "servers", "[0]", "port")
+
+    o5 = o4.replace_path("cluster.weights[b]", "2")
+    assert len(o5.get_errors()) == 2
+
+
+@pytest.mark.parametrize(
+    "path,exc",
+    [
+        ("cluster.servers[5].port", IndexError),
+        ("cluster.servers[a].port", KeyError),
+        ("by_name[c].port", KeyError),
+        ("name[0]", TypeError),
+        ("cluster[0]", TypeError),
+        ("unknown.a", TypeError),
+        ("cluster.servers.port", TypeError),
+        ("cluster..servers", ValueError),
+        ("[0]", ValueError),
+    ],
+)
+def test_replace_path_invalid(path, exc):
+    with pytest.raises(exc):
+        Config(CONTENT).replace_path(path, 1)
+
+
+def test_frozen():
+    class FServer(DataStruct, frozen=True):
+        host: str
+        port: int = 80
+
+    class FConfig(DataStruct, frozen=True):
+        servers: List[FServer]
+
+    o = FConfig(dict(servers=[dict(host="a"), dict(host="b")]))
+    hash(o)
+    o2 = o.replace_path("servers[0].port", 1)
+    assert o2 != o
+    assert o2.servers[1] is o.servers[1]
+    assert o2.replace_path("servers[0].port", 80) == o
@@ -0,0 +1,172 @@
+import concurrent.futures
+import pickle
+from typing import Dict, List
+
+import pytest
+
+from datastruct import DataStruct, LazyDict, exceptions
+
+shared = pytest.importorskip("datastruct.shared")
+
+
+class Server(DataStruct):
+    host: str
+    port: int = 80
+
+
+class FrozenServer(DataStruct, frozen=True):
+    host: str
+    port: int = 80
+
+
+class Config(DataStruct):
+    name: str
+    servers: List[Server]
+    by_name: Dict[str, Server]
+
+
+class Pool(DataStruct):
+    servers: List[FrozenServer]
+
+
+class Directory(DataStruct):
+    by_name: LazyDict[str, Server]
+
+
+CONTENT = dict(
+    name="config",
+    servers=[dict(host="a.example.com"), dict(host="b.example.com", port=8080)],
+    by_name=dict(a=dict(host="a.example.com")),
+)
+
+
+@pytest.fixture
+def published():
+    shm = shared.publish(Config(CONTENT))
+    yield shm
+    shm.close()
+    shm.unlink()
+
+
+def test_attach(published):
+    o = shared.attach(published.name, Config)
+    assert isinstance(o, Config)
+    assert "servers" not in o.__dict__
+
+    assert o.name == "config"
+    assert o.servers[1].port == 8080
+    assert "servers" in o.__dict__
+    assert o.servers is o.servers
+    assert o.to_dict() == Config(CONTENT).to_dict()
+    assert not o.get_errors()
+
+
+def test_read_only(published):
+    o = shared.attach(published.name)
+    with pytest.raises(AttributeError):
+        o.name = "other"
+    with pytest.raises(AttributeError):
+        del o.name
+    assert o.name == "config"
+
+
+def test_nested_read_only(published):
+    o = shared.attach(published.name, Config)
+    with pytest.raises(AttributeError):
+        o.servers[0].port = 1
+    with pytest.raises(AttributeError):
+        o.by_name["a"].port = 1
+    with pytest.raises(AttributeError):
+        o.servers.append(Server(dict(host="c.example.com")))
+    with pytest.raises(TypeError):
+        o.by_name["c"] = Server(dict(host="c.example.com"))
+
+    assert isinstance(o.servers[0], Server)
+    assert o.servers[0].port == 80
+    assert o.to_dict() == Config(CONTENT).to_dict()
+
+    o2 = pickle.loads(pickle.dumps(o))
+    assert type(o2.servers[0]) is Server
+    o2.servers[0].port = 1
+    assert o2.servers[0].port == 1
+
+
+def test_nested_shared_values():
+    server = FrozenServer(dict(host="a"))
+    shm = shared.publish(Pool(dict(servers=[server, server])))
+    try:
+        o = shared.attach(shm.name, Pool)
+        assert o.servers[0] is o.servers[1]
+        assert hash(o.servers[0]) == hash(o.servers[1])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_lazy_dict_read_only():
+    shm = shared.publish(Directory(dict(by_name=dict(a=dict(host="a")))))
+    try:
+        o = shared.attach(shm.name, Directory)
+        with pytest.raises(AttributeError):
+            o.by_name["a"].port = 1
+
+        o2 = pickle.loads(pickle.dumps(o))
+        assert type(o2.by_name) is LazyDict
+        assert type(o2.by_name["a"]) is Server
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_defaults_and_errors():
+    shm = shared.publish(Server(dict(port="80")))
+    try:
+        o = shared.attach(shm.name, Server)
+        assert o.get_errors() == (
+            exceptions.MissingValueError("host", Server),
+            exceptions.WrongTypeError("80", int).with_parent("port"),
+        )
+        assert not hasattr(o, "host")
+
+        o2 = pickle.loads(pickle.dumps(o))
+        assert type(o2) is Server
+        assert o2.get_errors() == o.get_errors()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    shm = shared.publish(Server(dict(host="a")))
+    try:
+        o = shared.attach(shm.name, Server)
+        assert o.port == 80
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_frozen_errors():
+    shm = shared.publish(FrozenServer(dict(host="a", port="80")))
+    try:
+        o = shared.attach(shm.name, FrozenServer)
+        o2 = pickle.loads(pickle.dumps(o))
+        assert type(o2) is FrozenServer
+        assert o2.get_errors() == o.get_errors()
+        assert o2 == FrozenServer(dict(host="a", port="80"))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_wrong_class(published):
+    with pytest.raises(TypeError):
+        shared.attach(published.name, Server)
+
+
+def _read_host(name):
+    return shared.attach(name, Config).servers[1].host
+
+
+def test_worker_processes(published):
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        hosts = list(executor.map(_read_host, [published.name] * 4))
+    assert hosts == ["b.example.com"] * 4
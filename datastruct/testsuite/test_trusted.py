@@ -0,0 +1,106 @@
+import json
+from typing import Dict, List, Tuple
+
+import pytest
+
+from datastruct import DEFAULT_TO_KEY, DataStruct, KeyDefinedValue, validators
+
+
+class Single(DataStruct):
+    a: int
+    b: str = "h"
+
+
+class Named(DataStruct):
+    a: int
+    name: str = DEFAULT_TO_KEY
+
+
+class KDV(KeyDefinedValue):
+    content = {"single": Single, "number": int}
+
+
+class Example(DataStruct):
+    x: float
+    email: validators.Email
+    single: Single
+    singles: List[Single]
+    pair: Tuple[int]
+    named: Dict[str, Named]
+    kdv: KDV
+
+
+CONTENT = dict(
+    x=1.0,
+    email="test@example.com",
+    single=dict(a=1, b="s"),
+    singles=[dict(a=2), dict(a=3, b="t")],
+    pair=(1, 2),
+    named=dict(first=dict(a=4), second=dict(a=5, name="other")),
+    kdv=dict(single=dict(a=6)),
+)
+
+
+def _assert_equivalent(o1, o2):
+    assert type(o1) is type(o2)
+    if isinstance(o1, DataStruct):
+        assert o1.to_dict() == o2.to_dict()
+        for key in o1.__fields__:
+            _assert_equivalent(getattr(o1, key), getattr(o2, key))
+    elif isinstance(o1, dict):
+        assert o1.keys() == o2.keys()
+        for key in o1:
+            _assert_equivalent(o1[key], o2[key])
+    elif isinstance(o1, (list, tuple)):
+        assert len(o1) == len(o2)
+        for el1, el2 in zip(o1, o2):
+            _assert_equivalent(el1, el2)
+    else:
+        assert o1 == o2
+
+
+def test_construct():
+    validated = Example(CONTENT)
+    assert not validated.get_errors()
+
+    trusted = Example.construct(CONTENT)
+    assert not trusted.get_errors()
+    _assert_equivalent(validated, trusted)
+
+    assert trusted.named["first"].name == "first"
+    assert trusted.named["second"].name == "other"
+    assert trusted.singles[0].b == "h"
+    assert trusted.kdv.a == 6
+
+
+def test_construct_round_trip():
+    o = Example.construct(Example(CONTENT).to_dict())
+    _assert_equivalent(Example(CONTENT), o)
+
+
+def test_construct_does_not_validate():
+    o = Single.construct(dict(a="not an int"))
+    assert o.a == "not an int"
+    assert not o.get_errors()
+
+    with pytest.raises(ValueError):
+        Named.construct(dict(a=1))
+
+
+def test_from_dict_trusted():
+    o = Example.from_dict(CONTENT, trusted=True)
+    _assert_equivalent(Example(CONTENT), o)
+
+    o = Single.from_dict(dict(a="not an int"), trusted=True)
+    assert o.a == "not an int"
+
+
+def test_from_filename_trusted(tmp_path):
+    filename = tmp_path / "single.json"
+    filename.write_text(json.dumps(dict(a="not an int")))
+
+    o = Single.from_filename(filename, trusted=True)
+    assert o.a == "not an int"
+
+    o = Single.from_filenames([filename], trusted=True)
+    assert o.a == "not an int"
@@ -0,0 +1,158 @@
+from typing import Dict, List, Tuple
+
+from datastruct import DataStruct, exceptions, validators
+
+
+def test_str_validators_are_cached():
+    class MyEmail(validators.Email):
+        pass
+
+    assert MyEmail.cache_info().currsize == 0
+    assert MyEmail.validate("test@gmail.com")
+    assert MyEmail.validate("test@gmail.com")
+    assert not MyEmail.validate("test@gmail")
+
+    info = MyEmail.cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
+    assert info.maxsize == validators.StrValidator.cache_size
+
+    MyEmail.cache_clear()
+    assert MyEmail.cache_info().currsize == 0
+
+
+def test_cache_size():
+    class SmallCache(validators.Domain):
+        cache_size = 1
+
+    assert SmallCache.validate("example.com")
+    assert SmallCache.validate("example.org")
+    assert SmallCache.validate("example.com")
+    assert SmallCache.cache_info().hits == 0
+    assert SmallCache.cache_info().currsize == 1
+
+    class NoCache(validators.Domain):
+        cache_size = 0
+
+    assert NoCache.validate("example.com")
+    assert NoCache.cache_info() is None
+
+
+def test_pure_custom_validator():
+    calls = []
+
+    class Positive(validators.Validator):
+        pure = True
+
+        @classmethod
+        def validate(cls, instance):
+            calls.append(instance)
+            return isinstance(instance, int) and instance > 0
+
+    class Impure(Positive):
+        pure = False
+
+    assert Positive.validate(1)
+    assert Positive.validate(1)
+    assert not Positive.validate(-1)
+    assert calls == [1, -1]
+
+    # The cache is typed
+    assert Positive.validate(True)
+    assert calls == [1, -1, True]
+
+    # Unhashable values bypass the cache
+    assert not Positive.validate([1])
+    assert not Positive.validate([1])
+    assert calls == [1, -1, True, [1], [1]]
+
+    assert Impure.cache_info() is None
+    assert Impure.validate(1)
+    assert calls[-1] == 1
+    assert len(calls) == 6
+
+    assert validators.Validator.cache_info() is None
+    assert validators.value_in(1, 2).cache_info() is None
+
+
+def test_cached_validator_in_datastruct():
+    class Example(DataStruct):
+        a: validators.Domain
+
+    validators.Domain.cache_clear()
+    for _ in range(3):
+        assert not Example(dict(a="example.com")).get_errors()
+    assert Example(dict(a="example..com")).get_errors()
+
+    info = validators.Domain.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+
+
+def test_validate_many():
+    assert validators.Email.validate_many(["a@b.com", "a@b", 1, "c@d.org"]) == [1, 2]
+    assert validators.Email.validate_many([]) == []
+
+    vin = validators.value_in("a", "b")
+    assert vin.validate_many(["a", "b", "a"]) == []
+    assert vin.validate_many(["a", "c", "b", "c"]) == [1, 3]
+
+
+def test_str_validate_many_single_pass():
+    calls = []
+
+    class Upper(validators.StrValidator):
+        @staticmethod
+        def func(value):
+            calls.append(value)
+            return value.isupper()
+
+    assert Upper.validate_many(["A", "b", "A", 1, "b", "C"]) == [1, 3, 4]
+    assert calls == ["A", "b", "C"]
+
+
+def test_validate_many_in_containers():
+    calls = []
+
+    class Positive(validators.Validator):
+        @classmethod
+        def validate(cls, instance):
+            return isinstance(instance, int) and instance > 0
+
+        @classmethod
+        def validate_many(cls, instances):
+            calls.append(list(instances))
+            return super().validate_many(instances)
+
+    class Example(DataStruct):
+        a: List[Positive]
+        b: Dict[Positive, Positive]
+        c: Tuple[Positive]
+
+    o = Example(dict(a=[1, 2, 3], b={1: 2, 3: 4}, c=(5,)))
+    assert not o.get_errors()
+    assert o.a == [1, 2, 3]
+    assert o.b == {1: 2, 3: 4}
+    assert o.c == (5,)
+    assert calls == [[1, 2, 3], [1, 3], [2, 4], [5]]
+
+    o = Example(dict(a=[1, -2, 3], b={1: -2, -3: 4}, c=(-5,)))
+    assert o.get_errors() == (
+        exceptions.WrongValueError(-2, Positive).with_index(1).with_parent("a"),
+        exceptions.WrongValueError(-2, Positive).with_index(1).with_parent("b"),
+        exceptions.WrongValueError(-3, Positive).with_parent("in key").with_parent("b"),
+        exceptions.WrongValueError(-5, Positive).with_index(0).with_parent("c"),
+    )
+
+
+def test_validate_many_mixed_dict():
+    XY = validators.value_in("x", "y")
+
+    class Example(DataStruct):
+        a: Dict[XY, int]
+
+    o = Example(dict(a={"x": 1, "y": "2", "z": 3}))
+    assert o.get_errors() == (
+        exceptions.WrongTypeError("2", int).with_index("y").with_parent("a"),
+        exceptions.WrongValueError("z", XY).with_parent("in key").with_parent("a"),
+    )
@@ -10,47 +10,398 @@
     - Domain
 
 
-    We strongly leverage the `validators` library.
+    The string validators are implemented using precompiled regular
+    expressions and the `ipaddress` module, following the rules of
+    the `validators` library (0.36). The library can be used instead
+    by calling `set_backend("validators")`. Unlike the library,
+    IPAddress only accepts addresses, not networks (e.g. "1.2.3.4/24").
+
+    Validators marked as `pure` (the result depends only on the value)
+    memoize their results in a bounded LRU cache. The size of the cache
+    is given by the `cache_size` class attribute.
 
     :copyright: 2020 by datastruct Authors, see AUTHORS for more details.
     :license: BSD, see LICENSE for more details.
 """
 
-import validators
+import inspect
+import ipaddress
+import re
+from functools import lru_cache
 
 
 class Validator:
-    """Base class for validators."""
+    """Base class for validators.
+
+    Set `pure` to True in a subclass if `validate` depends only on the value,
+    so that the results can be memoized. The LRU cache holds at most
+    `cache_size` values (None means unbounded, 0 disables the cache).
+    """
+
+    #: True if the result of validate depends only on the value.
+    pure = False
+
+    #: Maximum number of results to memoize for pure validators.
+    cache_size = 1024
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Keep a reference to the undecorated validate method,
+        # which might be inherited from a parent class.
+        if "validate" in cls.__dict__:
+            cls._uncached_validate = cls.__dict__["validate"]
+
+        uncached = inspect.getattr_static(cls, "_uncached_validate")
+        if cls.pure and cls.cache_size != 0:
+            cls.validate = staticmethod(
+                _memoize(uncached.__get__(None, cls), cls.cache_size)
+            )
+        else:
+            cls.validate = uncached
 
     @classmethod
     def validate(self, instance):
         return False
 
+    _uncached_validate = validate
+
+    @classmethod
+    def validate_many(cls, instances):
+        """Validate a sequence of values.
+
+        Subclasses can override this method to validate
+        the whole batch more efficiently.
+
+        Parameters
+        ----------
+        instances : Sequence
+
+        Returns
+        -------
+        list of int
+            indices of the invalid values.
+        """
+        validate = cls.validate
+        return [ndx for ndx, instance in enumerate(instances) if not validate(instance)]
+
+    @classmethod
+    def cache_info(cls):
+        """Return hits, misses, maxsize and currsize of the result cache,
+        or None if the validator is not cached.
+        """
+        info = getattr(cls.validate, "cache_info", None)
+        return info() if info else None
+
+    @classmethod
+    def cache_clear(cls):
+        """Clear the result cache (and statistics) of the validator."""
+        clear = getattr(cls.validate, "cache_clear", None)
+        if clear:
+            clear()
+
+
+def _memoize(validate, maxsize):
+    """Build a memoized version of a validate method.
+
+    Unhashable values are validated without using the cache.
+    """
+
+    # typed=True prevents 1, 1.0 and True to share the result.
+    cached = lru_cache(maxsize=maxsize, typed=True)(validate)
+
+    def memoized_validate(instance):
+        try:
+            hash(instance)
+        except TypeError:
+            return validate(instance)
+        return cached(instance)
+
+    memoized_validate.cache_info = cached.cache_info
+    memoized_validate.cache_clear = cached.cache_clear
+
+    return memoized_validate
+
 
 class StrValidator(Validator):
     """Base class for all string validators."""
 
+    pure = True
+
     func = lambda s: False
 
     @classmethod
     def validate(cls, instance):
         return isinstance(instance, str) and cls.func(instance)
 
+    @classmethod
+    def validate_many(cls, instances):
+        """Validate a sequence of values in a single pass,
+        calling func once for each distinct string.
+
+        The results are not stored in the LRU cache of `validate`.
+        """
+        func = cls.func
+        results = {}
+        invalid = []
+        append = invalid.append
+        for ndx, instance in enumerate(instances):
+            if instance.__class__ is not str and not isinstance(instance, str):
+                append(ndx)
+                continue
+            try:
+                valid = results[instance]
+            except KeyError:
+                valid = results[instance] = func(instance)
+            if not valid:
+                append(ndx)
+        return invalid
+
+
+class _LazyRegex:
+    """A regular expression compiled on first use,
+    to keep `import datastruct` fast.
+    """
+
+    def __init__(self, pattern, flags=0):
+        self._args = pattern, flags
+        self._compiled = None
+
+    def __getattr__(self, name):
+        if self._compiled is None:
+            self._compiled = re.compile(*self._args)
+
+        # Store the methods of the compiled pattern in the instance,
+        # so that __getattr__ is only called once for each.
+        value = getattr(self._compiled, name)
+        setattr(self, name, value)
+        return value
+
+
+# In-house implementations of the string validators,
+# which follow the defaults of the `validators` library.
+
+_DOMAIN_RE = _LazyRegex(
+    r"(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9][a-z0-9-]{0,61}[a-z]\Z",
+    re.IGNORECASE,
+)
+
+_LOCAL_PART_RE = _LazyRegex(
+    # dot-atom
+    r"(?:[\u00A0-\u024F0-9a-z!#$%&'*+/=?^_`{}|~-]+"
+    r"(?:\.[\u00A0-\u024F0-9a-z!#$%&'*+/=?^_`{}|~-]+)*"
+    # quoted string
+    r'|"(?:[\u00A0-\u024F\001-\010\013\014\016-\037!#-\[\]-\177]|\\[\011.])*")\Z',
+    re.IGNORECASE,
+)
+
+_USERNAME_RE = _LazyRegex(
+    r"[-!#$%&'*+/=?^_`{}|~0-9a-z]+(?:\.[-!#$%&'*+/=?^_`{}|~0-9a-z]+)*\Z",
+    re.IGNORECASE,
+)
+
+_URL_RE = _LazyRegex(
+    r"(?P<scheme>[a-z][a-z0-9+.-]*)://"
+    r"(?:(?P<auth>[^/?#@]*)@)?"
+    r"(?P<host>\[[^/?#\]]*\]|[^/?#:@\[\]]*)"
+    r"(?::(?P<port>[0-9]*))?"
+    r"(?P<path>/[^?#]*)?"
+    r"(?:\?(?P<query>[^#]*))?"
+    r"(?:\#(?P<fragment>.*))?\Z",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_PATH_RE = _LazyRegex(
+    r"[/a-z0-9\-._~!$&'()*+,;=:@%"
+    r"\U0001F300-\U0001F5FF\U0001F600-\U0001F64F"
+    r"\u00A0-\uD7FF\uF900-\uFDCF\uFDF0-\uFFEF]+\Z",
+    re.IGNORECASE,
+)
+
+_FRAGMENT_RE = _LazyRegex(r"[0-9a-z?/:@\-._~%!$&'()*+,;=#]*\Z", re.IGNORECASE)
+
+_WHITESPACE_RE = _LazyRegex(r"\s")
+
+_URL_SCHEMES = frozenset(
+    (
+        "file",
+        "ftp",
+        "ftps",
+        "git",
+        "http",
+        "https",
+        "irc",
+        "rtmp",
+        "rtmps",
+        "rtsp",
+        "sftp",
+        "ssh",
+        "telnet",
+    )
+)
+
+
+def is_domain(value: str) -> bool:
+    """Return True if value is a valid domain name (IDN are supported)."""
+    if not value.isascii():
+        try:
+            value = value.encode("idna").decode("ascii")
+        except UnicodeError:
+            return False
+    return len(value) <= 253 and _DOMAIN_RE.match(value) is not None
+
+
+def is_ip_address(value: str) -> bool:
+    """Return True if value is a valid IPv4 or IPv6 address."""
+    try:
+        ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return True
+
+
+def is_email(value: str) -> bool:
+    """Return True if value is a valid email address."""
+    if value.count("@") != 1:
+        return False
+
+    local_part, domain_part = value.split("@")
+
+    return (
+        len(local_part) <= 64
+        and _LOCAL_PART_RE.match(local_part) is not None
+        and is_domain(domain_part)
+    )
+
+
+def is_url(value: str) -> bool:
+    """Return True if value is a valid URL."""
+    if _WHITESPACE_RE.search(value):
+        return False
+
+    match = _URL_RE.match(value)
+    if match is None:
+        return False
+
+    scheme, auth, host, port, path, query, fragment = match.group(
+        "scheme", "auth", "host", "port", "path", "query", "fragment"
+    )
+
+    if scheme.lower() not in _URL_SCHEMES:
+        return False
+
+    if scheme.lower() == "file" and auth is None and port is None:
+        is_local_file = host in ("", "localhost")
+    else:
+        is_local_file = False
+
+    if not is_local_file:
+        if auth is not None:
+            username, _, password = auth.partition(":")
+            if not _USERNAME_RE.match(username):
+                return False
+
+        if port is not None:
+            if not port or port[0] == "0" or int(port) > 65535:
+                return False
+
+        if host.startswith("["):
+            if not host[1:-1] or ":" not in host or not is_ip_address(host[1:-1]):
+                return False
+        elif not (is_domain(host) or ("." in host and is_ip_address(host))):
+            return False
+
+    if path and not _PATH_RE.match(path):
+        return False
+
+    if query:
+        for sep in "&;":
+            if not all("=" in field for field in query.split(sep)):
+                return False
+
+    if fragment and not _FRAGMENT_RE.match(fragment):
+        return False
+
+    return True
+
 
 class Email(StrValidator):
-    func = validators.email
+    func = is_email
 
 
 class IPAddress(StrValidator):
-    func = validators.ip_address
+    func = is_ip_address
 
 
 class URL(StrValidator):
-    func = validators.url
+    func = is_url
 
 
 class Domain(StrValidator):
-    func = validators.domain
+    func = is_domain
+
+
+#: Functions of the string validators for each backend.
+_BACKENDS = {
+    "datastruct": {
+        Email: is_email,
+        IPAddress: is_ip_address,
+        URL: is_url,
+        Domain: is_domain,
+    }
+}
+
+
+def _library_backend():
+    import validators
+
+    def ip_address(value):
+        return validators.ipv4(value) or validators.ipv6(value)
+
+    return {
+        Email: validators.email,
+        IPAddress: ip_address,
+        URL: validators.url,
+        Domain: validators.domain,
+    }
+
+
+#: Name of the backend in use.
+_backend = "datastruct"
+
+
+def set_backend(name: str):
+    """Select the implementation of the string validators.
+
+    Parameters
+    ----------
+    name : str
+        "datastruct" (default) for the in-house implementation or
+        "validators" to use the `validators` library (must be installed).
+    """
+    if name == "validators" and name not in _BACKENDS:
+        _BACKENDS[name] = _library_backend()
+
+    try:
+        funcs = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown backend {name!r}, valid values are 'datastruct' and 'validators'"
+        )
+
+    global _backend
+    _backend = name
+
+    for klass, func in funcs.items():
+        klass.func = func
+        for subclass in _iter_subclasses(klass):
+            subclass.cache_clear()
+
+
+def _iter_subclasses(klass):
+    yield klass
+    for subclass in klass.__subclasses__():
+        yield from _iter_subclasses(subclass)
 
 
 def value_in(*valid_values):
@@ -62,4 +413,19 @@ def value_in(*valid_values):
         def validate(self, instance):
             return instance in valid_values
 
+        @classmethod
+        def validate_many(cls, instances):
+            try:
+                invalid = set(instances).difference(valid_values)
+            except TypeError:
+                # Unhashable values, validate one by one.
+                return super().validate_many(instances)
+
+            if not invalid:
+                return []
+
+            return [
+                ndx for ndx, instance in enumerate(instances) if instance in invalid
+            ]
+
     return Klass